@@ -0,0 +1,66 @@
+# Animation Clock
+# sprites.jsonで定義されたアニメーション（PBULLET, ENEMY01-05, EXHST, MZLFLSH…）の現在のフレームを
+# 1描画フレームに1回だけ計算し、名前ごとの共有スロットに公開する。
+# 同じ種類のエンティティは全て同じフレームを表示するので、各エンティティは描画時に
+# スロットのu, vを読むだけでよい（エンティティ数に依存するのはbltだけになる）。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+from SpriteManager import sprite_manager
+
+
+class AnimationSlot:
+    """1つのアニメーションの現在のフレーム（AnimationClockが書き込み、エンティティが読む）"""
+
+    __slots__ = ("name", "frames", "speed", "sprite", "u", "v")
+
+    def __init__(self, name: str, frames: tuple, speed: int):
+        self.name: str = name
+        self.frames: tuple = frames     # FRAME_NUM順のSpIdx
+        self.speed: int = max(1, speed) # 1フレームを表示するティック数（ANIM_SPD）
+        self.sprite = frames[0]         # 現在のフレームのSpIdx
+        self.u: int = self.sprite.x     # 現在のフレームの画像バンク上の座標
+        self.v: int = self.sprite.y
+
+    def set_time(self, time: int):
+        sprite = self.frames[time // self.speed % len(self.frames)]
+        self.sprite = sprite
+        self.u = sprite.x
+        self.v = sprite.y
+
+
+class AnimationClock:
+    """ゲームタイマーからループアニメーションの現在のフレームを進めるサービス
+
+    スロットはslot()で最初に要求されたときに作る（スプライト定義もそのとき読み込まれる）。
+    advanceはゲームタイマーが変わったときだけスロットを更新する。
+    """
+
+    def __init__(self):
+        self._slots: dict = {}      # 名前 -> AnimationSlot
+        self.time: int = 0          # 最後にadvanceした時刻（ゲームタイマー）
+
+    def slot(self, name: str, default_speed: int = 1) -> AnimationSlot:
+        """名前のアニメーションの共有スロットを返す（ANIM_SPDが無ければdefault_speedを使う）"""
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = AnimationSlot(name, sprite_manager.get_sprite_frames(name),
+                                 sprite_manager.get_animation_speed(name, default_speed))
+            slot.set_time(self.time)
+            self._slots[name] = slot
+        return slot
+
+    def advance(self, time: int):
+        """全スロットを時刻timeのフレームにする（描画の最初に1回呼ぶ）"""
+        if time == self.time:
+            return
+        self.time = time
+        for slot in self._slots.values():
+            slot.set_time(time)
+
+
+# グローバルインスタンス
+animation_clock = AnimationClock()
@@ -0,0 +1,390 @@
+# Frame-time Benchmark Suite
+# ウィンドウを開かずに負荷の高い場面（ストレスシナリオ）を再現し、
+# 1フレームあたりのupdate/drawコストを計測する
+#
+# 使い方:
+#   python Benchmark.py                          # 全シナリオを実行
+#   python Benchmark.py formation40 stars10k     # シナリオを指定して実行
+#   python Benchmark.py --save baseline.json     # 結果をベースラインとして保存
+#   python Benchmark.py --baseline baseline.json --threshold 0.15
+#                                                # ベースライン比で15%以上遅くなったら失敗（終了コード1）
+#   python Benchmark.py --import-time            # mainのimport時間の予算チェックだけを行う
+#
+# シナリオを実行したときは、最後に必ずmainのimport時間（新しいプロセスで計測）が予算内かを確認し、
+# 超えていれば失敗（終了コード1）にする。--skip-import-timeで省略できる。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import Headless
+
+# pyxelスタブはゲームモジュールより先に登録しておく
+Headless.install()
+
+import Config
+Config.DEBUG = False  # デバッグ描画・ログは計測対象外（読み込み時のログも抑止する）
+
+import Common
+import Rng
+import GameState
+from Enemy import Enemy, formation_manager
+from EnemyBullet import EnemyBullet
+from ExplodeManager import ExpType
+from Player import Player
+from StarManager import StarManager
+from AnimationClock import animation_clock
+from RenderQueue import render_queue
+import main
+
+# 既定の計測設定
+DEFAULT_FRAMES = 600
+DEFAULT_WARMUP = 60
+DEFAULT_THRESHOLD = 0.10      # ベースライン比の許容増加率（10%）
+IMPORT_TIME_BUDGET_MS = 50.0  # mainのimport（ウィンドウを開かない）にかけてよい時間
+IMPORT_TIME_RUNS = 5          # import時間は最小値を採る（ディスクキャッシュ等のばらつきを除く）
+
+# 比較・保存する統計値
+METRICS = ("mean_us", "p95_us", "p99_us")
+PHASES = ("update", "draw")
+
+# シナリオ規模
+FORMATION_ROWS = 4
+FORMATION_COLS = 10
+BULLET_STORM_COUNT = 500
+CHAIN_PARTICLE_COUNT = 1000
+STAR_FIELD_COUNT = 10000
+
+# 隊列配置（main.pyのウェーブ配置と同じ間隔）
+FORMATION_BASE_X = 11
+FORMATION_OFS_X = 10
+FORMATION_BASE_Y = 11
+FORMATION_OFS_Y = 10
+
+
+class Scenario:
+    """ベンチマークシナリオ
+
+    setup()は(update, draw, teardown)の3つの関数を返す。
+    teardownはシナリオが差し替えたグローバル状態を元に戻す（不要ならNone）。
+    """
+
+    def __init__(self, name: str, description: str, setup):
+        self.name: str = name
+        self.description: str = description
+        self.setup = setup
+
+
+# 登録済みシナリオ（登録順に実行する）
+SCENARIOS: dict = {}
+
+
+def scenario(name: str, description: str):
+    """シナリオ登録用デコレータ"""
+    def register(setup):
+        SCENARIOS[name] = Scenario(name, description, setup)
+        return setup
+    return register
+
+
+def _formation_position(row: int, col: int) -> tuple:
+    return FORMATION_OFS_X + FORMATION_BASE_X * col, FORMATION_OFS_Y + FORMATION_BASE_Y * row
+
+
+def _update_enemies():
+    for enemy in Common.enemy_list:
+        enemy.update()
+
+
+def _draw_enemies():
+    for enemy in Common.enemy_list:
+        enemy.draw()
+
+
+@scenario("formation40", "full 40-enemy formation marching in FIGHT state")
+def _setup_formation40():
+    GameState.GameStateSub = Config.STATE_PLAYING_FIGHT
+    for row in range(FORMATION_ROWS):
+        for col in range(FORMATION_COLS):
+            x, y = _formation_position(row, col)
+            Common.add_enemy(Enemy(x=x, y=y, sprite_num=row + 1, life=2, score=100,
+                                   wave_id=row, enemy_index=col))
+
+    def update():
+        formation_manager.update(Common.enemy_list)
+        _update_enemies()
+        Common.compact_entity_lists()
+
+    return update, _draw_enemies, None
+
+
+@scenario("wave_entry", "three waves entering at once with every EntryPattern")
+def _setup_wave_entry():
+    GameState.GameStateSub = Config.STATE_PLAYING_ENEMY_ENTRY
+
+    def spawn_waves():
+        # 3パターン（LeftLoop/RightLoop/Zigzag）を1行ずつ同時に登場させる
+        Common.clear_enemies()
+        formation_manager.reset_slots()
+        for row, pattern_id in enumerate((1, 2, 3)):
+            for col in range(FORMATION_COLS):
+                x, y = _formation_position(row, col)
+                Common.add_enemy(Enemy(x=x, y=y, sprite_num=row + 1, life=2, score=100,
+                                       wave_id=row, enemy_index=col, entry_pattern_id=pattern_id))
+
+    spawn_waves()
+
+    def update():
+        _update_enemies()
+        # 全員がホームポジションに着いたら登場からやり直す（常に登場中の負荷を測る）
+        for enemy in Common.enemy_list:
+            if not enemy.is_ready_for_formation_movement():
+                break
+        else:
+            spawn_waves()
+
+    return update, _draw_enemies, None
+
+
+@scenario("bullet_storm", f"{BULLET_STORM_COUNT} enemy bullets raining through the player hitbox")
+def _setup_bullet_storm():
+    # 既定の容量では足りないので、シナリオ中だけ敵弾テーブルを拡張する
+    original_capacity = EnemyBullet.table.capacity
+    EnemyBullet.table.resize(max(original_capacity, BULLET_STORM_COUNT))
+    Common.apply_collision_mask_bounds(Player)
+    player = Player(64 - 4, 108)
+
+    def refill():
+        while len(Common.enemy_bullet_list) < BULLET_STORM_COUNT:
+            Common.spawn_enemy_bullet(random.uniform(0, Config.WIN_WIDTH - 8),
+                                      random.uniform(-Config.WIN_HEIGHT, 0))
+
+    refill()
+
+    def update():
+        EnemyBullet.update_all()
+        # 衝突判定はゲーム本体と同じ処理を呼ぶ（空間ハッシュの再構築・マスクの詳細判定も含む）
+        main.collide_discrete(player)
+        Common.compact_entity_lists()
+        refill()
+
+    def teardown():
+        Common.clear_bullets()
+        EnemyBullet.table.resize(original_capacity)
+
+    return update, EnemyBullet.draw_all, teardown
+
+
+@scenario("chain_explosion", f"chained explosions keeping ~{CHAIN_PARTICLE_COUNT} particles alive")
+def _setup_chain_explosion():
+    explode_manager = Common.explode_manager
+    exp_types = tuple(ExpType)
+
+    def refill():
+        # 消えた分だけ新しい爆発を連鎖させ、粒子数を一定に保つ
+        while explode_manager.count < CHAIN_PARTICLE_COUNT:
+            explode_manager.spawn_explosion(
+                random.uniform(16, Config.WIN_WIDTH - 16),
+                random.uniform(16, Config.WIN_HEIGHT - 16),
+                20, random.choice(exp_types)
+            )
+
+    refill()
+
+    def update():
+        explode_manager.update()
+        refill()
+
+    return update, explode_manager.draw, explode_manager.clear
+
+
+@scenario("stars10k", f"StarManager with {STAR_FIELD_COUNT} stars (per-star points)")
+def _setup_stars10k():
+    star_manager = StarManager(STAR_FIELD_COUNT, backend="points")
+    return star_manager.update, star_manager.draw, None
+
+
+@scenario("stars10k_layers", f"StarManager with {STAR_FIELD_COUNT} stars (baked layers)")
+def _setup_stars10k_layers():
+    star_manager = StarManager(STAR_FIELD_COUNT, backend="layers")
+    return star_manager.update, star_manager.draw, None
+
+
+def _percentile_us(sorted_samples: list, pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * pct / 100.0))
+    return sorted_samples[index] * 1e6
+
+
+def _summarize(samples: list) -> dict:
+    """秒単位のサンプル列からmean/p95/p99（マイクロ秒）を求める"""
+    ordered = sorted(samples)
+    return {
+        "mean_us": sum(ordered) / len(ordered) * 1e6 if ordered else 0.0,
+        "p95_us": _percentile_us(ordered, 95),
+        "p99_us": _percentile_us(ordered, 99),
+    }
+
+
+def run_scenario(name: str, frames: int = DEFAULT_FRAMES, warmup: int = DEFAULT_WARMUP, seed: int = 0) -> dict:
+    """シナリオを1つ実行し、{"update": {...}, "draw": {...}}の統計を返す"""
+    Config.DEBUG = False
+    random.seed(seed)
+    Rng.seed_all(seed)
+    Headless.reset_world()
+    GameState.GameState = Config.STATE_PLAYING
+
+    update, draw, teardown = SCENARIOS[name].setup()
+    perf_counter = time.perf_counter
+    update_times: list = []
+    draw_times: list = []
+    try:
+        for frame in range(warmup + frames):
+            GameState.GameTimer += 1
+            t0 = perf_counter()
+            update()
+            t1 = perf_counter()
+            animation_clock.advance(GameState.GameTimer)
+            draw()
+            render_queue.flush()
+            t2 = perf_counter()
+            if frame >= warmup:
+                update_times.append(t1 - t0)
+                draw_times.append(t2 - t1)
+    finally:
+        if teardown is not None:
+            teardown()
+        Headless.reset_world()
+
+    return {"update": _summarize(update_times), "draw": _summarize(draw_times)}
+
+
+def run_suite(names=None, frames: int = DEFAULT_FRAMES, warmup: int = DEFAULT_WARMUP, seed: int = 0) -> dict:
+    """指定シナリオ（省略時は全て）を順に実行する"""
+    return {name: run_scenario(name, frames, warmup, seed) for name in (names or SCENARIOS)}
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """ベースラインより(1 + threshold)倍以上遅くなった項目を返す
+
+    戻り値は(シナリオ名, フェーズ, 統計名, ベースライン値, 今回値)のリスト。
+    ベースラインに無いシナリオは比較しない。
+    """
+    regressions: list = []
+    for name, phases in results.items():
+        base_phases = baseline.get(name)
+        if base_phases is None:
+            continue
+        for phase in PHASES:
+            for metric in METRICS:
+                base_value = base_phases.get(phase, {}).get(metric)
+                value = phases[phase][metric]
+                if base_value and value > base_value * (1.0 + threshold):
+                    regressions.append((name, phase, metric, base_value, value))
+    return regressions
+
+
+def measure_import_time(module: str = "main", runs: int = IMPORT_TIME_RUNS) -> float:
+    """新しいインタプリタでmoduleをimportする時間（ミリ秒、runs回の最小値）
+
+    実際のpyxelを使う（スタブは入れない）。importだけでウィンドウやファイルを開かないことも兼ねて確認する。
+    """
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples: list = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True, timeout=60, check=True)
+        samples.append(float(completed.stdout.split()[-1]) * 1000.0)
+    return min(samples)
+
+
+def check_import_time(budget_ms: float = IMPORT_TIME_BUDGET_MS) -> bool:
+    """mainのimport時間を測って表示し、予算内ならTrueを返す"""
+    import_ms = measure_import_time()
+    print(f"import main: {import_ms:.1f}ms (budget {budget_ms:.1f}ms)")
+    if import_ms > budget_ms:
+        print("REGRESSION import time over budget")
+        return False
+    return True
+
+
+def format_results(results: dict) -> str:
+    lines = [f"{'scenario':<16} {'phase':<6} {'mean':>10} {'p95':>10} {'p99':>10}"]
+    for name, phases in results.items():
+        for phase in PHASES:
+            stats = phases[phase]
+            lines.append(
+                f"{name:<16} {phase:<6} {stats['mean_us']:>8.1f}us {stats['p95_us']:>8.1f}us {stats['p99_us']:>8.1f}us"
+            )
+    return "\n".join(lines)
+
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description="Run PyxelShmup frame-time stress benchmarks without a window")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="unmeasured frames before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a baseline JSON written by --save")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown ratio before flagging a regression (0.10 = 10%%)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline JSON")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    parser.add_argument("--import-time", action="store_true",
+                        help="only check the cold import time of main and exit (fails above the budget)")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_TIME_BUDGET_MS,
+                        help="import time budget in milliseconds")
+    parser.add_argument("--skip-import-time", action="store_true",
+                        help="do not check the import time budget after the scenarios")
+    args = parser.parse_args()
+
+    if args.import_time:
+        return 0 if check_import_time(args.import_budget) else 1
+
+    if args.list:
+        for scenario_def in SCENARIOS.values():
+            print(f"{scenario_def.name:<16} {scenario_def.description}")
+        return 0
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = run_suite(args.scenarios, args.frames, args.warmup, args.seed)
+    print(format_results(results))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline written to {args.save}")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, phase, metric, base_value, value in regressions:
+            print(f"REGRESSION {name} {phase} {metric}: {base_value:.1f}us -> {value:.1f}us "
+                  f"(+{(value / base_value - 1.0) * 100:.0f}%)")
+        if regressions:
+            failed = True
+        else:
+            print(f"no regressions above {args.threshold * 100:.0f}%")
+
+    if not args.skip_import_time and not check_import_time(args.import_budget):
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
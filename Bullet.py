@@ -4,29 +4,59 @@
 # 変数の型は宣言してください
 
 import pyxel
-import Common
 import Config
-import GameState
-from SpriteManager import sprite_manager
+from AnimationClock import animation_clock
+from RenderQueue import render_queue, LAYER_PLAYER_BULLET
+from World import Archetype, column_property
 
 # Bullet専用設定
 BULLET_SPEED = 3
 BULLET_COLLISION_BOX = (2, 2, 4, 4)  # x, y, w, h
 
 class Bullet:
-    def __init__(self, x, y, w, h):
+    """プレイヤー弾のファサード
+
+    実データはBullet.table（アーキタイプ）の1行。ファサードは行番号に固定されていて、
+    x/y/w/h/activeは列への読み書きになる。毎フレームの移動・描画は
+    update_all/draw_allが列をまとめて処理する。
+    """
+    __slots__ = ("row",)
+
+    # 全インスタンス共通の定数
+    speed = BULLET_SPEED
+    col_x, col_y, col_w, col_h = BULLET_COLLISION_BOX  # Collision box
+
+    # アニメーション（最初の生成時にAnimationClockの共有スロットを取得する）
+    anim_slot = None
+
+    # 弾テーブル（クラス定義の後で生成する）
+    table = None
+
+    def __init__(self, row):
+        self.row = row
+
+    @classmethod
+    def spawn(cls, x, y, w, h):
+        """テーブルに1行確保して弾を生成する（空きが無ければNone）"""
+        if cls.anim_slot is None:
+            cls.anim_slot = animation_clock.slot("PBULLET", 3)
+
+        row = cls.table.spawn()
+        if row < 0:
+            return None
+        bullet = cls.table.facades[row]
+        bullet.reset(x, y, w, h)
+        return bullet
+
+    def reset(self, x, y, w, h):
+        """位置を再設定してアクティブにする"""
         self.x = x
         self.y = y
+        self.px = x
+        self.py = y
         self.w = w
         self.h = h
-        self.speed = BULLET_SPEED
         self.active = True
-        
-        # Collision box
-        self.col_x, self.col_y, self.col_w, self.col_h = BULLET_COLLISION_BOX
-        
-        # アニメーション設定をJSONから取得
-        self.animation_speed = self._get_animation_speed()
 
     def update(self):
         self.y -= self.speed  #テスト 1/110の速度で
@@ -36,32 +66,62 @@ class Bullet:
             self.active = False
 
     def draw(self):
-        # JSON駆動のアニメーション付き弾丸スプライト取得
-        anim_frame = self._get_animation_frame(GameState.GameTimer)
-        bullet_sprite = self._get_bullet_sprite(anim_frame)
-        
-        pyxel.blt(self.x, self.y, Config.TILE_BANK0, 
-                  bullet_sprite.x, bullet_sprite.y, 
-                  self.w, self.h, pyxel.COLOR_BLACK)
+        # アニメーションの現在のフレームはAnimationClockのスロットから読む
+        slot = self.anim_slot
+        render_queue.submit(LAYER_PLAYER_BULLET, Config.TILE_BANK0,
+                            slot.u, slot.v, self.w, self.h, self.x, self.y)
         
         # Collision Box
         if Config.DEBUG:
-            pyxel.rectb(self.x + self.col_x, self.y + self.col_y, 
-                       self.col_w, self.col_h, pyxel.COLOR_GREEN)
-    
-    def _get_animation_speed(self):
-        """JSONからアニメーション速度を取得する"""
-        anim_spd = sprite_manager.get_sprite_metadata("PBULLET", "ANIM_SPD", "3")
-        try:
-            return int(anim_spd)
-        except (ValueError, TypeError):
-            return 3
-    
-    def _get_animation_frame(self, game_timer):
-        """ゲームタイマーに基づいてアニメーションフレームを計算する"""
-        cycle_position = game_timer % (self.animation_speed * 2)
-        return 0 if cycle_position < self.animation_speed else 1
-    
-    def _get_bullet_sprite(self, frame_number):
-        """弾丸のスプライトを取得する"""
-        return sprite_manager.get_sprite_by_name_and_field("PBULLET", "FRAME_NUM", str(frame_number % 2))
\ No newline at end of file
+            render_queue.overlay(pyxel.rectb, self.x + self.col_x, self.y + self.col_y,
+                                 self.col_w, self.col_h, pyxel.COLOR_GREEN)
+
+    # --- システム（全行をまとめて処理する） ---
+
+    @classmethod
+    def update_all(cls):
+        """移動・カリングシステム: 全弾を上へ動かし、画面外に出た弾を非アクティブにする"""
+        table = cls.table
+        ys = table.y
+        hs = table.h
+        active = table.active
+        speed = cls.speed
+        for row in range(table.count):
+            y = ys[row] - speed
+            ys[row] = y
+            if y < -hs[row]:
+                active[row] = False
+
+    @classmethod
+    def draw_all(cls):
+        """描画システム: AnimationClockが進めた共有フレームで全弾をレンダーキューへ積む"""
+        table = cls.table
+        count = table.count
+        if count == 0:
+            return
+
+        sprite_x = cls.anim_slot.u
+        sprite_y = cls.anim_slot.v
+        xs, ys, ws, hs = table.x, table.y, table.w, table.h
+        submit = render_queue.submit
+        bank = Config.TILE_BANK0
+        for row in range(count):
+            submit(LAYER_PLAYER_BULLET, bank, sprite_x, sprite_y, ws[row], hs[row], xs[row], ys[row])
+
+        # Collision Box
+        if Config.DEBUG:
+            for row in range(count):
+                render_queue.overlay(pyxel.rectb, xs[row] + cls.col_x, ys[row] + cls.col_y,
+                                     cls.col_w, cls.col_h, pyxel.COLOR_GREEN)
+
+
+# プレイヤー弾テーブル（位置・前ティックの位置・サイズ・生存フラグ）
+Bullet.table = Archetype("player_bullet", Config.PLAYER_BULLET_POOL_SIZE,
+                         {"x": 0.0, "y": 0.0, "px": 0.0, "py": 0.0, "w": 8, "h": 8, "active": False}, Bullet)
+Bullet.x = column_property(Bullet.table, "x")
+Bullet.y = column_property(Bullet.table, "y")
+Bullet.px = column_property(Bullet.table, "px")
+Bullet.py = column_property(Bullet.table, "py")
+Bullet.w = column_property(Bullet.table, "w")
+Bullet.h = column_property(Bullet.table, "h")
+Bullet.active = column_property(Bullet.table, "active")
@@ -0,0 +1,218 @@
+# Collision Mask
+# スプライトの不透明ピクセル（色0以外）から当たり判定用のビットマスクを作り、
+# AABBで候補を絞った後の詳細判定をビット演算1回で行う。
+#
+# マスクの形式: スプライト内のピクセル(x, y)をビット y * MASK_STRIDE + x に置いた整数
+#   行の間隔MASK_STRIDEをスプライト2つ分の幅にしてあるので、2つのマスクの相対位置(dx, dy)は
+#   dx + dy * MASK_STRIDE ビットのシフトになり、ずらした行が隣の行へはみ出さない
+#   （外接矩形が重なっている＝|dx|がスプライトの幅以下であることが前提）。
+#
+# 画像バンクの不透明ピクセルはpyxresファイル（pyxel_resource.toml）から直接読むので、
+# pyxel.initの前やヘッドレス実行でも使える。読み取った行ごとのビット列は
+# pyxresのハッシュをキーにしてディスクへキャッシュし、次回からはTOMLを解析しない。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import marshal
+import Config
+from SpriteManager import SpIdx, sprite_manager, source_hash
+from DebugLog import logger, LogCategory
+
+# キャッシュファイルの形式（内容を変えたら上げる）
+MASK_CACHE_VERSION = 1
+
+# マスクの行の間隔（ビット数）
+MASK_STRIDE = Config.SPRITE_SIZE * 2
+
+# pyxresファイル内のリソース定義
+_RESOURCE_TOML = "pyxel_resource.toml"
+
+
+class SpriteMask:
+    """1つのスプライトの不透明ピクセルのマスクと、その外接矩形（スプライト内の座標）"""
+
+    __slots__ = ("bits", "x", "y", "w", "h")
+
+    def __init__(self, bits: int, x: int, y: int, w: int, h: int):
+        self.bits: int = bits
+        self.x: int = x
+        self.y: int = y
+        self.w: int = w
+        self.h: int = h
+
+
+def masks_overlap(a: SpriteMask, ax: int, ay: int, b: SpriteMask, bx: int, by: int) -> bool:
+    """スプライトの左上が(ax, ay)のマスクaと(bx, by)のマスクbが1ピクセルでも重なるか
+
+    座標は整数のピクセル位置。外接矩形のAABB判定で候補を絞ってから呼ぶこと。
+    """
+    shift = (bx - ax) + (by - ay) * MASK_STRIDE
+    if shift >= 0:
+        return (a.bits & (b.bits << shift)) != 0
+    return ((a.bits << -shift) & b.bits) != 0
+
+
+def sweep_masks(a: SpriteMask, ax: float, ay: float, adx: float, ady: float,
+                b: SpriteMask, bx: float, by: float, bdx: float, bdy: float,
+                t_entry: float, t_exit: float):
+    """スイープ判定で外接矩形が重なっている時刻t_entry-t_exitの間、相対移動が1ピクセル程度ずつ
+    進むようにマスクを判定し、最初に不透明ピクセルが重なった時刻を返す（重ならなければNone）
+
+    (ax, ay)はティック開始時のスプライトの左上、(adx, ady)はティック中の移動量。
+    """
+    span = t_exit - t_entry
+    steps = int(max(abs(adx - bdx), abs(ady - bdy)) * span) + 1
+    for step in range(steps + 1):
+        t = t_entry + span * step / steps
+        if masks_overlap(a, int(ax + adx * t), int(ay + ady * t), b, int(bx + bdx * t), int(by + bdy * t)):
+            return t
+    return None
+
+
+def read_opaque_rows(resource_path: str, bank: int) -> tuple:
+    """pyxresファイルの画像バンクを読み、行ごとの不透明ピクセルのビット列（ビットx=列x）を返す"""
+    import tomllib
+    import zipfile
+
+    with zipfile.ZipFile(resource_path) as archive:
+        if _RESOURCE_TOML not in archive.namelist():
+            raise ValueError(f"{resource_path} has no {_RESOURCE_TOML} (unsupported resource format)")
+        resource = tomllib.loads(archive.read(_RESOURCE_TOML).decode("utf-8"))
+
+    images = resource.get("images", [])
+    if bank >= len(images):
+        return ()
+
+    rows = []
+    for row in images[bank]["data"]:
+        bits = 0
+        for x, col in enumerate(row):
+            if col != 0:
+                bits |= 1 << x
+        rows.append(bits)
+    return tuple(rows)
+
+
+class CollisionMaskSet:
+    """画像バンクのスプライトの当たり判定マスク（最初に参照されたときに読み込む）"""
+
+    def __init__(self, resource_path: str = Config.RESOURCE_FILE,
+                 cache_path: str = Config.COLLISION_MASK_CACHE_FILE,
+                 bank: int = Config.TILE_BANK0, size: int = Config.SPRITE_SIZE):
+        self.resource_path: str = resource_path
+        self.cache_path: str = cache_path
+        self.bank: int = bank
+        self.size: int = size
+        self.rows = None                # 画像バンクの行ごとの不透明ピクセル（未読み込みならNone）
+        self.source: str = None         # "cache" / "resource"
+        self._masks: dict = {}          # (u, v) -> SpriteMask
+        self._frames: dict = {}         # スプライト名 -> FRAME_NUM順のSpriteMask
+
+    def _ensure_loaded(self):
+        if self.rows is None:
+            self.load()
+
+    def load(self):
+        """キャッシュが今のpyxresと一致すれば使い、違えばpyxresを読んでキャッシュを書き直す"""
+        with open(self.resource_path, "rb") as f:
+            key = source_hash(f.read())
+
+        rows = self._read_cache(key)
+        if rows is not None:
+            self.source = "cache"
+        else:
+            rows = read_opaque_rows(self.resource_path, self.bank)
+            self.source = "resource"
+            self._write_cache(key, rows)
+        self.rows = rows
+        self._masks.clear()
+        self._frames.clear()
+        logger.info(LogCategory.SPRITE, "[CollisionMask] Loaded %d rows of bank %d from %s",
+                    len(rows), self.bank, self.source)
+
+    def _read_cache(self, key: str):
+        try:
+            with open(self.cache_path, "rb") as f:
+                version, bank, cached_key, rows = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != MASK_CACHE_VERSION or bank != self.bank or cached_key != key:
+            return None
+        return rows
+
+    def _write_cache(self, key: str, rows: tuple):
+        # 書き込めない場所で動かしても、毎回pyxresを読むだけで動作には影響しない
+        try:
+            with open(self.cache_path, "wb") as f:
+                marshal.dump((MASK_CACHE_VERSION, self.bank, key, rows), f)
+        except OSError:
+            logger.warning(LogCategory.SPRITE, "[CollisionMask] Warning: could not write %s", self.cache_path)
+
+    def sprite_mask(self, sprite) -> SpriteMask:
+        """画像バンクの(sprite.x, sprite.y)にあるスプライトのマスク"""
+        key = (sprite.x, sprite.y)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = self._build_mask(sprite.x, sprite.y)
+        return mask
+
+    def _build_mask(self, u: int, v: int) -> SpriteMask:
+        self._ensure_loaded()
+        rows = self.rows
+        size = self.size
+        row_mask = (1 << size) - 1
+        bits = 0
+        min_x, min_y, max_x, max_y = size, size, -1, -1
+        for y in range(size):
+            if v + y >= len(rows):
+                break
+            row = (rows[v + y] >> u) & row_mask
+            if row == 0:
+                continue
+            bits |= row << (y * MASK_STRIDE)
+            min_y = min(min_y, y)
+            max_y = y
+            min_x = min(min_x, (row & -row).bit_length() - 1)
+            max_x = max(max_x, row.bit_length() - 1)
+        if max_x < 0:
+            return SpriteMask(0, 0, 0, 0, 0)
+        return SpriteMask(bits, min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+
+    def frame_masks(self, name: str) -> tuple:
+        """アニメーションのマスク（sprite_manager.get_sprite_frames(name)と同じ並び）"""
+        frames = self._frames.get(name)
+        if frames is None:
+            frames = self._frames[name] = tuple(
+                self.sprite_mask(sprite) for sprite in sprite_manager.get_sprite_frames(name))
+        return frames
+
+    def animation_mask(self, slot, time: int) -> SpriteMask:
+        """AnimationSlotが時刻timeに表示するフレームのマスク
+
+        描画側のAnimationClockを待たずにロジックの時刻から同じ式でフレームを選ぶ。
+        """
+        frames = self.frame_masks(slot.name)
+        return frames[time // slot.speed % len(frames)]
+
+    def bounds(self, names) -> tuple:
+        """名前のスプライト全て（全フレーム・全アクション）の不透明部分を囲む矩形 (x, y, w, h)"""
+        min_x, min_y, max_x, max_y = self.size, self.size, 0, 0
+        for name in names:
+            for sprite in sprite_manager.get_sprite_group(name):
+                mask = self.sprite_mask(SpIdx(sprite["x"], sprite["y"]))
+                if mask.w == 0:
+                    continue
+                min_x = min(min_x, mask.x)
+                min_y = min(min_y, mask.y)
+                max_x = max(max_x, mask.x + mask.w)
+                max_y = max(max_y, mask.y + mask.h)
+        if max_x == 0:
+            return (0, 0, 0, 0)
+        return (min_x, min_y, max_x - min_x, max_y - min_y)
+
+
+# グローバルインスタンス
+collision_masks = CollisionMaskSet()
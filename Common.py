@@ -6,19 +6,53 @@
 # Common Utilities
 # Core game utilities and shared functionality
 
-import random
-from ExplodeManager import ExpMan
+from ExplodeManager import explode_manager
 import Config
 import GameState
 from Enemy import Enemy
+from SpatialHash import SpatialHash
+from EntityRegistry import EntityRegistry
+from World import rebuild_grid, rebuild_swept_grid
+from Bullet import Bullet
+from EnemyBullet import EnemyBullet
+from CollisionMask import collision_masks
+import Rng
 
-# Entity Lists - global game object containers
-enemy_list = []
-enemy_bullet_list = []
-player_bullet_list = []
+# Entity Registry - 敵・弾のリストと索引を一元管理する（弾は固定容量のアーキタイプの行）
+registry = EntityRegistry(Bullet, EnemyBullet)
 
-# Particle System
-explode_manager = ExpMan()
+# Particle System - explode_managerはExplodeManagerのグローバルインスタンス
+
+# Entity Lists - global game object containers（registryが所有するリストの別名）
+enemy_list = registry.enemies
+enemy_bullet_list = registry.enemy_bullets
+player_bullet_list = registry.player_bullets
+
+# 敵の種類（sprite_num 1-5）のスプライト名
+ENEMY_SPRITE_NAMES = tuple(f"ENEMY{num:02d}" for num in range(1, 6))
+
+# Collision Broad Phase - 毎フレーム再構築する空間ハッシュ
+enemy_grid = SpatialHash(Config.COLLISION_CELL_SIZE)
+enemy_bullet_grid = SpatialHash(Config.COLLISION_CELL_SIZE)
+
+# 登録・生成のショートカット
+add_enemy = registry.add_enemy
+spawn_player_bullet = registry.spawn_player_bullet
+spawn_enemy_bullet = registry.spawn_enemy_bullet
+clear_enemies = registry.clear_enemies
+clear_bullets = registry.clear_bullets
+update_bullets = registry.update_bullets
+compact_entity_lists = registry.compact
+store_previous_positions = registry.store_previous_positions
+
+def pool_stats():
+    """各プールの占有状況（容量・使用中・最大使用数・取得失敗数）を返す"""
+    return {
+        registry.player_bullet_table.name: registry.player_bullet_table.stats(),
+        registry.enemy_bullet_table.name: registry.enemy_bullet_table.stats(),
+        "particle": explode_manager.stats(),
+        "burst": explode_manager.burst_stats(),
+    }
 
 def check_collision(x1, y1, w1, h1, x2, y2, w2, h2):
     """AABB collision detection"""
@@ -41,6 +75,101 @@ def check_collision(x1, y1, w1, h1, x2, y2, w2, h2):
 
     return is_collision
 
+def sweep_collision(x1, y1, w1, h1, dx1, dy1, x2, y2, w2, h2, dx2, dy2):
+    """Swept AABB collision detection
+
+    ティック開始時の位置(x, y)から(dx, dy)だけ動く2つの矩形が重なっている時刻の範囲を
+    (t_entry, t_exit)（0.0-1.0、ティック開始が0.0）で返す。重ならなければNone。
+    check_collisionと同じく、辺が接しているだけでは重なりとみなさない。
+    """
+    vx = dx1 - dx2
+    vy = dy1 - dy2
+
+    # 各軸で重なり始める時刻と重なり終わる時刻（相対速度0の軸は常に重なっているか、常に離れている）
+    if vx > 0:
+        entry_x = (x2 - x1 - w1) / vx
+        exit_x = (x2 + w2 - x1) / vx
+    elif vx < 0:
+        entry_x = (x2 + w2 - x1) / vx
+        exit_x = (x2 - x1 - w1) / vx
+    elif x1 < x2 + w2 and x1 + w1 > x2:
+        entry_x, exit_x = 0.0, 1.0
+    else:
+        return None
+
+    if vy > 0:
+        entry_y = (y2 - y1 - h1) / vy
+        exit_y = (y2 + h2 - y1) / vy
+    elif vy < 0:
+        entry_y = (y2 + h2 - y1) / vy
+        exit_y = (y2 - y1 - h1) / vy
+    elif y1 < y2 + h2 and y1 + h1 > y2:
+        entry_y, exit_y = 0.0, 1.0
+    else:
+        return None
+
+    t_entry = max(entry_x, entry_y, 0.0)
+    t_exit = min(exit_x, exit_y, 1.0)
+    if t_entry >= t_exit:
+        return None
+    return t_entry, t_exit
+
+def _rebuild_grid(grid, entities):
+    """アクティブなエンティティの当たり判定ボックスをグリッドへ登録する"""
+    grid.clear()
+    insert = grid.insert
+    for index, entity in enumerate(entities):
+        if entity.active:
+            insert(index, entity.x + entity.col_x, entity.y + entity.col_y, entity.col_w, entity.col_h)
+
+def apply_collision_mask_bounds(player_class):
+    """ピクセル単位の当たり判定を使う場合、各エンティティの当たり判定ボックスを
+    スプライト（全フレーム）の不透明ピクセルの外接矩形にする
+
+    ボックスはAABBの前段判定と空間ハッシュに使い、重なった組だけをマスクで判定する。
+    Playerはこのモジュールをimportしているので、クラスを引数で受け取る。
+    """
+    if not Config.PIXEL_COLLISION:
+        return
+    Enemy.col_x, Enemy.col_y, Enemy.col_w, Enemy.col_h = collision_masks.bounds(ENEMY_SPRITE_NAMES)
+    Bullet.col_x, Bullet.col_y, Bullet.col_w, Bullet.col_h = collision_masks.bounds(("PBULLET",))
+    EnemyBullet.col_x, EnemyBullet.col_y, EnemyBullet.col_w, EnemyBullet.col_h = \
+        collision_masks.bounds(("ENMYBLT",))
+    player_class.col_x, player_class.col_y, player_class.col_w, player_class.col_h = \
+        collision_masks.bounds(("PLAYER",))
+
+def _rebuild_swept_grid(grid, entities):
+    """アクティブなエンティティの当たり判定ボックスがティック開始時の位置から動いた範囲をグリッドへ登録する"""
+    grid.clear()
+    insert = grid.insert
+    for index, entity in enumerate(entities):
+        if entity.active:
+            x, y, px, py = entity.x, entity.y, entity.prev_x, entity.prev_y
+            insert(index, min(x, px) + entity.col_x, min(y, py) + entity.col_y,
+                   entity.col_w + abs(x - px), entity.col_h + abs(y - py))
+
+def rebuild_collision_grids(swept: bool = False):
+    """敵と敵弾の空間ハッシュを現在の位置で再構築する（衝突判定の直前に1回呼ぶ）
+
+    swept=Trueの場合は、ティック開始時の位置から現在の位置までの移動範囲で登録する。
+    """
+    table = registry.enemy_bullet_table
+    if swept:
+        _rebuild_swept_grid(enemy_grid, enemy_list)
+        rebuild_swept_grid(enemy_bullet_grid, table,
+                           EnemyBullet.col_x, EnemyBullet.col_y, EnemyBullet.col_w, EnemyBullet.col_h)
+        return
+    _rebuild_grid(enemy_grid, enemy_list)
+    rebuild_grid(enemy_bullet_grid, table,
+                 EnemyBullet.col_x, EnemyBullet.col_y, EnemyBullet.col_w, EnemyBullet.col_h)
+
+def query_collision_candidates(grid, entities, x, y, w, h):
+    """矩形と同じセルにいるエンティティをリスト順で返す（ブロードフェーズ）
+
+    詳細判定はcheck_collisionで行うこと。
+    """
+    return [entities[index] for index in grid.query(x, y, w, h)]
+
 def update_enemy_attack_selection():
     """Manage enemy attack state selection"""
     GameState.attack_selection_timer += 1
@@ -49,10 +178,11 @@ def update_enemy_attack_selection():
         GameState.attack_selection_timer = 0
         
         # Select enemies in normal state without cooldown
-        normal_enemies = [e for e in enemy_list if e.active and e.state == 0 and e.attack_cooldown_timer == 0]
+        normal_enemies = [e for e in registry.enemies_in_state(0) if e.attack_cooldown_timer == 0]
         
         if normal_enemies:
-            if random.random() < Enemy.ATTACK_CHANCE:
-                selected_enemy = random.choice(normal_enemies)
-                selected_enemy.state = 1  # ENEMY_STATE_PREPARE_ATTACK
+            rng = Rng.stream(Rng.ATTACK)
+            if rng.random() < Enemy.ATTACK_CHANCE:
+                selected_enemy = rng.choice(normal_enemies)
+                selected_enemy.change_state(1, "attack selected")  # ENEMY_STATE_PREPARE_ATTACK
                 selected_enemy.attack_timer = 0
\ No newline at end of file
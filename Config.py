@@ -6,23 +6,77 @@
 # Game Configuration Constants
 # All hardcoded values centralized here for easy modification
 
+import os
+
 # Game Information
 VERSION = "0.1.6"
 LAUNCH_DATE = "2025/07/17"
 
+# Resource Files - カレントディレクトリに依存しないよう、このファイルの場所を基準にする
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCE_FILE = os.path.join(BASE_DIR, "my_resource.pyxres")
+SPRITES_JSON_FILE = os.path.join(BASE_DIR, "sprites.json")
+SPRITE_ATLAS_FILE = os.path.join(BASE_DIR, "SpriteAtlas.py")
+COLLISION_MASK_CACHE_FILE = os.path.join(BASE_DIR, "collision_masks.cache")
+
 # Development Settings
 DEBUG = True  # デバッグモード有効化
 
+# Debug Log Settings（レベル: 10=DEBUG, 20=INFO, 30=WARNING, 40=ERROR）
+LOG_FILE = os.path.join(BASE_DIR, "debug_enemy.log")
+LOG_LEVEL = 10                  # これ未満のレベルは記録しない
+LOG_CONSOLE_LEVEL = 30          # これ以上のレベルはコンソールにも出力する
+LOG_BUFFER_SIZE = 4096          # リングバッファのレコード数
+LOG_FLUSH_INTERVAL = 0.1        # ライタースレッドの書き出し間隔（秒）
+
+# Profiler Settings
+PROFILER_ENABLED = False        # フェーズ別の処理時間計測
+PROFILER_HUD = False            # 計測結果の画面表示（F1キーで切り替え）
+PROFILER_HUD_LINES = 8          # HUDに表示するフェーズ数
+PROFILER_HISTORY = 240          # ローリング統計のフレーム数
+PROFILER_TRACE_FRAMES = 36000   # トレースとして保持する最大フレーム数
+PROFILER_TRACE_PATH = os.path.join(BASE_DIR, "profile_trace.json")  # 終了時の出力先（.csvならCSV）
+
 # Window Settings
 WIN_WIDTH = 128
 WIN_HEIGHT = 128
 DISPLAY_SCALE = 5
 FPS = 60
 
+# Fixed Timestep - ゲームロジックは描画フレームと独立した固定間隔のティックで進める
+FIXED_TIMESTEP = True           # Falseなら従来どおり1描画フレーム = 1ティック
+TICK_RATE = FPS                 # 1秒あたりのロジックティック数
+MAX_TICKS_PER_FRAME = 4         # 1描画フレームで進める最大ティック数（等速時、これを超えた遅れは切り捨て）
+MAX_SKIPPED_DRAWS = 3           # 遅れを取り戻す間に連続で間引く描画の最大数
+TURBO_SPEED = 1                 # 常時のロジック速度倍率（QA用に2-16を設定すると常にターボ）
+TURBO_HOLD_SPEED = 8            # TABキーを押している間のロジック速度倍率
+TURBO_MAX_SPEED = 16
+
+# Replay - ティックごとの入力を記録し、同じシードで再生すると結果がビット単位で一致する
+REPLAY_RECORD_PATH = os.path.join(BASE_DIR, "last_session.rpl")  # ESCで終了したときに保存する（Noneなら記録しない）
+REPLAY_KEYFRAME_INTERVAL = 600          # キーフレームの間隔（ティック）
+
+# Rewind - 直近のゲーム状態を差分圧縮して保持し、BACKSPACEを押している間巻き戻す
+REWIND_ENABLED = False                  # バランス調整・QA用（有効にすると2ティックごとに全状態を記録する）
+REWIND_SECONDS = 10                     # 巻き戻せる長さ（秒）
+REWIND_CAPTURE_INTERVAL = 2             # スナップショットを取る間隔（ティック）
+REWIND_KEYFRAME_EVERY = 30              # 単独で展開できるスナップショットの間隔（エントリ数）
+
 # Sprite Banks
 TILE_BANK0 = 0
 TILE_BANK1 = 1
 TILE_BANK2 = 2
+SPRITE_SIZE = 8
+
+# Sprite Variants - ヒット点滅・無敵点滅用に色を差し替えたスプライトを焼き込む
+VARIANT_BANK = TILE_BANK1               # 焼き込み先の画像バンク（リソースでは未使用のバンク）
+VARIANT_SPRITES = ("PLAYER", "ENEMY01", "ENEMY02", "ENEMY03", "ENEMY04", "ENEMY05")
+
+# Background Stars
+STAR_BACKEND = "layers"                 # "layers": 速度帯ごとに焼き込んだレイヤー / "points": 星ごとにpset
+STAR_COUNT = 100                        # 星の総数（元の密度。高密度の負荷はBenchmarkのstars10k_layersで測る）
+STAR_LAYER_SPEEDS = (0.2, 0.5, 1.2, 2.5)  # レイヤーのスクロール速度（遠い順、最大4レイヤー）
+STAR_BANK = TILE_BANK2                  # レイヤーを焼き込む画像バンク（リソースでは未使用のバンク）
 
 # Game State Constants
 STATE_TITLE = 0
@@ -40,6 +94,28 @@ STATE_PLAYING_STAGE_CLEAR = 3
 # Stage Management
 MAX_STAGE = 4
 
+# Collision Broad Phase
+COLLISION_CELL_SIZE = 16  # 空間ハッシュのセルサイズ（128x128画面を8x8セルに分割）
+
+# Collision Narrow Phase - スプライトの不透明ピクセルのマスクで当たりを判定する
+# （Falseなら従来どおり各エンティティの当たり判定ボックスのAABBだけで判定する）
+PIXEL_COLLISION = True
+
+# Continuous Collision - 弾と敵はティック開始時の位置から現在の位置までの移動範囲（スイープ）で判定し、
+# 当たった時刻の順に処理する。ティックあたりの移動量が大きくてもすり抜けない
+SWEPT_COLLISION = False
+
+# 衝突判定を行う間隔（ティック）。2以上では間のティックの移動をまとめて判定するので、
+# 1ティックの移動量をN倍にした低いティックレートの衝突判定を試せる（すり抜けないようにSWEPT_COLLISIONと組み合わせる）。
+# 区間の間の敵の動きは直線で補間するので、動く隊列では毎ティックの判定と結果が少し変わることがある
+# （Headless --check-stride Nで1との結果を比べられる）
+COLLISION_STRIDE = 1
+
+# Object Pools - 固定容量（空きが無い場合は生成しない）
+PLAYER_BULLET_POOL_SIZE = 32
+ENEMY_BULLET_POOL_SIZE = 128
+PARTICLE_POOL_SIZE = 2048
+
 # Visual Effects
 STOP_TIME = 20
 SHAKE_TIME = 10
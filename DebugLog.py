@@ -0,0 +1,174 @@
+# Debug Logging
+# カテゴリ・レベル付きのバッファリングロガー
+# 呼び出し側はレコード（書式文字列と引数）をリングバッファに積むだけで、
+# 文字列の整形とファイル書き込みはバックグラウンドのライタースレッドで行う
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import atexit
+import collections
+import sys
+import threading
+import time
+from enum import Enum
+
+import Config
+import GameState
+
+
+class LogCategory(Enum):
+    """Log category."""
+    ENEMY = 0
+    FORMATION = 1
+    WAVE = 2
+    SPRITE = 3
+    REPLAY = 4
+
+
+# ログレベル
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+
+class DebugLogger:
+    """リングバッファ＋バックグラウンドライターのロガー
+
+    - DEBUG/INFOはConfig.DEBUGが有効な時のみ記録する。WARNING以上は常に出力するが、
+      Config.DEBUGが無効な時はファイルもライタースレッドも作らず標準エラーへ直接出す
+    - 書式文字列は%形式で、引数と一緒に保存して書き込み時に整形する（遅延整形）
+    - バッファが満杯の場合は古いレコードから捨て、droppedに数える
+    """
+
+    def __init__(self, path: str, capacity: int = 4096, flush_interval: float = 0.1):
+        self.path: str = path
+        self.level: int = DEBUG
+        self.console_level: int = WARNING     # これ以上のレベルはコンソールにも出力する
+        self.disabled_categories: set = set()
+        self.flush_interval: float = flush_interval
+        self.dropped: int = 0
+
+        self._buffer = collections.deque(maxlen=capacity)
+        self._thread: threading.Thread = None
+        self._stop = threading.Event()
+        self._file = None
+        self._file_lock = threading.Lock()
+
+    # --- 記録API（ホットパスから呼ばれる） ---
+
+    def is_enabled(self, category: LogCategory, level: int = DEBUG) -> bool:
+        """このカテゴリ・レベルのログが記録されるか（ログ用の集計を省略する判定に使う）"""
+        if level < WARNING and not Config.DEBUG:
+            return False
+        return level >= self.level and category not in self.disabled_categories
+
+    def log(self, level: int, category: LogCategory, fmt: str, *args):
+        if level < WARNING and not Config.DEBUG:
+            return
+        if level < self.level or category in self.disabled_categories:
+            return
+        if not Config.DEBUG:
+            # ツールからimportしただけの場合などにログファイルを作らない
+            print(self._format(GameState.GameTimer, level, category, fmt, args), file=sys.stderr)
+            return
+
+        buffer = self._buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append((time.time(), GameState.GameTimer, level, category, fmt, args))
+
+        if self._thread is None:
+            self.start()
+
+    def debug(self, category: LogCategory, fmt: str, *args):
+        self.log(DEBUG, category, fmt, *args)
+
+    def info(self, category: LogCategory, fmt: str, *args):
+        self.log(INFO, category, fmt, *args)
+
+    def warning(self, category: LogCategory, fmt: str, *args):
+        self.log(WARNING, category, fmt, *args)
+
+    def error(self, category: LogCategory, fmt: str, *args):
+        self.log(ERROR, category, fmt, *args)
+
+    # --- ライタースレッド ---
+
+    def start(self, truncate: bool = False):
+        """ライタースレッドを起動する（truncate=Trueならログファイルを作り直す）"""
+        with self._file_lock:
+            if self._file is None or truncate:
+                if self._file is not None:
+                    self._file.close()
+                self._file = open(self.path, "w" if truncate else "a", encoding="utf-8")
+                if truncate:
+                    self._file.write("=== Enemy Debug Log Started ===\n")
+
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="DebugLogWriter", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    @staticmethod
+    def _format(frame: int, level: int, category: LogCategory, fmt: str, args: tuple) -> str:
+        """1レコードを1行に整形する"""
+        try:
+            message = fmt % args if args else fmt
+        except (TypeError, ValueError) as e:
+            message = f"{fmt!r} {args!r} (format error: {e})"
+        return f"{frame:>7} {LEVEL_NAMES.get(level, level):<5} {category.name:<9} {message}"
+
+    def flush(self):
+        """バッファのレコードを整形してファイルへ書き出す"""
+        buffer = self._buffer
+        if not buffer:
+            return
+
+        lines = []
+        console_lines = []
+        while buffer:
+            try:
+                timestamp, frame, level, category, fmt, args = buffer.popleft()
+            except IndexError:
+                break
+            line = self._format(frame, level, category, fmt, args)
+            lines.append(line)
+            if level >= self.console_level:
+                console_lines.append(line)
+
+        with self._file_lock:
+            if self._file is not None:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+        for line in console_lines:
+            print(line)
+
+    def close(self):
+        """ライタースレッドを停止し、残りのレコードを書き出す"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# グローバルインスタンス
+logger = DebugLogger(Config.LOG_FILE, Config.LOG_BUFFER_SIZE, Config.LOG_FLUSH_INTERVAL)
+logger.level = Config.LOG_LEVEL
+logger.console_level = Config.LOG_CONSOLE_LEVEL
+atexit.register(logger.close)
@@ -3,27 +3,83 @@
 # 座標管理の単純化とFormationIssue.mdの提案を反映
 
 import pyxel
-import Common
 import Config
 import GameState
-from SpriteManager import sprite_manager
+from AnimationClock import animation_clock
+from SpriteVariants import VARIANT_WHITE
+from RenderQueue import render_queue, LAYER_ENEMY
 from EntryPatterns import EntryPatternFactory
-from EnemyBullet import EnemyBullet
-import random
+from ExplodeManager import ExpType, explode_manager
 import math
+from array import array
+from DebugLog import logger, LogCategory
+import Rng
+
+# 敵の乱数ストリーム（射撃タイマー・射撃判定）
+_rng = Rng.stream(Rng.ENEMY)
 
 # Enemy States - 登場シーケンス対応
 ENEMY_STATE_ENTRY_SEQUENCE = -1     # 登場シーケンス中（左から水平移動等）
 ENEMY_STATE_MOVING_TO_HOME = -2     # ホームポジション移動中
 ENEMY_STATE_HOME_REACHED = -3       # ホームポジション到達・待機中
 ENEMY_STATE_NORMAL = 0              # 通常の隊列移動
+ENEMY_STATE_DESTROYED = -9          # 撃墜（状態リスナーへの通知専用。stateには設定しない）
+
+# ログ出力用の状態名
+ENEMY_STATE_NAMES = {
+    ENEMY_STATE_ENTRY_SEQUENCE: "ENTRY_SEQUENCE",
+    ENEMY_STATE_MOVING_TO_HOME: "MOVING_TO_HOME",
+    ENEMY_STATE_HOME_REACHED: "HOME_REACHED",
+    ENEMY_STATE_NORMAL: "NORMAL",
+    ENEMY_STATE_DESTROYED: "DESTROYED",
+}
+
+# 状態リスナー: callback(enemy, old_state, new_state)の形で状態遷移・撃墜を通知する
+_state_listeners = []
+
+def add_state_listener(callback):
+    """敵の状態遷移を受け取るコールバックを登録する"""
+    _state_listeners.append(callback)
+
+def remove_state_listener(callback):
+    """登録済みのコールバックを解除する"""
+    _state_listeners.remove(callback)
+
+# 敵が参照するエンティティレジストリ（生存数・敵弾の生成）。EntityRegistryが生成時に登録する
+# （EnemyからCommonをimportしないことで、Common -> Enemy の一方向の依存にしている）
+_registry = None
+
+def bind_registry(registry):
+    """射撃処理で使うエンティティレジストリを登録する"""
+    global _registry
+    _registry = registry
+
+_INF = float("inf")
 
 class Enemy:
     """シンプルな敵クラス - 基本的な隊列移動のみ"""
     
+    # インスタンスごとの属性は__slots__で固定する（__dict__を持たない）
+    __slots__ = (
+        "formation_slot",   # FormationManagerのスロット番号（隊列位置は配列側で保持）
+        "entry_pattern_obj", "entry_pattern_str", "entry_pattern", "entry_timer", "entry_y",
+        "base_x", "base_y",  # EntryPattern._move_to_formationが設定する
+        "x", "y", "w", "h", "sprite_num",
+        "prev_x", "prev_y",  # ティック開始時の位置（スイープ判定用）
+        "life", "score", "active", "flash", "state",
+        "wave_id", "enemy_index", "enemy_id",
+        "anim_slot", "shoot_timer",
+    )
+    
     # Constants
     MOVE_SPEED = 0.5                    # 隊列移動速度
     COLLISION_BOX = (1, 1, 6, 6)       # 当たり判定ボックス
+    col_x, col_y, col_w, col_h = COLLISION_BOX  # 当たり判定（全インスタンス共通）
+    
+    # 移動・到達判定用の定数
+    ENTRY_MOVE_SPEED = 1.5              # 登場時の移動速度
+    HOME_MOVE_SPEED = 2.0               # ホームポジション移動速度
+    HOME_PROXIMITY_THRESHOLD = 4.0      # ホームポジション到達判定の閾値
     
     # Shooting Constants
     SHOOT_INTERVAL = 60                 # 射撃間隔（1秒）
@@ -35,11 +91,10 @@ class Enemy:
         敵の初期化 - 登場シーケンス対応（EntryPattern統合版）
         座標管理をformation_x/y + x/yの2つのみに単純化
         """
-        # 隊列内での位置（理論位置・最終目標位置）
-        self.formation_x = float(x)     # 隊列内X座標
-        self.formation_y = float(y)     # 隊列内Y座標
+        # 隊列内での位置（理論位置・最終目標位置）はFormationManagerの配列に置く
+        self.formation_slot = formation_manager.allocate_slot(float(x), float(y), w)
         
-        # EntryPatternシステム統合
+        # EntryPatternシステム統合（パターンは全敵で共有し、進行度はentry_timerで持つ）
         self.entry_pattern_obj = EntryPatternFactory.create(entry_pattern_id) if entry_pattern_id else None
         self.entry_pattern_str = entry_pattern  # 従来の文字列パターン
         self.entry_timer = 0
@@ -51,40 +106,34 @@ class Enemy:
             self.x = float(init_x)
             self.y = float(init_y)
             self.state = ENEMY_STATE_ENTRY_SEQUENCE
-            if Config.DEBUG:
-                print(f"Enemy created with EntryPattern {entry_pattern_id}: init=({init_x},{init_y}), target=({x},{y})")
+            logger.debug(LogCategory.ENEMY, "Enemy created with EntryPattern %s: init=(%s,%s), target=(%s,%s)",
+                         entry_pattern_id, init_x, init_y, x, y)
         elif entry_pattern == "left_horizontal":
             # 左から水平移動パターン（従来）
             self.x = -16.0
             self.entry_y = entry_y if entry_y is not None else 64
             self.y = float(self.entry_y)
             self.state = ENEMY_STATE_ENTRY_SEQUENCE
-            if Config.DEBUG:
-                print(f"Left enemy created: entry_y={self.entry_y}, target_y={self.formation_y}")
+            logger.debug(LogCategory.ENEMY, "Left enemy created: entry_y=%s, target_y=%s", self.entry_y, float(y))
         elif entry_pattern == "right_horizontal":
             # 右から水平移動パターン（従来）
             self.x = Config.WIN_WIDTH + 8.0
             self.entry_y = entry_y if entry_y is not None else 64
             self.y = float(self.entry_y)
             self.state = ENEMY_STATE_ENTRY_SEQUENCE
-            if Config.DEBUG:
-                print(f"Right enemy created: entry_y={self.entry_y}, target_y={self.formation_y}")
+            logger.debug(LogCategory.ENEMY, "Right enemy created: entry_y=%s, target_y=%s", self.entry_y, float(y))
         else:
             # デフォルトは即座に隊列位置
             self.x = float(x)
             self.y = float(y)
+        self.prev_x = self.x
+        self.prev_y = self.y
         
         # スプライト設定
         self.w = w                      # スプライト幅
         self.h = h                      # スプライト高さ
         self.sprite_num = sprite_num    # 敵種類（1-5）
         
-        # 当たり判定
-        self.col_x = self.COLLISION_BOX[0]
-        self.col_y = self.COLLISION_BOX[1] 
-        self.col_w = self.COLLISION_BOX[2]
-        self.col_h = self.COLLISION_BOX[3]
-        
         # ゲーム属性
         self.life = life
         self.score = score
@@ -96,6 +145,7 @@ class Enemy:
             self.state = ENEMY_STATE_ENTRY_SEQUENCE
         else:
             self.state = ENEMY_STATE_NORMAL
+            formation_manager.join(self.formation_slot)
         
         # 登場パターン情報
         self.entry_pattern = entry_pattern
@@ -105,40 +155,84 @@ class Enemy:
         self.enemy_index = enemy_index      # ウェーブ内での順番 (0-9)
         self.enemy_id = f"W{wave_id}E{enemy_index:02d}"  # 一意なID (例: W0E00, W1E09)
         
-        # 移動・到達判定用の定数
-        self.ENTRY_MOVE_SPEED = 1.5         # 登場時の移動速度
-        self.HOME_MOVE_SPEED = 2.0          # ホームポジション移動速度  
-        self.HOME_PROXIMITY_THRESHOLD = 4.0 # ホームポジション到達判定の閾値
-        
-        # JSON駆動アニメーション
-        self.animation_speed = self._get_animation_speed()
+        # アニメーション（同じ種類の敵で共有するAnimationClockのスロット）
+        self.anim_slot = self._get_animation_slot()
         
         # 射撃システム
-        self.shoot_timer = random.randint(0, self.SHOOT_INTERVAL)  # 射撃タイマー（ランダム初期値）
+        self.shoot_timer = _rng.randint(0, self.SHOOT_INTERVAL)  # 射撃タイマー（ランダム初期値）
         
         # 初期状態をログ出力
-        if Config.DEBUG and (self.enemy_index == 0 or self.enemy_index == 9):  # 最初と最後の敵のみ
-            print(f"[{self.enemy_id}] Created: state={self.state}, pattern={self.entry_pattern_str}, entry_y={getattr(self, 'entry_y', 'N/A')}")
+        if self.enemy_index == 0 or self.enemy_index == 9:  # 最初と最後の敵のみ
+            logger.debug(LogCategory.ENEMY, "[%s] Created: state=%s, pattern=%s, entry_y=%s",
+                         self.enemy_id, self.state, self.entry_pattern_str, getattr(self, 'entry_y', 'N/A'))
 
-    def _log_state_change(self, old_state: int, new_state: int, reason: str = ""):
+    def snapshot(self) -> tuple:
+        """敵1体の状態（Snapshot用）
+
+        未設定のスロット（登場パターンによって設定されないentry_y等）はEllipsisで表す。
+        共有の入場パターンはパターンIDで、アニメーションのスロットは保存せずに復元時に引き直す。
+        """
+        pattern = self.entry_pattern_obj
+        return (pattern.pattern_id if pattern else None,
+                tuple(getattr(self, name, ...) for name in _SNAPSHOT_SLOTS))
+
+    @classmethod
+    def from_snapshot(cls, state: tuple) -> "Enemy":
+        """snapshotから敵を作り直す（__init__は通さないので、スロット確保や乱数の消費は起きない）"""
+        pattern_id, values = state
+        enemy = cls.__new__(cls)
+        for name, value in zip(_SNAPSHOT_SLOTS, values):
+            if value is not ...:
+                setattr(enemy, name, value)
+        enemy.entry_pattern_obj = EntryPatternFactory.create(pattern_id) if pattern_id else None
+        enemy.anim_slot = enemy._get_animation_slot()
+        return enemy
+
+    @property
+    def formation_x(self) -> float:
+        """隊列内X座標（FormationManagerのスロット配列から取得）"""
+        return formation_manager.get_slot_x(self.formation_slot)
+    
+    @property
+    def formation_y(self) -> float:
+        """隊列内Y座標（FormationManagerのスロット配列から取得）"""
+        return formation_manager.get_slot_y(self.formation_slot)
+    
+    def change_state(self, new_state: int, reason: str = "", *reason_args):
+        """状態遷移（隊列への参加・離脱とログ出力もここで行う）
+
+        reasonは%形式の書式で、reason_argsはログ出力時にのみ展開される
+        """
+        old_state = self.state
+        self.state = new_state
+        if new_state == ENEMY_STATE_NORMAL and old_state != ENEMY_STATE_NORMAL:
+            formation_manager.join(self.formation_slot)
+        elif old_state == ENEMY_STATE_NORMAL and new_state != ENEMY_STATE_NORMAL:
+            formation_manager.leave(self.formation_slot)
+        for listener in _state_listeners:
+            listener(self, old_state, new_state)
+        self._log_state_change(old_state, new_state, reason, *reason_args)
+    
+    def _log_state_change(self, old_state: int, new_state: int, reason: str = "", *reason_args):
         """状態変更をログ出力（最初と最後の敵のみ）"""
-        if Config.DEBUG and (self.enemy_index == 0 or self.enemy_index == 9):
-            state_names = {
-                -1: "ENTRY_SEQUENCE",
-                -2: "MOVING_TO_HOME", 
-                -3: "HOME_REACHED",
-                0: "NORMAL"
-            }
-            old_name = state_names.get(old_state, f"UNKNOWN({old_state})")
-            new_name = state_names.get(new_state, f"UNKNOWN({new_state})")
-            reason_str = f" ({reason})" if reason else ""
-            print(f"[{self.enemy_id}] State: {old_name} -> {new_name}{reason_str}")
+        if (self.enemy_index == 0 or self.enemy_index == 9) and logger.is_enabled(LogCategory.ENEMY):
+            old_name = ENEMY_STATE_NAMES.get(old_state, f"UNKNOWN({old_state})")
+            new_name = ENEMY_STATE_NAMES.get(new_state, f"UNKNOWN({new_state})")
+            if reason:
+                logger.debug(LogCategory.ENEMY, "[%s] State: %s -> %s (" + reason + ")",
+                             self.enemy_id, old_name, new_name, *reason_args)
+            else:
+                logger.debug(LogCategory.ENEMY, "[%s] State: %s -> %s", self.enemy_id, old_name, new_name)
 
     def update(self):
         """
         敵の更新処理 - 登場シーケンス対応
         隊列移動はmain.pyで一括処理される
         """
+        # ヒット点滅のカウントダウン（描画頻度に依存しないようupdateで進める）
+        if self.flash > 0:
+            self.flash -= 1
+
         if self.state == ENEMY_STATE_ENTRY_SEQUENCE:
             self._update_entry_sequence()
         elif self.state == ENEMY_STATE_MOVING_TO_HOME:
@@ -159,14 +253,10 @@ class Enemy:
             formation_reached = self.entry_pattern_obj.update(self)
             if formation_reached:
                 # EntryPatternが完了してホームポジションに到達
-                old_state = self.state
-                self.state = ENEMY_STATE_HOME_REACHED
-                self._log_state_change(old_state, self.state, "EntryPattern completed")
-            elif hasattr(self.entry_pattern_obj, 'moving_to_formation') and self.entry_pattern_obj.moving_to_formation:
+                self.change_state(ENEMY_STATE_HOME_REACHED, "EntryPattern completed")
+            elif self.entry_pattern_obj.is_moving_to_formation(self):
                 # EntryPatternがホームポジション移動中
-                old_state = self.state
-                self.state = ENEMY_STATE_MOVING_TO_HOME
-                self._log_state_change(old_state, self.state, "EntryPattern moving to formation")
+                self.change_state(ENEMY_STATE_MOVING_TO_HOME, "EntryPattern moving to formation")
         else:
             # 従来の水平移動パターン
             screen_center_x = Config.WIN_WIDTH // 2
@@ -176,17 +266,13 @@ class Enemy:
                 if self.x < screen_center_x:
                     self.x += self.ENTRY_MOVE_SPEED
                 else:
-                    old_state = self.state
-                    self.state = ENEMY_STATE_MOVING_TO_HOME
-                    self._log_state_change(old_state, self.state, "reached center from left")
+                    self.change_state(ENEMY_STATE_MOVING_TO_HOME, "reached center from left")
             elif self.entry_pattern_str == "right_horizontal":
                 # 画面中央（64px）まで左に移動
                 if self.x > screen_center_x:
                     self.x -= self.ENTRY_MOVE_SPEED
                 else:
-                    old_state = self.state
-                    self.state = ENEMY_STATE_MOVING_TO_HOME
-                    self._log_state_change(old_state, self.state, "reached center from right")
+                    self.change_state(ENEMY_STATE_MOVING_TO_HOME, "reached center from right")
     
     def _update_moving_to_home(self):
         """ホームポジション移動処理"""
@@ -213,9 +299,7 @@ class Enemy:
         if distance_to_home <= self.HOME_PROXIMITY_THRESHOLD:
             self.x = target_x
             self.y = target_y
-            old_state = self.state
-            self.state = ENEMY_STATE_HOME_REACHED
-            self._log_state_change(old_state, self.state, f"reached home (distance={distance_to_home:.1f})")
+            self.change_state(ENEMY_STATE_HOME_REACHED, "reached home (distance=%.1f)", distance_to_home)
     
     def _update_home_reached(self):
         """ホームポジション到達・待機状態"""
@@ -233,8 +317,7 @@ class Enemy:
         隊列位置の更新（main.pyから呼び出される）
         隊列移動の一元化
         """
-        self.formation_x += move_x
-        self.formation_y += move_y
+        formation_manager.move_slot(self.formation_slot, move_x, move_y)
     
     def is_in_formation(self) -> bool:
         """隊列にいるかどうかの判定 - 登場シーケンス対応"""
@@ -256,53 +339,42 @@ class Enemy:
         """弾との衝突処理"""
         bullet.active = False
         self.life -= 1
+        GameState.EnemyHits += 1
         
         if self.life <= 0:
             self.active = False
+            GameState.EnemyKills += 1
+            if self.state == ENEMY_STATE_NORMAL:
+                formation_manager.leave(self.formation_slot)
+            for listener in _state_listeners:
+                listener(self, self.state, ENEMY_STATE_DESTROYED)
             GameState.Score += self.score
             pyxel.play(0, 1)  # 破壊音
             # 爆発エフェクト
-            if hasattr(Common, 'explode_manager'):
-                from ExplodeManager import ExpType
-                Common.explode_manager.spawn_explosion(self.x + 4, self.y + 4, 20, ExpType.RECT)
+            explode_manager.spawn_explosion(self.x + 4, self.y + 4, 20, ExpType.RECT)
         else:
             self.flash = 6  # ヒット点滅
             pyxel.play(0, 2)  # ヒット音
             # 小さな爆発エフェクト
-            if hasattr(Common, 'explode_manager'):
-                from ExplodeManager import ExpType
-                Common.explode_manager.spawn_explosion(self.x + 4, self.y + 4, 5, ExpType.DOT_REFRECT)
+            explode_manager.spawn_explosion(self.x + 4, self.y + 4, 5, ExpType.DOT_REFRECT)
     
     def draw(self):
         """敵の描画処理"""
-        # ヒット時の点滅処理
+        # スプライト描画（現在のフレームはAnimationClockのスロットから読む）
+        # ヒット時の点滅は焼き込み済みの白いシルエットを描く
+        slot = self.anim_slot
         if self.flash > 0:
-            for i in range(1, 15):
-                pyxel.pal(i, pyxel.COLOR_WHITE)
-        
-        self.flash = max(0, self.flash - 1)
-        
-        # JSON駆動のアニメーション
-        anim_frame = self._get_animation_frame(pyxel.frame_count)
-        sprite_idx = self._get_enemy_sprite(anim_frame)
-        
-        # スプライト描画
-        pyxel.blt(
-            int(self.x),
-            int(self.y),
-            Config.TILE_BANK0,
-            sprite_idx.x,
-            sprite_idx.y,
-            self.w,
-            self.h,
-            pyxel.COLOR_BLACK,
-        )
-        
-        pyxel.pal()  # パレットリセット
+            bank = Config.VARIANT_BANK
+            v = slot.v + VARIANT_WHITE
+        else:
+            bank = Config.TILE_BANK0
+            v = slot.v
+        render_queue.submit(LAYER_ENEMY, bank, slot.u, v, self.w, self.h, int(self.x), int(self.y))
         
         # デバッグ用当たり判定表示
         if Config.DEBUG:
-            pyxel.rectb(
+            render_queue.overlay(
+                pyxel.rectb,
                 int(self.x + self.col_x), 
                 int(self.y + self.col_y), 
                 self.col_w, 
@@ -310,23 +382,9 @@ class Enemy:
                 pyxel.COLOR_RED
             )
 
-    def _get_animation_speed(self) -> int:
-        """JSONからアニメーション速度を取得"""
-        enemy_name = f"ENEMY{self.sprite_num:02d}"
-        anim_spd = sprite_manager.get_sprite_metadata(enemy_name, "ANIM_SPD", "10")
-        try:
-            return int(anim_spd)
-        except (ValueError, TypeError):
-            return 10  # デフォルト値
-    
-    def _get_animation_frame(self, frame_count: int) -> int:
-        """アニメーションフレーム計算"""
-        return frame_count // self.animation_speed % 4  # 4フレーム循環
-    
-    def _get_enemy_sprite(self, anim_frame: int):
-        """JSON駆動のスプライト取得"""
-        enemy_name = f"ENEMY{self.sprite_num:02d}"
-        return sprite_manager.get_sprite_by_name_and_field(enemy_name, "FRAME_NUM", str(anim_frame % 4))
+    def _get_animation_slot(self):
+        """敵の種類（sprite_num）のアニメーションスロットを取得"""
+        return animation_clock.slot(f"ENEMY{self.sprite_num:02d}", 10)
     
     def _update_shooting(self):
         """
@@ -336,7 +394,7 @@ class Enemy:
         self.shoot_timer -= 1
         if self.shoot_timer <= 0:
             # 残りの敵の数を取得
-            remaining_enemies = len([e for e in Common.enemy_list if e.active])
+            remaining_enemies = _registry.active_enemy_count
             if remaining_enemies > 0:
                 # 敵の数が減るほど射撃確率が上がる
                 shoot_chance = min(
@@ -344,41 +402,142 @@ class Enemy:
                     self.MAX_SHOOT_CHANCE
                 )
                 
-                if random.random() < shoot_chance:
+                if _rng.random() < shoot_chance:
                     # 敵弾を発射（敵の中心から）
                     bullet_x = self.x + 4
                     bullet_y = self.y + 8
-                    Common.enemy_bullet_list.append(EnemyBullet(bullet_x, bullet_y))
+                    _registry.spawn_enemy_bullet(bullet_x, bullet_y)
                     
-                    if Config.DEBUG:
-                        print(f"[{self.enemy_id}] Shot fired! Chance: {shoot_chance:.2f}, Remaining: {remaining_enemies}")
+                    logger.debug(LogCategory.ENEMY, "[%s] Shot fired! Chance: %.2f, Remaining: %d",
+                                 self.enemy_id, shoot_chance, remaining_enemies)
             
             # 射撃タイマーをリセット
             self.shoot_timer = self.SHOOT_INTERVAL
 
 
+# スナップショットで値を保存するスロット（共有パターンとアニメーションスロットは別扱い）
+_SNAPSHOT_SLOTS = tuple(name for name in Enemy.__slots__ if name not in ("entry_pattern_obj", "anim_slot"))
+
+
 class FormationManager:
     """
     隊列移動の一元管理クラス
     FormationIssue.mdの提案を実装
+
+    隊列位置は敵ごとではなくスロット単位の連続配列（array）で保持する。
+    隊列にいるスロットは共通オフセットからの相対座標で持つため、
+    隊列全体の移動はオフセットの加算1回で済み、端の検出も配列に対する
+    min/maxの1回で行える（敵の数に比例するPythonループが無い）。
     """
     
     MOVE_SPEED = 0.7        # 隊列移動速度（少し高速化）
     MOVE_THRESHOLD = 1.0    # 移動閾値
     
     def __init__(self):
+        self.reset()
+        self.reset_slots()
+    
+    def reset(self):
+        """隊列移動状態の初期化"""
         self.move_direction = 1         # 1=右, -1=左
         self.accumulated_movement = 0.0  # 累積移動量
     
-    def update(self, enemy_list):
+    def reset_slots(self):
+        """スロット配列を空にする（ステージ開始時など敵リストを作り直す時に呼ぶ）"""
+        # スロット座標: 隊列外は絶対座標、隊列内はoffset_x/offset_yからの相対座標
+        self.slot_x = array("d")
+        self.slot_y = array("d")
+        self.slot_w = array("d")
+        # 端の検出用: 隊列内スロットは相対の左端/右端、隊列外は±inf（min/maxに影響しない）
+        self.slot_left = array("d")
+        self.slot_right = array("d")
+        self.slot_member = array("b")   # 1=隊列内
+        self.offset_x = 0.0             # 隊列全体の移動量
+        self.offset_y = 0.0
+        self.member_count = 0
+    
+    def allocate_slot(self, x: float, y: float, w: float) -> int:
+        """隊列位置(x, y)のスロットを確保して番号を返す（初期状態は隊列外）"""
+        self.slot_x.append(x)
+        self.slot_y.append(y)
+        self.slot_w.append(w)
+        self.slot_left.append(_INF)
+        self.slot_right.append(-_INF)
+        self.slot_member.append(0)
+        return len(self.slot_x) - 1
+    
+    def get_slot_x(self, slot: int) -> float:
+        """スロットの隊列内X座標"""
+        if self.slot_member[slot]:
+            return self.slot_x[slot] + self.offset_x
+        return self.slot_x[slot]
+    
+    def get_slot_y(self, slot: int) -> float:
+        """スロットの隊列内Y座標"""
+        if self.slot_member[slot]:
+            return self.slot_y[slot] + self.offset_y
+        return self.slot_y[slot]
+    
+    def move_slot(self, slot: int, move_x: float, move_y: float = 0):
+        """1スロットだけ隊列位置を動かす"""
+        self.slot_x[slot] += move_x
+        self.slot_y[slot] += move_y
+        if self.slot_member[slot]:
+            self.slot_left[slot] = self.slot_x[slot]
+            self.slot_right[slot] = self.slot_x[slot] + self.slot_w[slot]
+    
+    def join(self, slot: int):
+        """スロットを隊列に参加させる（以降は隊列移動に追従する）"""
+        if self.slot_member[slot]:
+            return
+        rel_x = self.slot_x[slot] - self.offset_x
+        self.slot_x[slot] = rel_x
+        self.slot_y[slot] -= self.offset_y
+        self.slot_left[slot] = rel_x
+        self.slot_right[slot] = rel_x + self.slot_w[slot]
+        self.slot_member[slot] = 1
+        self.member_count += 1
+    
+    def leave(self, slot: int):
+        """スロットを隊列から外す（現在位置で固定される）"""
+        if not self.slot_member[slot]:
+            return
+        self.slot_x[slot] += self.offset_x
+        self.slot_y[slot] += self.offset_y
+        self.slot_left[slot] = _INF
+        self.slot_right[slot] = -_INF
+        self.slot_member[slot] = 0
+        self.member_count -= 1
+    
+    def snapshot(self) -> tuple:
+        """隊列の状態（Snapshot用。スロット配列はバイト列で保持する）"""
+        return (self.move_direction, self.accumulated_movement,
+                self.slot_x.tobytes(), self.slot_y.tobytes(), self.slot_w.tobytes(),
+                self.slot_left.tobytes(), self.slot_right.tobytes(), self.slot_member.tobytes(),
+                self.offset_x, self.offset_y, self.member_count)
+
+    def restore(self, state: tuple):
+        (self.move_direction, self.accumulated_movement,
+         slot_x, slot_y, slot_w, slot_left, slot_right, slot_member,
+         self.offset_x, self.offset_y, self.member_count) = state
+        self.slot_x = array("d", slot_x)
+        self.slot_y = array("d", slot_y)
+        self.slot_w = array("d", slot_w)
+        self.slot_left = array("d", slot_left)
+        self.slot_right = array("d", slot_right)
+        self.slot_member = array("b", slot_member)
+
+    def get_edges(self):
+        """隊列内スロットの左端・右端（絶対座標）"""
+        return min(self.slot_left) + self.offset_x, max(self.slot_right) + self.offset_x
+    
+    def update(self, enemy_list=None):
         """
         隊列移動の更新処理
         main.pyから呼び出される
+        （隊列のメンバーは状態遷移時に登録済みなので、enemy_listは走査しない）
         """
-        # アクティブで隊列にいる敵のみを対象
-        formation_enemies = [e for e in enemy_list if e.active and e.is_in_formation()]
-        
-        if not formation_enemies:
+        if self.member_count == 0:
             return
         
         # 累積移動量を更新
@@ -390,26 +549,24 @@ class FormationManager:
             self.accumulated_movement -= move_amount
             
             # 方向転換チェック（移動前に実行）
-            self._check_direction_change(formation_enemies)
+            self._check_direction_change()
             
             # デバッグ出力（移動時のみ）
-            if Config.DEBUG:
-                leftmost = min(e.get_left_edge() for e in formation_enemies)
-                rightmost = max(e.get_right_edge() for e in formation_enemies)
-                print(f"[FormationManager] Moving {move_amount}px, direction={self.move_direction}, enemies={len(formation_enemies)}, range=[{leftmost:.1f}-{rightmost:.1f}]")
+            if logger.is_enabled(LogCategory.FORMATION):
+                leftmost, rightmost = self.get_edges()
+                logger.debug(LogCategory.FORMATION, "[FormationManager] Moving %dpx, direction=%d, enemies=%d, range=[%.1f-%.1f]",
+                             move_amount, self.move_direction, self.member_count, leftmost, rightmost)
             
-            # 全ての隊列敵の位置を一括更新
-            for enemy in formation_enemies:
-                enemy.update_formation_position(move_amount)
+            # 全ての隊列敵の位置を一括更新（共通オフセットの加算のみ）
+            self.offset_x += move_amount
     
-    def _check_direction_change(self, formation_enemies):
+    def _check_direction_change(self):
         """端の敵の位置を監視して方向転換"""
-        if not formation_enemies:
+        if self.member_count == 0:
             return
         
         # 隊列の端点を取得
-        leftmost_x = min(e.get_left_edge() for e in formation_enemies)
-        rightmost_x = max(e.get_right_edge() for e in formation_enemies)
+        leftmost_x, rightmost_x = self.get_edges()
         
         # 方向転換判定（少し余裕を持たせる）
         old_direction = self.move_direction
@@ -420,8 +577,9 @@ class FormationManager:
             self.move_direction = 1   # 右へ
         
         # 方向転換のデバッグ出力
-        if Config.DEBUG and old_direction != self.move_direction:
-            print(f"[FormationManager] Direction changed: {old_direction} -> {self.move_direction}, leftmost={leftmost_x:.1f}, rightmost={rightmost_x:.1f}")
+        if old_direction != self.move_direction:
+            logger.debug(LogCategory.FORMATION, "[FormationManager] Direction changed: %d -> %d, leftmost=%.1f, rightmost=%.1f",
+                         old_direction, self.move_direction, leftmost_x, rightmost_x)
 
 
 # グローバルな隊列管理インスタンス
@@ -4,22 +4,50 @@
 # 変数の型は宣言してください
 
 import pyxel
-import Common
 import Config
 from SpriteManager import sprite_manager
+from World import Archetype, column_property
+from RenderQueue import render_queue, LAYER_ENEMY_BULLET
 
 class EnemyBullet:
+    """敵弾のファサード
+
+    実データはEnemyBullet.table（アーキタイプ）の1行。x/y/activeは列への読み書きになる。
+    毎フレームの移動・描画はupdate_all/draw_allが列をまとめて処理する。
+    """
     # EnemyBullet Constants
     SPEED = 2
     COLLISION_BOX = (2, 2, 4, 4)  # x, y, w, h
-    def __init__(self, x, y):
+
+    __slots__ = ("row",)
+
+    # 全インスタンス共通の定数
+    speed = SPEED
+    col_x, col_y, col_w, col_h = COLLISION_BOX  # Collision box
+
+    # 弾テーブル（クラス定義の後で生成する）
+    table = None
+
+    def __init__(self, row):
+        self.row = row
+
+    @classmethod
+    def spawn(cls, x, y):
+        """テーブルに1行確保して弾を生成する（空きが無ければNone）"""
+        row = cls.table.spawn()
+        if row < 0:
+            return None
+        bullet = cls.table.facades[row]
+        bullet.reset(x, y)
+        return bullet
+
+    def reset(self, x, y):
+        """位置を再設定してアクティブにする"""
         self.x = x
         self.y = y
-        self.speed = self.SPEED
+        self.px = x
+        self.py = y
         self.active = True
-        
-        # Collision box
-        self.col_x, self.col_y, self.col_w, self.col_h = self.COLLISION_BOX
 
     def update(self):
         self.y += self.speed
@@ -31,16 +59,60 @@ class EnemyBullet:
     def draw(self):
         # JSON駆動のスプライト取得
         bullet_sprite = self._get_enemy_bullet_sprite()
-        
-        pyxel.blt(self.x, self.y, Config.TILE_BANK0, 
-                  bullet_sprite.x, bullet_sprite.y, 
-                  8, 8, pyxel.COLOR_BLACK)
+        render_queue.submit(LAYER_ENEMY_BULLET, Config.TILE_BANK0,
+                            bullet_sprite.x, bullet_sprite.y, 8, 8, self.x, self.y)
         
         # Collision Box
         if Config.DEBUG:
-            pyxel.rectb(self.x + self.col_x, self.y + self.col_y, 
-                       self.col_w, self.col_h, pyxel.COLOR_RED)
+            render_queue.overlay(pyxel.rectb, self.x + self.col_x, self.y + self.col_y,
+                                 self.col_w, self.col_h, pyxel.COLOR_RED)
+
+    # --- システム（全行をまとめて処理する） ---
+
+    @classmethod
+    def update_all(cls):
+        """移動・カリングシステム: 全弾を下へ動かし、画面外に出た弾を非アクティブにする"""
+        table = cls.table
+        ys = table.y
+        active = table.active
+        speed = cls.speed
+        bottom = Config.WIN_HEIGHT
+        for row in range(table.count):
+            y = ys[row] + speed
+            ys[row] = y
+            if y > bottom:
+                active[row] = False
+
+    @classmethod
+    def draw_all(cls):
+        """描画システム: スプライトを1回だけ引いて全弾をレンダーキューへ積む"""
+        table = cls.table
+        count = table.count
+        if count == 0:
+            return
+
+        bullet_sprite = cls._get_enemy_bullet_sprite()
+        xs, ys = table.x, table.y
+        render_queue.submit_rows(LAYER_ENEMY_BULLET, Config.TILE_BANK0,
+                                 bullet_sprite.x, bullet_sprite.y, 8, 8, xs, ys, count)
+
+        # Collision Box
+        if Config.DEBUG:
+            for row in range(count):
+                render_queue.overlay(pyxel.rectb, xs[row] + cls.col_x, ys[row] + cls.col_y,
+                                     cls.col_w, cls.col_h, pyxel.COLOR_RED)
     
-    def _get_enemy_bullet_sprite(self):
+    @staticmethod
+    def _get_enemy_bullet_sprite():
         """敵弾丸のスプライトを取得する"""
-        return sprite_manager.get_sprite_by_name_and_field("ENMYBLT", "ACT_NAME", "UNDEF")
\ No newline at end of file
+        return sprite_manager.get_sprite_by_name_and_field("ENMYBLT", "ACT_NAME", "UNDEF")
+
+
+# 敵弾テーブル（位置・前ティックの位置・生存フラグ）
+EnemyBullet.table = Archetype("enemy_bullet", Config.ENEMY_BULLET_POOL_SIZE,
+                              {"x": 0.0, "y": 0.0, "px": 0.0, "py": 0.0, "active": False}, EnemyBullet)
+EnemyBullet.x = column_property(EnemyBullet.table, "x")
+EnemyBullet.y = column_property(EnemyBullet.table, "y")
+EnemyBullet.px = column_property(EnemyBullet.table, "px")
+EnemyBullet.py = column_property(EnemyBullet.table, "py")
+EnemyBullet.active = column_property(EnemyBullet.table, "active")
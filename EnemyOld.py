@@ -8,6 +8,7 @@ import Common
 import Config
 import GameState
 from SpriteManager import sprite_manager
+from DebugLog import logger, LogCategory
 import random
 import math
 from ExplodeManager import ExpType
@@ -193,14 +194,13 @@ class Enemy:
         self.formation_x += move_amount_x  # formation_xも更新（重要！）
         
         # デバッグ情報（隊列移動中の敵の座標）
-        if Config.DEBUG and move_amount_x != 0:
-            debug_msg = f"[NORMAL] Enemy {id(self) % 1000}: move_amount={move_amount_x}\n"
-            debug_msg += f"  x: {old_x:.1f} -> {self.x:.1f}, base_x: {old_base_x:.1f} -> {self.base_x:.1f}\n"
-            debug_msg += f"  formation_x: {old_formation_x:.1f} -> {self.formation_x:.1f}\n"
-            print(debug_msg.strip())
-            # ファイルにも出力
-            with open("debug_enemy.log", "a") as f:
-                f.write(debug_msg)
+        if move_amount_x != 0:
+            logger.debug(LogCategory.ENEMY,
+                         "[NORMAL] Enemy %d: move_amount=%s\n"
+                         "  x: %.1f -> %.1f, base_x: %.1f -> %.1f\n"
+                         "  formation_x: %.1f -> %.1f",
+                         id(self) % 1000, move_amount_x, old_x, self.x, old_base_x, self.base_x,
+                         old_formation_x, self.formation_x)
 
     def _update_prepare_attack(self, move_amount_x):
         """攻撃準備状態処理"""
@@ -325,28 +325,24 @@ class Enemy:
             self.attack_cooldown_timer = self.ATTACK_COOLDOWN  # 攻撃クールダウン開始
             
             # デバッグ情報（攻撃モードからの復帰）
-            if Config.DEBUG:
-                debug_msg = f"[RETURN] Enemy {id(self) % 1000}: RETURNED TO FORMATION\n"
-                debug_msg += f"  target_x: {target_x:.1f}, target_y: {target_y:.1f}\n"
-                debug_msg += f"  move_amount_x: {move_amount_x}\n"
-                debug_msg += f"  formation_x: {self.formation_x:.1f}, formation_y: {self.formation_y:.1f}\n"
-                debug_msg += f"  x: {old_x:.1f} -> {self.x:.1f}, base_x: {old_base_x:.1f} -> {self.base_x:.1f}\n"
-                print(debug_msg.strip())
-                # ファイルにも出力
-                with open("debug_enemy.log", "a") as f:
-                    f.write(debug_msg)
+            logger.debug(LogCategory.ENEMY,
+                         "[RETURN] Enemy %d: RETURNED TO FORMATION\n"
+                         "  target_x: %.1f, target_y: %.1f\n"
+                         "  move_amount_x: %s\n"
+                         "  formation_x: %.1f, formation_y: %.1f\n"
+                         "  x: %.1f -> %.1f, base_x: %.1f -> %.1f",
+                         id(self) % 1000, target_x, target_y, move_amount_x,
+                         self.formation_x, self.formation_y, old_x, self.x, old_base_x, self.base_x)
         else:
             # まだ復帰中の場合はグループ移動を反映
             old_x = self.x
             self.x += move_amount_x
             
             # デバッグ情報（復帰中の移動）
-            if Config.DEBUG and move_amount_x != 0:
-                debug_msg = f"[DESCENDING] Enemy {id(self) % 1000}: move_amount={move_amount_x}, x: {old_x:.1f} -> {self.x:.1f}, target_x: {target_x:.1f}, distance: {distance_to_formation:.1f}\n"
-                print(debug_msg.strip())
-                # ファイルにも出力
-                with open("debug_enemy.log", "a") as f:
-                    f.write(debug_msg)
+            if move_amount_x != 0:
+                logger.debug(LogCategory.ENEMY,
+                             "[DESCENDING] Enemy %d: move_amount=%s, x: %.1f -> %.1f, target_x: %.1f, distance: %.1f",
+                             id(self) % 1000, move_amount_x, old_x, self.x, target_x, distance_to_formation)
 
     def _update_continuous_attack(self, move_amount_x):
         """連続攻撃モード処理"""
@@ -406,7 +402,7 @@ class Enemy:
             if self.state == ENEMY_STATE_ENTERING:
                 self.state = ENEMY_STATE_FORMATION_READY
             # デバッグ出力
-            GameState.debug_print(f"[DEBUG] Enemy destroyed: state={self.state}, active={self.active}")
+            logger.debug(LogCategory.ENEMY, "[DEBUG] Enemy destroyed: state=%d, active=%s", self.state, self.active)
             GameState.Score += self.Score  # スコア加算
             pyxel.play(0, 1)  # 効果音再生
             Common.explode_manager.spawn_explosion(self.x + 4, self.y + 4, 20, ExpType.RECT)
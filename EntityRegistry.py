@@ -0,0 +1,179 @@
+# Entity Registry
+# 敵と弾のリストを一元管理し、生存数や状態別の所属を差分更新で保持する
+# 「生存している敵の数」「NORMAL状態の敵」などの問い合わせに、
+# リストを走査せずO(1)（または結果の件数に比例するコスト）で答える
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+from Enemy import Enemy, add_state_listener, bind_registry, ENEMY_STATE_DESTROYED
+
+
+def compact(entities: list) -> int:
+    """非アクティブなエンティティをリストからその場で取り除く（順序は維持）
+
+    リストを作り直さないため、毎フレームのリスト再確保が発生しない。
+
+    Returns:
+        取り除いた数
+    """
+    alive = 0
+    for entity in entities:
+        if entity.active:
+            entities[alive] = entity
+            alive += 1
+
+    removed = len(entities) - alive
+    if removed:
+        del entities[alive:]
+    return removed
+
+
+class EntityRegistry:
+    """敵・弾の所有者
+
+    敵はadd_enemyで登録し、以降の状態遷移・撃墜はEnemyの状態リスナー経由で
+    受け取って状態別の索引（挿入順を保つdict）と生存数を更新する。
+    弾はファサードクラス（Bullet/EnemyBullet）のアーキタイプの行として生成し、
+    compactで行を前詰めする。
+    """
+
+    def __init__(self, player_bullet_type, enemy_bullet_type):
+        self.player_bullet_type = player_bullet_type
+        self.enemy_bullet_type = enemy_bullet_type
+        self.player_bullet_table = player_bullet_type.table
+        self.enemy_bullet_table = enemy_bullet_type.table
+
+        # エンティティのリスト（更新・描画・衝突判定の順序はこのリスト順）
+        # 弾のリストはテーブルの使用中の行のファサード（テーブル側が維持する）
+        self.enemies: list = []
+        self.player_bullets: list = self.player_bullet_table.rows
+        self.enemy_bullets: list = self.enemy_bullet_table.rows
+
+        # 敵の索引
+        self.active_enemy_count: int = 0
+        self._enemies_by_state: dict = {}   # state -> {enemy: None}（生存中の敵のみ）
+
+        add_state_listener(self._on_enemy_state_changed)
+        bind_registry(self)
+
+    # --- 敵 ---
+
+    def add_enemy(self, enemy):
+        """敵を登録してリスト末尾へ追加する"""
+        self.enemies.append(enemy)
+        if enemy.active:
+            self.active_enemy_count += 1
+            self._state_members(enemy.state)[enemy] = None
+        return enemy
+
+    def clear_enemies(self):
+        """全ての敵を登録解除する"""
+        self.enemies.clear()
+        self.active_enemy_count = 0
+        self._enemies_by_state.clear()
+
+    def enemies_in_state(self, state: int):
+        """指定状態の生存中の敵（状態へ入った順）"""
+        members = self._enemies_by_state.get(state)
+        return members.keys() if members else ()
+
+    def count_in_state(self, state: int) -> int:
+        """指定状態の生存中の敵の数"""
+        members = self._enemies_by_state.get(state)
+        return len(members) if members else 0
+
+    def _state_members(self, state: int) -> dict:
+        members = self._enemies_by_state.get(state)
+        if members is None:
+            members = self._enemies_by_state[state] = {}
+        return members
+
+    def _on_enemy_state_changed(self, enemy, old_state: int, new_state: int):
+        """Enemyの状態リスナー: 状態別の索引と生存数を更新する"""
+        members = self._enemies_by_state.get(old_state)
+        if members is None or enemy not in members:
+            return  # 未登録の敵（リストへ追加されていない敵）は無視する
+        del members[enemy]
+        if new_state == ENEMY_STATE_DESTROYED:
+            self.active_enemy_count -= 1
+        else:
+            self._state_members(new_state)[enemy] = None
+
+    # --- 弾 ---
+
+    def spawn_player_bullet(self, x, y, w, h):
+        """プレイヤー弾を生成してリスト末尾へ追加する（空きが無ければ発射しない）"""
+        return self.player_bullet_type.spawn(x, y, w, h)
+
+    def spawn_enemy_bullet(self, x, y):
+        """敵弾を生成してリスト末尾へ追加する（空きが無ければ発射しない）"""
+        return self.enemy_bullet_type.spawn(x, y)
+
+    def update_bullets(self):
+        """弾の移動・カリングシステムを実行する"""
+        self.player_bullet_type.update_all()
+        self.enemy_bullet_type.update_all()
+
+    @property
+    def player_bullet_count(self) -> int:
+        """リストにあるプレイヤー弾の数（次のcompactまでは非アクティブな弾も含む）"""
+        return len(self.player_bullets)
+
+    @property
+    def enemy_bullet_count(self) -> int:
+        """リストにある敵弾の数（次のcompactまでは非アクティブな弾も含む）"""
+        return len(self.enemy_bullets)
+
+    def clear_bullets(self):
+        """全ての弾を消す"""
+        self.player_bullet_table.clear()
+        self.enemy_bullet_table.clear()
+
+    # --- スナップショット ---
+
+    def snapshot(self) -> tuple:
+        """敵・弾と索引の状態（Snapshot用）
+
+        状態別の索引は状態へ入った順（攻撃する敵の抽選順に影響する）を保つため、
+        敵リスト内の位置の列として保存する。
+        """
+        enemies = self.enemies
+        position = {id(enemy): i for i, enemy in enumerate(enemies)}
+        index = tuple((state, tuple(position[id(enemy)] for enemy in members))
+                      for state, members in self._enemies_by_state.items())
+        return (tuple(enemy.snapshot() for enemy in enemies), self.active_enemy_count, index,
+                self.player_bullet_table.snapshot(), self.enemy_bullet_table.snapshot())
+
+    def restore(self, state: tuple):
+        enemy_states, self.active_enemy_count, index, player_bullets, enemy_bullets = state
+        from_snapshot = Enemy.from_snapshot
+        self.enemies[:] = [from_snapshot(enemy_state) for enemy_state in enemy_states]
+        enemies = self.enemies
+        self._enemies_by_state = {enemy_state: {enemies[i]: None for i in positions}
+                                  for enemy_state, positions in index}
+        self.player_bullet_table.restore(player_bullets)
+        self.enemy_bullet_table.restore(enemy_bullets)
+
+    # --- 共通 ---
+
+    def store_previous_positions(self):
+        """敵・弾の現在の位置をティック開始時の位置として記録する（スイープ判定用。移動の前に呼ぶ）"""
+        for enemy in self.enemies:
+            enemy.prev_x = enemy.x
+            enemy.prev_y = enemy.y
+        for table in (self.player_bullet_table, self.enemy_bullet_table):
+            count = table.count
+            table.px[:count] = table.x[:count]
+            table.py[:count] = table.y[:count]
+
+    def compact(self):
+        """非アクティブな敵・弾をリストからその場で除去する（弾はテーブルの行を前詰めする）
+
+        撃墜された敵は撃墜時に索引から外れているので、ここではリストのみ詰める。
+        """
+        compact(self.enemies)
+        self.player_bullet_table.compact()
+        self.enemy_bullet_table.compact()
@@ -9,17 +9,49 @@ import Config
 # 敵の入場パターンを管理するクラス群
 # 新パターンを追加する際は、EntryPatternBaseを継承した新クラスを作成し、
 # EntryPatternFactoryに登録するだけで済む設計
+#
+# 各パターンの軌道は生成時に1度だけ(x, y)のサンプル表へ焼き込み、全ての敵で共有する。
+# パターンオブジェクトは状態を持たない（フライウェイト）ので、敵側はパターンへの参照と
+# 軌道表上の経過フレーム（entry_timer）だけを持てばよい。
 
 class EntryPatternBase:
     """入場パターンの基底クラス"""
     
+    pattern_id = None        # EntryPatternFactoryのパターンID（共有インスタンス生成時に設定）
+    formation_proximity = 8  # ホームポジション到達判定距離
+    descend_speed = 1.5      # ホームポジション移動速度
+    
     def __init__(self):
-        self.formation_proximity = 8  # ホームポジション到達判定距離
-        self.descend_speed = 1.5      # ホームポジション移動速度
+        # 軌道表（entry_timer=1..lengthのフレームで敵が置かれる座標）
+        samples = self._bake_trajectory()
+        self.trajectory_x: tuple = tuple(x for x, _ in samples)
+        self.trajectory_y: tuple = tuple(y for _, y in samples)
+        self.length: int = len(samples)
+    
+    def _bake_trajectory(self):
+        """軌道の(x, y)サンプル列を生成する（サブクラスで実装）"""
+        raise NotImplementedError("_bake_trajectory method must be implemented")
     
     def update(self, enemy):
-        """入場パターンの更新処理（サブクラスで実装）"""
-        raise NotImplementedError("update method must be implemented")
+        """入場パターンの更新処理（軌道表を再生し、終端以降はホームポジションへ移動）"""
+        enemy.entry_timer += 1
+        
+        timer = enemy.entry_timer
+        if timer <= self.length:
+            enemy.x = self.trajectory_x[timer - 1]
+            enemy.y = self.trajectory_y[timer - 1]
+            return False
+        
+        # 軌道の再生完了後、ホームポジションへ移動
+        return self._update_tail(enemy)
+    
+    def _update_tail(self, enemy):
+        """軌道表の終端以降の処理（既定ではホームポジションへ移動）"""
+        return self._move_to_formation(enemy)
+    
+    def is_moving_to_formation(self, enemy):
+        """敵をMOVING_TO_HOME状態へ移すか（既定では入場パターン側でホームまで運ぶ）"""
+        return False
     
     def is_completed(self, enemy):
         """入場パターンの完了判定（サブクラスで実装）"""
@@ -54,46 +86,60 @@ class EntryPatternBase:
 class ZigzagPattern(EntryPatternBase):
     """ジグザグパターン（X座標ベースの矩形軌道）"""
     
-    def __init__(self):
-        super().__init__()
-        self.completion_x = 96  # X座標がこの値を超えたらホームポジション移動開始
+    start_x = 0.0
+    start_y = 64.0
+    completion_x = 96  # X座標がこの値を超えたらホームポジション移動開始
     
-    def update(self, enemy):
-        """ジグザグパターンの更新処理"""
-        enemy.entry_timer += 1
-        
+    def _bake_trajectory(self):
+        """開始位置からX座標がcompletion_xに達するまでの軌道を1フレームずつ生成する"""
+        x = self.start_x
+        y = self.start_y
+        samples = []
+        while x < self.completion_x:
+            x, y = self._step(x, y)
+            samples.append((x, y))
+        return samples
+    
+    def _update_tail(self, enemy):
+        """軌道表の終端以降の処理
+
+        ジグザグはX座標で軌道が決まるため、ホームポジション移動で
+        completion_xより左へ戻った場合は矩形軌道の規則で1歩進める。
+        """
         if enemy.x < self.completion_x:
-            # ジグザグパターン実行中
-            if enemy.x < 24:
-                # 0-24ピクセル：右に移動
-                enemy.x += 1.0
-                enemy.y = 64
-            elif enemy.x == 24 and enemy.y > 28:
-                # X=24で上に移動中（64→28）
-                enemy.y -= 1.0
-            elif enemy.x < 48:
-                # 24-48ピクセル：右に移動
-                enemy.x += 1.0
-                # Y座標は28で固定
-            elif enemy.x == 48 and enemy.y < 64:
-                # X=48で下に移動中（28→64）
-                enemy.y += 1.0
-            elif enemy.x < 72:
-                # 48-72ピクセル：右に移動
-                enemy.x += 1.0
-                # Y座標は64で固定
-            elif enemy.x == 72 and enemy.y > 28:
-                # X=72で上に移動中（64→28）
-                enemy.y -= 1.0
-            else:
-                # 72-96ピクセル：右に移動
-                enemy.x += 1.0
-                # Y座標は28で固定
+            enemy.x, enemy.y = self._step(enemy.x, enemy.y)
+            return False
+        return self._move_to_formation(enemy)
+    
+    @staticmethod
+    def _step(x, y):
+        """矩形軌道を1フレーム進めた座標を返す"""
+        if x < 24:
+            # 0-24ピクセル：右に移動
+            x += 1.0
+            y = 64
+        elif x == 24 and y > 28:
+            # X=24で上に移動中（64→28）
+            y -= 1.0
+        elif x < 48:
+            # 24-48ピクセル：右に移動
+            x += 1.0
+            # Y座標は28で固定
+        elif x == 48 and y < 64:
+            # X=48で下に移動中（28→64）
+            y += 1.0
+        elif x < 72:
+            # 48-72ピクセル：右に移動
+            x += 1.0
+            # Y座標は64で固定
+        elif x == 72 and y > 28:
+            # X=72で上に移動中（64→28）
+            y -= 1.0
         else:
-            # ホームポジションへ移動
-            return self._move_to_formation(enemy)
-        
-        return False
+            # 72-96ピクセル：右に移動
+            x += 1.0
+            # Y座標は28で固定
+        return x, y
     
     def is_completed(self, enemy):
         """ジグザグパターンの完了判定"""
@@ -102,89 +148,74 @@ class ZigzagPattern(EntryPatternBase):
         return distance_to_formation <= self.formation_proximity
 
 
-class LeftLoopPattern(EntryPatternBase):
-    """左側からのループパターン"""
+class LoopPatternBase(EntryPatternBase):
+    """ループパターンの共通処理（中心から半径を広げながら1周する）"""
     
-    def __init__(self):
-        super().__init__()
-        self.entry_duration = 120  # 2秒間のループ
-        self.loop_center_x = Config.WIN_WIDTH / 4
-        self.loop_center_y = Config.WIN_HEIGHT / 2
-        self.radius = 40
-        self.moving_to_formation = False
+    entry_duration = 120  # 2秒間のループ
+    loop_center_x = 0.0
+    loop_center_y = Config.WIN_HEIGHT / 2
+    radius = 40
+    direction_x = 1       # -1でX方向反転
     
-    def update(self, enemy):
-        """左ループパターンの更新処理"""
-        enemy.entry_timer += 1
-        
-        if enemy.entry_timer <= self.entry_duration:
-            # ループ描画中
-            angle = (enemy.entry_timer / self.entry_duration) * 2 * math.pi - math.pi / 2
-            progress = enemy.entry_timer / self.entry_duration
+    def _bake_trajectory(self):
+        samples = []
+        for timer in range(1, self.entry_duration + 1):
+            angle = (timer / self.entry_duration) * 2 * math.pi - math.pi / 2
+            progress = timer / self.entry_duration
             current_radius = progress * self.radius
-            enemy.x = self.loop_center_x + math.cos(angle) * current_radius
-            enemy.y = self.loop_center_y + math.sin(angle) * current_radius
-        else:
-            # ループ完了後、ホームポジションへ移動
-            self.moving_to_formation = True
-            return self._move_to_formation(enemy)
-        
-        return False
+            if self.direction_x > 0:
+                x = self.loop_center_x + math.cos(angle) * current_radius
+            else:
+                x = self.loop_center_x - math.cos(angle) * current_radius
+            samples.append((x, self.loop_center_y + math.sin(angle) * current_radius))
+        return samples
+    
+    def is_moving_to_formation(self, enemy):
+        """ループ完了後はMOVING_TO_HOME状態でホームポジションへ向かう"""
+        return enemy.entry_timer > self.length
     
     def is_completed(self, enemy):
-        """左ループパターンの完了判定"""
-        return self.moving_to_formation and enemy.entry_timer > self.entry_duration
+        """ループパターンの完了判定"""
+        return enemy.entry_timer > self.entry_duration
 
 
-class RightLoopPattern(EntryPatternBase):
-    """右側からのループパターン"""
-    
-    def __init__(self):
-        super().__init__()
-        self.entry_duration = 120  # 2秒間のループ
-        self.loop_center_x = Config.WIN_WIDTH * 3 / 4
-        self.loop_center_y = Config.WIN_HEIGHT / 2
-        self.radius = 40
-        self.moving_to_formation = False
+class LeftLoopPattern(LoopPatternBase):
+    """左側からのループパターン"""
     
-    def update(self, enemy):
-        """右ループパターンの更新処理"""
-        enemy.entry_timer += 1
-        
-        if enemy.entry_timer <= self.entry_duration:
-            # ループ描画中
-            angle = (enemy.entry_timer / self.entry_duration) * 2 * math.pi - math.pi / 2
-            progress = enemy.entry_timer / self.entry_duration
-            current_radius = progress * self.radius
-            enemy.x = self.loop_center_x - math.cos(angle) * current_radius  # X方向反転
-            enemy.y = self.loop_center_y + math.sin(angle) * current_radius
-        else:
-            # ループ完了後、ホームポジションへ移動
-            self.moving_to_formation = True
-            return self._move_to_formation(enemy)
-        
-        return False
+    loop_center_x = Config.WIN_WIDTH / 4
+
+
+class RightLoopPattern(LoopPatternBase):
+    """右側からのループパターン"""
     
-    def is_completed(self, enemy):
-        """右ループパターンの完了判定"""
-        return self.moving_to_formation and enemy.entry_timer > self.entry_duration
+    loop_center_x = Config.WIN_WIDTH * 3 / 4
+    direction_x = -1      # X方向反転
 
 
 class EntryPatternFactory:
     """入場パターンのファクトリークラス"""
     
+    # パターンIDごとの共有インスタンス（軌道表は初回生成時に1度だけ焼き込む）
+    _shared_patterns: dict = {}
+    _pattern_classes: dict = {
+        1: LeftLoopPattern,
+        2: RightLoopPattern,
+        3: ZigzagPattern,
+    }
+    
     @staticmethod
     def create(pattern_id):
-        """パターンIDに応じて適切な入場パターンを生成"""
-        if pattern_id == 1:
-            return LeftLoopPattern()
-        elif pattern_id == 2:
-            return RightLoopPattern()
-        elif pattern_id == 3:
-            return ZigzagPattern()
-        else:
-            # デフォルトパターン（直線降下）
-            return None
+        """パターンIDに応じた共有の入場パターンを返す"""
+        pattern = EntryPatternFactory._shared_patterns.get(pattern_id)
+        if pattern is None:
+            pattern_class = EntryPatternFactory._pattern_classes.get(pattern_id)
+            if pattern_class is None:
+                # デフォルトパターン（直線降下）
+                return None
+            pattern = pattern_class()
+            pattern.pattern_id = pattern_id
+            EntryPatternFactory._shared_patterns[pattern_id] = pattern
+        return pattern
     
     @staticmethod
     def get_initial_position(pattern_id):
@@ -196,4 +227,4 @@ class EntryPatternFactory:
         elif pattern_id == 3:
             return (0, 64)
         else:
-            return (0, -16)  # デフォルト位置
\ No newline at end of file
+            return (0, -16)  # デフォルト位置
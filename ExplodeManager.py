@@ -3,11 +3,19 @@
 # CLAUDE.md を書き込むときは英語にしてください
 # 変数の型は宣言してください
 
+# 爆発パーティクル管理
+# パーティクル1個ごとのオブジェクトは作らず、"particle"アーキタイプの列（SoA）で保持する。
+# 積分・減衰・寿命判定は全パーティクルに対する1回のループでまとめて行う。
+
 import pyxel
-import random
 from enum import Enum
 import Config
 import GameState
+from World import Archetype
+import Rng
+
+# 爆発パーティクルの乱数ストリーム
+_rng = Rng.stream(Rng.EXPLOSION)
 
 
 class ExpType(Enum):
@@ -17,209 +25,36 @@ class ExpType(Enum):
     CIRCLE = 2
     DOT_REFRECT = 3
 
-class Explode_CIRCLE:
-    def __init__(self, x, y, r=10):
-        self.x = x
-        self.y = y
-        self.r = random.randint(2, 5)
-        self.dx = random.uniform(-1.5, 1.5)
-        self.dy = random.uniform(-1.5, 1.5)
-        self.life = random.randint(10, 25)   #弾の寿命大きいと長く飛び散ります
-        self.col = random.randint(8, 15)
-
-        #First Flash
-        self.orgx = x
-        self.orgy = y
-        self.FirstFlash = 4
-
-        self.FirstCircle = 1
-
-        self.trail = []  # 残像履歴（最大10個とか）
-
-
-    def update(self):
-            self.x += self.dx
-            self.y += self.dy
-
-            #パーティクルを小さくしていく
-            self.r -= 0.05
-
-            self.life -= 1
-
-            #爆発パーティクルの速度減衰
-            self.dx *= 0.87
-            self.dy *= 0.87
-
-            self.trail.append((self.x, self.y, self.r))  # 現在位置を追加
-            if len(self.trail) > 5 :
-                self.trail.pop(0)  # 古い残像を削除（最大10個まで）
-
-
-
-    def draw(self):
-
-        #最初だけ白でフラッシュを表示
-        if 0 < self.FirstFlash:
-            #pyxel.rect(self.orgx-8, self.orgy-8, 16, 16, pyxel.COLOR_WHITE)
-            pyxel.circ(self.orgx, self.orgy, int(8), pyxel.COLOR_WHITE)
-            self.FirstFlash -= 1
-        
-        #ソニックブーム的な円
-        if self.FirstCircle < 20:
-            pyxel.circb(self.orgx, self.orgy, self.FirstCircle, pyxel.COLOR_WHITE)
-            self.FirstCircle+=2
-
-        _color = pyxel.COLOR_WHITE
-
-        if self.life < 18:
-            _color = pyxel.COLOR_YELLOW
-
-        if self.life < 13:
-            _color = pyxel.COLOR_ORANGE
-
-        if self.life < 9:
-            _color = pyxel.COLOR_BROWN
-
-        if self.life < 5:
-            _color = pyxel.COLOR_GRAY
-        
-        if self.life < 1:
-            _color = pyxel.COLOR_NAVY
-        
-        if self.life > 0:
-            pyxel.circ(int(self.x), int(self.y), int(self.r), _color)
-
-        for i, (tx, ty, tr) in enumerate(self.trail):
-            fade_color = pyxel.COLOR_YELLOW if i < 3 else pyxel.COLOR_ORANGE
-            if i > 6:
-                fade_color = pyxel.COLOR_BROWN
-            pyxel.circ(int(tx), int(ty), int(tr * 0.7), fade_color)
-
-    @property
-    def is_alive(self):
-        return self.life > 0
-
-class Explode_RECT:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.w = random.randint(2, 7)
-        self.h = random.randint(2, 6)   
-        self.dx = random.uniform(-1.5, 1.5)
-        self.dy = random.uniform(-1.5, 1.5)
-        self.life = random.randint(10, 25)   #弾の寿命大きいと長く飛び散ります
-        self.col = random.randint(8, 15)
-
-        #First Flash
-        self.orgx = x
-        self.orgy = y
-        self.FirstFlash = 4
-
-        self.FirstCircle = 1
-
-
-    def update(self):
-            self.x += self.dx
-            self.y += self.dy
 
-            #パーティクルを小さくしていく
-            self.w -= 0.05
-            self.h -= 0.05  
-
-            self.life -= 1
-
-            #爆発パーティクルの速度減衰
-            self.dx *= 0.87
-            self.dy *= 0.87
-
-
-    def draw(self):
-        if self.life > 0:
-            #最初だけ白でフラッシュを表示
-            if 0 < self.FirstFlash:
-                pyxel.rect(self.orgx-8, self.orgy-8, 16, 16, pyxel.COLOR_WHITE)
-                self.FirstFlash -= 1
-
-            #ソニックブーム的な円
-            if self.FirstCircle < 20:
-                pyxel.circb(self.orgx, self.orgy, self.FirstCircle, pyxel.COLOR_WHITE)
-                self.FirstCircle+=2
+# ExpType.value で引く種類別パラメータ（インデックス = ExpType.value）
+_TYPE_RECT = ExpType.RECT.value
+_TYPE_DOT = ExpType.DOT.value
+_TYPE_CIRCLE = ExpType.CIRCLE.value
+_TYPE_DOT_REFRECT = ExpType.DOT_REFRECT.value
 
+_DAMP_X = (0.87, 0.90, 0.87, 0.95)   # X方向の速度減衰率
+_DAMP_Y = (0.87, 0.90, 0.87, 0.90)   # Y方向の速度減衰率
+_SHRINK = (0.05, 0.0, 0.05, 0.0)     # 1フレームあたりのサイズ縮小量
 
-            _color = pyxel.COLOR_WHITE
+# 円パーティクルの残像の最大数
+CIRCLE_TRAIL_LENGTH = 5
 
-            if self.life < 18:
-                _color = pyxel.COLOR_YELLOW
+# 残り寿命 -> 色（寿命が減るほど白→黄→橙→茶→灰と変化する）
+_MAX_LIFE = 25
+_LIFE_COLORS = tuple(
+    pyxel.COLOR_NAVY if life < 1 else
+    pyxel.COLOR_GRAY if life < 5 else
+    pyxel.COLOR_BROWN if life < 9 else
+    pyxel.COLOR_ORANGE if life < 13 else
+    pyxel.COLOR_YELLOW if life < 18 else
+    pyxel.COLOR_WHITE
+    for life in range(_MAX_LIFE + 1)
+)
 
-            if self.life < 13:
-                _color = pyxel.COLOR_ORANGE
+# バースト（爆発1回ごとの初回フラッシュと衝撃波リング）
+FIRST_FLASH_FRAMES = 4
+RING_MAX_RADIUS = 20
 
-            if self.life < 9:
-                _color = pyxel.COLOR_BROWN
-
-            if self.life < 5:
-                _color = pyxel.COLOR_GRAY
-            
-            if self.life < 1:
-                _color = pyxel.COLOR_NAVY
-
-            pyxel.rect(int(self.x), int(self.y), int(self.w), int(self.h), _color)
-    @property
-    def is_alive(self):
-        return self.life > 0
-
-
-class Explode_DOT:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.dx = random.uniform(-1.5, 1.5)
-        self.dy = random.uniform(-1.5, 1.5)
-        self.life = random.randint(5, 20)   #弾の寿命大きいと長く飛び散ります
-        self.col = random.randint(8, 15)
-
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.life -= 1
-
-        #爆発パーティクルの速度減衰
-        self.dx *= 0.90
-        self.dy *= 0.90
-
-    def draw(self):
-        if self.life > 0:
-            pyxel.pset(int(self.x), int(self.y), self.col)
-
-    @property
-    def is_alive(self):
-        return self.life > 0
-
-class Explode_DOT_REFRECT:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.dx = random.uniform(-1.5, 1.5)
-        self.dy = random.uniform(0, 1)
-        self.life = random.randint(10,25)   #弾の寿命大きいと長く飛び散ります
-        self.col = pyxel.COLOR_WHITE #random.randint(8, 15)
-
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.life -= 1
-
-        #爆発パーティクルの速度減衰
-        self.dx *= 0.95
-        self.dy *= 0.90
-
-    def draw(self):
-        if self.life > 0:
-            pyxel.pset(int(self.x), int(self.y), self.col)
-
-    @property
-    def is_alive(self):
-        return self.life > 0
 
 # class ExplodeManager:
 class ExpMan:
@@ -227,33 +62,293 @@ class ExpMan:
     PARTICLE_COUNT = 20
     PARTICLE_SPEED = 3
     DURATION = 60
+    CAPACITY = 2048         # パーティクル列の固定容量
+    BURST_CAPACITY = 128    # バースト列の固定容量
     
-    def __init__(self):
-        self.explosions = []
+    def __init__(self, capacity=None):
+        if capacity is None:
+            capacity = self.CAPACITY
+        # パーティクルテーブル（同じ行が1個のパーティクル）
+        # 生成時に容量分を確保し、以降は先頭count行のみを使う
+        # 寿命切れの行はupdateの積分パス内で前詰めするため、active列は持たない
+        self.particles = Archetype("particle", capacity, {
+            "x": 0.0,       # X座標
+            "y": 0.0,       # Y座標
+            "dx": 0.0,      # X速度
+            "dy": 0.0,      # Y速度
+            "life": 0,      # 残り寿命
+            "age": 0,       # 経過フレーム数（円の残像計算用）
+            "w": 0.0,       # 幅（円の場合は半径）
+            "h": 0.0,       # 高さ
+            "col": 0,       # 色（ドット用）
+            "type": 0,      # ExpType.value
+        })
+        particles = self.particles
+        self.px, self.py, self.pdx, self.pdy = particles.x, particles.y, particles.dx, particles.dy
+        self.plife, self.page, self.pw, self.ph = particles.life, particles.age, particles.w, particles.h
+        self.pcol, self.ptype = particles.col, particles.type
+
+        # バースト列（RECT/CIRCLEの爆発1回につき1個）
+        burst_capacity = self.BURST_CAPACITY
+        self.bx = [0] * burst_capacity      # 爆発中心X
+        self.by = [0] * burst_capacity      # 爆発中心Y
+        self.btype = [0] * burst_capacity   # ExpType.value
+        self.bflash = [0] * burst_capacity  # 初回フラッシュの残りフレーム
+        self.bring = [0] * burst_capacity   # 衝撃波リングの半径
+        self.bborn = [0] * burst_capacity   # 生成したティック（GameState.GameTimer）
+        self.burst_high_water: int = 0      # 同時に描画中だったバースト数の最大
+        self.burst_misses: int = 0          # 空きが無く追加できなかったバースト数
+
+        self.clear()
+
+    @property
+    def count(self) -> int:
+        """生存中のパーティクル数"""
+        return self.particles.count
+
+    def clear(self):
+        """全パーティクルを破棄する（列は再確保しない）"""
+        self.particles.clear()
+        self.burst_count = 0    # 描画中のバースト数
+
+    def stats(self) -> dict:
+        """パーティクルテーブルの占有状況を返す（Archetype.statsと同じ形式）"""
+        return self.particles.stats()
+
+    def burst_stats(self) -> dict:
+        """バースト列の占有状況を返す（Archetype.statsと同じ形式）"""
+        return {
+            "capacity": self.BURST_CAPACITY,
+            "in_use": self.burst_count,
+            "high_water": self.burst_high_water,
+            "misses": self.burst_misses,
+        }
+
+    def snapshot(self) -> tuple:
+        """パーティクルとバーストの状態（Snapshot用）"""
+        n = self.burst_count
+        return (self.particles.snapshot(), n, self.burst_high_water, self.burst_misses,
+                self.bx[:n], self.by[:n], self.btype[:n], self.bflash[:n], self.bring[:n], self.bborn[:n])
+
+    def restore(self, state: tuple):
+        particles, n, self.burst_high_water, self.burst_misses, bx, by, btype, bflash, bring, bborn = state
+        self.particles.restore(particles)
+        self.burst_count = n
+        self.bx[:n] = bx
+        self.by[:n] = by
+        self.btype[:n] = btype
+        self.bflash[:n] = bflash
+        self.bring[:n] = bring
+        self.bborn[:n] = bborn
 
     def spawn_explosion(self, x, y, cnt=None, exp_type=ExpType.CIRCLE):
+        """Spawn explosion particles of specified type."""
         if cnt is None:
             cnt = self.PARTICLE_COUNT
-        """Spawn explosion particles of specified type."""
-        particle_cls = {
-            ExpType.RECT: Explode_RECT,
-            ExpType.DOT: Explode_DOT,
-            ExpType.CIRCLE: Explode_CIRCLE,
-            ExpType.DOT_REFRECT: Explode_DOT_REFRECT,
-        }.get(exp_type, Explode_CIRCLE)
-
+        if not isinstance(exp_type, ExpType):
+            exp_type = ExpType.CIRCLE
+        ptype = exp_type.value
+
+        randint = _rng.randint
+        uniform = _rng.uniform
+        particles = self.particles
+        n = particles.count
         for _ in range(cnt):
-            self.explosions.append(particle_cls(x, y))
+            if ptype == _TYPE_RECT:
+                w = randint(2, 7)
+                h = randint(2, 6)
+                dx = uniform(-1.5, 1.5)
+                dy = uniform(-1.5, 1.5)
+                life = randint(10, 25)
+                col = randint(8, 15)
+            elif ptype == _TYPE_CIRCLE:
+                w = randint(2, 5)  # 半径
+                h = 0
+                dx = uniform(-1.5, 1.5)
+                dy = uniform(-1.5, 1.5)
+                life = randint(10, 25)
+                col = randint(8, 15)
+            elif ptype == _TYPE_DOT:
+                w = h = 0
+                dx = uniform(-1.5, 1.5)
+                dy = uniform(-1.5, 1.5)
+                life = randint(5, 20)
+                col = randint(8, 15)
+            else:  # DOT_REFRECT
+                w = h = 0
+                dx = uniform(-1.5, 1.5)
+                dy = uniform(0, 1)
+                life = randint(10, 25)
+                col = pyxel.COLOR_WHITE
+
+            if n >= particles.capacity:
+                particles.misses += 1
+                continue
+
+            self.px[n] = x
+            self.py[n] = y
+            self.pdx[n] = dx
+            self.pdy[n] = dy
+            self.plife[n] = life
+            self.page[n] = 0
+            self.pw[n] = w
+            self.ph[n] = h
+            self.pcol[n] = col
+            self.ptype[n] = ptype
+            n += 1
+
+        particles.count = n
+        if n > particles.high_water:
+            particles.high_water = n
+
+        if cnt > 0 and ptype in (_TYPE_RECT, _TYPE_CIRCLE):
+            b = self.burst_count
+            if b >= self.BURST_CAPACITY:
+                self.burst_misses += 1
+                return
+            self.bx[b] = x
+            self.by[b] = y
+            self.btype[b] = ptype
+            self.bflash[b] = FIRST_FLASH_FRAMES
+            self.bring[b] = 1
+            self.bborn[b] = GameState.GameTimer
+            self.burst_count = b + 1
+            if b + 1 > self.burst_high_water:
+                self.burst_high_water = b + 1
 
     def update(self):
-        
+        # バーストの演出はヒットストップ中も進める（描画頻度に依存しないようupdateで進める）
+        self._update_bursts()
+
         if GameState.StopTimer > 0:
             return
-          
-        for exp in self.explosions:
-            exp.update()
-        self.explosions = [exp for exp in self.explosions if exp.is_alive]
+
+        px, py, pdx, pdy = self.px, self.py, self.pdx, self.pdy
+        plife, page, pw, ph = self.plife, self.page, self.pw, self.ph
+        pcol, ptype = self.pcol, self.ptype
+
+        # 積分・減衰・寿命判定を1パスで行い、生存分を前詰めする（描画順は維持）
+        alive = 0
+        for i in range(self.particles.count):
+            life = plife[i] - 1
+            if life <= 0:
+                continue
+            t = ptype[i]
+            dx = pdx[i]
+            dy = pdy[i]
+            shrink = _SHRINK[t]
+
+            px[alive] = px[i] + dx
+            py[alive] = py[i] + dy
+            pdx[alive] = dx * _DAMP_X[t]
+            pdy[alive] = dy * _DAMP_Y[t]
+            plife[alive] = life
+            page[alive] = page[i] + 1
+            pw[alive] = pw[i] - shrink
+            ph[alive] = ph[i] - shrink
+            pcol[alive] = pcol[i]
+            ptype[alive] = t
+            alive += 1
+
+        self.particles.count = alive
 
     def draw(self):
-        for exp in self.explosions:
-            exp.draw()
+        px, py, pdx, pdy = self.px, self.py, self.pdx, self.pdy
+        plife, page, pw, ph = self.plife, self.page, self.pw, self.ph
+        pcol, ptype = self.pcol, self.ptype
+
+        for i in range(self.count):
+            t = ptype[i]
+            x = px[i]
+            y = py[i]
+            if t == _TYPE_RECT:
+                pyxel.rect(int(x), int(y), int(pw[i]), int(ph[i]), _LIFE_COLORS[plife[i]])
+            elif t == _TYPE_CIRCLE:
+                r = pw[i]
+                pyxel.circ(int(x), int(y), int(r), _LIFE_COLORS[plife[i]])
+                self._draw_circle_trail(x, y, r, pdx[i], pdy[i], page[i])
+            else:
+                pyxel.pset(int(x), int(y), pcol[i])
+
+        self._draw_bursts()
+
+    def _draw_circle_trail(self, x, y, r, dx, dy, age):
+        """円パーティクルの残像を描画する
+
+        残像の位置は履歴を保持せず、現在位置と減衰率から逆算する。
+        """
+        trail_len = min(age, CIRCLE_TRAIL_LENGTH)
+        damp_x = _DAMP_X[_TYPE_CIRCLE]
+        damp_y = _DAMP_Y[_TYPE_CIRCLE]
+        shrink = _SHRINK[_TYPE_CIRCLE]
+
+        # 最古の残像位置まで巻き戻してから、古い順（インデックス0が最古）に描画する
+        for _ in range(trail_len - 1):
+            dx /= damp_x
+            dy /= damp_y
+            x -= dx
+            y -= dy
+            r += shrink
+
+        for i in range(trail_len):
+            if i > 0:
+                x += dx
+                y += dy
+                r -= shrink
+                dx *= damp_x
+                dy *= damp_y
+            fade_color = pyxel.COLOR_YELLOW if i < 3 else pyxel.COLOR_ORANGE
+            pyxel.circ(int(x), int(y), int(r * 0.7), fade_color)
+
+    def _update_bursts(self):
+        """初回フラッシュと衝撃波リングを1フレーム進め、寿命の尽きたバーストを除去する
+
+        このティックに生成されたバーストは進めない（ティック内でupdateより前に生成されても、
+        最初に描画されるのはフラッシュ4フレーム目・半径1のリングになる）。
+        """
+        bx, by, btype, bflash, bring, bborn = self.bx, self.by, self.btype, self.bflash, self.bring, self.bborn
+        timer = GameState.GameTimer
+
+        alive = 0
+        for i in range(self.burst_count):
+            flash = bflash[i]
+            ring = bring[i]
+            if bborn[i] != timer:
+                if flash > 0:
+                    flash -= 1
+                if ring < RING_MAX_RADIUS:
+                    ring += 2
+
+            if flash > 0 or ring < RING_MAX_RADIUS:
+                bx[alive] = bx[i]
+                by[alive] = by[i]
+                btype[alive] = btype[i]
+                bflash[alive] = flash
+                bring[alive] = ring
+                bborn[alive] = bborn[i]
+                alive += 1
+
+        self.burst_count = alive
+
+    def _draw_bursts(self):
+        """初回フラッシュと衝撃波リングを描画する"""
+        bx, by, btype, bflash, bring = self.bx, self.by, self.btype, self.bflash, self.bring
+
+        for i in range(self.burst_count):
+            x = bx[i]
+            y = by[i]
+
+            #最初だけ白でフラッシュを表示
+            if bflash[i] > 0:
+                if btype[i] == _TYPE_RECT:
+                    pyxel.rect(x - 8, y - 8, 16, 16, pyxel.COLOR_WHITE)
+                else:
+                    pyxel.circ(x, y, 8, pyxel.COLOR_WHITE)
+
+            #ソニックブーム的な円
+            if bring[i] < RING_MAX_RADIUS:
+                pyxel.circb(x, y, bring[i], pyxel.COLOR_WHITE)
+
+
+# グローバルインスタンス（Common経由でも参照できる）
+explode_manager = ExpMan(Config.PARTICLE_POOL_SIZE)
@@ -0,0 +1,113 @@
+# Frame Scheduler
+# 固定タイムステップでゲームロジックを進めるスケジューラ
+# 描画フレームごとの経過時間をアキュムレータに貯め、1ティック分たまるごとに
+# ロジックを1回進める（描画が遅れてもゲーム速度は変わらない）。
+#
+#  - 1フレームで進めるティック数には上限があり（スパイラル・オブ・デス対策）、
+#    上限を超えた遅れは切り捨てる
+#  - 遅れを取り戻している間は描画を間引く（連続で間引くのは最大max_skipped_draws回まで）
+#  - ターボ（speed>1）では実時間のspeed倍のティックを進め、描画は最後のティックだけ行う
+#  - realtime=Falseの場合は時計を使わず、1フレームにちょうどspeedティック進める
+#    （ヘッドレス実行など、結果を再現させたい場合に使う）
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import time
+
+# 描画間隔の揺らぎでティック数が0と2に振れないよう、経過時間がティック長の整数倍に
+# この割合以内で近ければ整数倍に丸める（垂直同期の揺らぎ吸収）
+SNAP_TOLERANCE = 0.125
+
+
+class FixedStepScheduler:
+    """固定タイムステップのスケジューラ
+
+    使い方:
+        for _ in range(scheduler.begin_frame()):
+            tick()                          # ロジックを1ティック進める
+        if scheduler.draw_this_frame:
+            draw()
+    """
+
+    def __init__(self, tick_rate: int, max_ticks_per_frame: int, max_skipped_draws: int,
+                 realtime: bool = True, clock=time.perf_counter):
+        self.step: float = 1.0 / tick_rate                 # 1ティックの長さ（秒）
+        self.max_ticks_per_frame: int = max_ticks_per_frame
+        self.max_skipped_draws: int = max_skipped_draws
+        self.realtime: bool = realtime
+        self.clock = clock
+
+        self.speed: int = 1                 # ロジック速度の倍率（ターボ時は2-16）
+        self.accumulator: float = 0.0       # 未消化の時間（秒、speed倍済み）
+        self.last_time: float = None
+
+        # 直近フレームの結果
+        self.ticks_this_frame: int = 0
+        self.draw_this_frame: bool = True
+
+        # 統計情報
+        self.skipped_draws: int = 0         # 連続で間引いた描画の数
+        self.total_ticks: int = 0
+        self.total_skipped_draws: int = 0
+        self.dropped_ticks: int = 0         # 上限超過で切り捨てたティック数
+
+    def reset(self):
+        """時計とアキュムレータをリセットする（ポーズ明けなど、経過時間を持ち越さない場合）"""
+        self.accumulator = 0.0
+        self.last_time = None
+        self.skipped_draws = 0
+
+    def begin_frame(self) -> int:
+        """このフレームで進めるティック数を決め、描画するかどうかを更新する"""
+        speed = self.speed
+
+        if not self.realtime:
+            ticks = speed
+            behind = False
+        else:
+            now = self.clock()
+            elapsed = self.step if self.last_time is None else now - self.last_time
+            self.last_time = now
+
+            step = self.step
+            snapped = round(elapsed / step) * step
+            if abs(elapsed - snapped) < step * SNAP_TOLERANCE:
+                elapsed = snapped
+            self.accumulator += elapsed * speed
+            ticks = int(self.accumulator / step)
+
+            # スパイラル・オブ・デス対策: 上限を超えた分の遅れは取り戻さずに捨てる
+            max_ticks = self.max_ticks_per_frame * speed
+            if ticks > max_ticks:
+                self.dropped_ticks += ticks - max_ticks
+                ticks = max_ticks
+                self.accumulator = self.accumulator % step
+            else:
+                self.accumulator -= ticks * step
+
+            # 等速分より多く進めた = 遅れを取り戻している
+            behind = ticks > speed
+
+        # 遅れを取り戻している間は描画を間引く（画面が止まり続けないよう連続回数に上限）
+        if behind and self.skipped_draws < self.max_skipped_draws:
+            self.draw_this_frame = False
+            self.skipped_draws += 1
+            self.total_skipped_draws += 1
+        else:
+            self.draw_this_frame = True
+            self.skipped_draws = 0
+
+        self.ticks_this_frame = ticks
+        self.total_ticks += ticks
+        return ticks
+
+    def stats(self) -> dict:
+        return {
+            "speed": self.speed,
+            "total_ticks": self.total_ticks,
+            "skipped_draws": self.total_skipped_draws,
+            "dropped_ticks": self.dropped_ticks,
+        }
@@ -24,6 +24,11 @@ GameTimer = 0
 
 # Score Management
 HighScore = 0
+
+# Hit Statistics（衝突判定の結果の集計）
+EnemyHits = 0      # 敵に弾が当たった回数（撃破を含む）
+EnemyKills = 0     # 撃破した敵の数
+PlayerHits = 0     # プレイヤーが被弾した回数（クールタイム中を除く）
 Score = 0
 
 # Enemy Movement
@@ -44,6 +49,7 @@ def reset_game_state():
     """Reset all game state variables for new game"""
     global GameState, GameStateSub, CURRENT_STAGE, ShakeTimer, StopTimer
     global GameTimer, Score, enemy_move_direction, enemy_group_x, attack_selection_timer
+    global EnemyHits, EnemyKills, PlayerHits
     
     GameState = Config.STATE_TITLE
     GameStateSub = Config.STATE_PLAYING_ENEMY_ENTRY
@@ -52,6 +58,9 @@ def reset_game_state():
     StopTimer = 0
     GameTimer = 0
     Score = 10  # Starting score
+    EnemyHits = 0
+    EnemyKills = 0
+    PlayerHits = 0
     enemy_move_direction = ENEMY_MOVE_RIGHT
     enemy_group_x = 0
     attack_selection_timer = 0
\ No newline at end of file
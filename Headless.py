@@ -0,0 +1,449 @@
+# Headless Runner
+# ウィンドウを開かずにゲームロジック（update_playing等）を駆動するランナー
+# CIなどディスプレイの無い環境でのフレームコスト計測に使う
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import argparse
+import random
+import sys
+import time
+import types
+
+# 入力ビットマスク定義（1フレーム分の入力を1つの整数で表す）
+from Input import INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_SHOT, INPUT_Z, INPUT_ESCAPE
+
+# pyxelと同じキーコード（スタブでも同じ値を使う）
+KEY_SPACE = 32
+KEY_LEFT = 1073741904
+KEY_RIGHT = 1073741903
+KEY_UP = 1073741906
+KEY_DOWN = 1073741905
+KEY_Z = 122
+KEY_ESCAPE = 27
+KEY_F1 = 1073741882
+KEY_TAB = 9
+KEY_BACKSPACE = 8
+
+KEY_TO_INPUT_BIT = {
+    KEY_LEFT: INPUT_LEFT,
+    KEY_RIGHT: INPUT_RIGHT,
+    KEY_UP: INPUT_UP,
+    KEY_DOWN: INPUT_DOWN,
+    KEY_SPACE: INPUT_SHOT,
+    KEY_Z: INPUT_Z,
+    KEY_ESCAPE: INPUT_ESCAPE,
+}
+
+# pyxelのカラーパレット定数
+PYXEL_COLORS = {
+    "COLOR_BLACK": 0, "COLOR_NAVY": 1, "COLOR_PURPLE": 2, "COLOR_GREEN": 3,
+    "COLOR_BROWN": 4, "COLOR_DARK_BLUE": 5, "COLOR_LIGHT_BLUE": 6, "COLOR_WHITE": 7,
+    "COLOR_RED": 8, "COLOR_ORANGE": 9, "COLOR_YELLOW": 10, "COLOR_LIME": 11,
+    "COLOR_CYAN": 12, "COLOR_GRAY": 13, "COLOR_PINK": 14, "COLOR_PEACH": 15,
+}
+
+
+def _noop(*args, **kwargs):
+    """描画・サウンド系APIのスタブ（何もしない）"""
+    return None
+
+
+class HeadlessImage:
+    """pyxel.images[n]のスタブ（pset, rect等の呼び出しは全て何もしない）"""
+
+    width: int = 256
+    height: int = 256
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _noop
+
+
+class HeadlessPyxel(types.ModuleType):
+    """pyxelモジュールの代替スタブ
+
+    キー入力は input_mask（INPUT_*ビットの組み合わせ）から返し、
+    描画・サウンド系の呼び出しは全て何もしない。
+    """
+
+    VERSION = "headless"
+
+    def __init__(self):
+        super().__init__("pyxel")
+        self.input_mask: int = 0
+        self.frame_count: int = 0
+        self.quit_requested: bool = False
+        self.images: tuple = tuple(HeadlessImage() for _ in range(3))
+
+        for key_name, key_code in (
+            ("KEY_SPACE", KEY_SPACE), ("KEY_LEFT", KEY_LEFT), ("KEY_RIGHT", KEY_RIGHT),
+            ("KEY_UP", KEY_UP), ("KEY_DOWN", KEY_DOWN), ("KEY_Z", KEY_Z),
+            ("KEY_ESCAPE", KEY_ESCAPE), ("KEY_F1", KEY_F1), ("KEY_TAB", KEY_TAB),
+            ("KEY_BACKSPACE", KEY_BACKSPACE),
+        ):
+            setattr(self, key_name, key_code)
+        for color_name, color in PYXEL_COLORS.items():
+            setattr(self, color_name, color)
+
+    def btn(self, key: int) -> bool:
+        return bool(self.input_mask & KEY_TO_INPUT_BIT.get(key, 0))
+
+    def btnp(self, key: int, *args) -> bool:
+        return False
+
+    def quit(self):
+        self.quit_requested = True
+
+    def __getattr__(self, name: str):
+        # 未定義のAPI（blt, pset, pal, play, ...）は全てno-op
+        if name.startswith("__"):
+            raise AttributeError(name)
+        setattr(self, name, _noop)  # 2回目以降は通常の属性参照で解決させる
+        return _noop
+
+
+# インストール済みのスタブ（二重インストール防止）
+_installed_stub: HeadlessPyxel = None
+
+
+def install() -> HeadlessPyxel:
+    """pyxelスタブをsys.modulesへ登録し、読み込み済みモジュールの参照も差し替える"""
+    global _installed_stub
+    if _installed_stub is not None:
+        return _installed_stub
+
+    stub = HeadlessPyxel()
+    real_pyxel = sys.modules.get("pyxel")
+    sys.modules["pyxel"] = stub
+
+    # 既にimport済みのゲームモジュールが本物のpyxelを握っている場合は差し替える
+    if real_pyxel is not None:
+        for module in list(sys.modules.values()):
+            if getattr(module, "pyxel", None) is real_pyxel:
+                module.pyxel = stub
+
+    _installed_stub = stub
+    return stub
+
+
+def autopilot_input(frame: int) -> int:
+    """既定の入力スクリプト: 左右に往復しながら撃ち続け、Zでステージを進める"""
+    mask = INPUT_SHOT | INPUT_Z
+    if (frame // 90) % 2 == 0:
+        mask |= INPUT_LEFT
+    else:
+        mask |= INPUT_RIGHT
+    return mask
+
+
+def reset_world():
+    """モジュールグローバルに残るゲーム状態を初期化する（同一プロセスでの再実行用）"""
+    import main
+    main.reset_world()
+
+
+class HeadlessResult:
+    """ヘッドレス実行の結果"""
+
+    def __init__(self):
+        self.frames: int = 0
+        self.update_times: list = []   # 1フレームあたりのupdate時間（秒）
+        self.draw_times: list = []     # 1フレームあたりのdraw時間（秒、draw有効時のみ）
+        self.total_time: float = 0.0
+        self.score: int = 0
+        self.stage: int = 0
+        self.enemy_hits: int = 0
+        self.enemy_kills: int = 0
+        self.player_hits: int = 0
+        self.pool_stats: dict = {}
+        self.render_stats: dict = {}   # レンダーキューの集計（draw有効時のみ）
+
+    def summary(self) -> str:
+        def _mean_us(samples: list) -> float:
+            return (sum(samples) / len(samples)) * 1e6 if samples else 0.0
+
+        def _max_us(samples: list) -> float:
+            return max(samples) * 1e6 if samples else 0.0
+
+        lines = [
+            f"frames={self.frames} total={self.total_time * 1000:.1f}ms "
+            f"fps={self.frames / self.total_time if self.total_time > 0 else 0:.0f}",
+            f"update mean={_mean_us(self.update_times):.1f}us max={_max_us(self.update_times):.1f}us",
+        ]
+        if self.draw_times:
+            lines.append(f"draw   mean={_mean_us(self.draw_times):.1f}us max={_max_us(self.draw_times):.1f}us")
+        render = self.render_stats
+        if render.get("frames"):
+            lines.append(
+                f"render submitted={render['total_submitted'] / render['frames']:.1f}/frame "
+                f"culled={render['total_culled'] / render['frames']:.1f}/frame"
+            )
+        for name, stats in self.pool_stats.items():
+            lines.append(
+                f"pool {name}: in_use={stats['in_use']} high_water={stats['high_water']}"
+                f"/{stats['capacity']} misses={stats['misses']}"
+            )
+        lines.append(f"score={self.score} stage={self.stage}")
+        lines.append(f"hits enemy={self.enemy_hits} kills={self.enemy_kills} player={self.player_hits}")
+        return "\n".join(lines)
+
+
+def run(frames: int, seed: int = 0, inputs=None, draw: bool = False, debug: bool = False,
+        record: str = None, replay=None, swept: bool = None, collision_stride: int = None) -> HeadlessResult:
+    """ゲームをヘッドレスでNフレーム実行する
+
+    Args:
+        frames: 実行するフレーム数（replay指定時にNoneならリプレイの全ティック）
+        seed: 乱数シード
+        inputs: フレーム番号->入力ビットマスクの関数、またはビットマスクの列
+                （列の範囲外は入力なし）。Noneの場合はautopilot_input
+        draw: Trueの場合はdrawも呼び出す（描画APIはno-op）
+        debug: Config.DEBUGの値
+        record: 入力をリプレイファイルとして保存するパス
+        replay: 再生するReplay（seed・inputsは無視される）
+        swept: Config.SWEPT_COLLISIONの値（Noneなら変更しない）
+        collision_stride: Config.COLLISION_STRIDEの値（Noneなら変更しない）
+    """
+    stub = install()
+
+    import Config
+    Config.DEBUG = debug  # 読み込み時のログ出力にも反映させるため先に設定する
+    if swept is not None:
+        Config.SWEPT_COLLISION = swept
+    if collision_stride is not None:
+        Config.COLLISION_STRIDE = collision_stride
+
+    import Common
+    import GameState
+    import Rng
+
+    import main
+
+    if inputs is None:
+        input_fn = autopilot_input
+    elif callable(inputs):
+        input_fn = inputs
+    else:
+        recorded = inputs
+        input_fn = lambda frame: recorded[frame] if frame < len(recorded) else 0
+
+    from RenderQueue import render_queue
+
+    random.seed(seed)
+    Rng.seed_all(seed)
+    reset_world()
+    render_queue.reset_stats()
+    stub.quit_requested = False
+
+    if replay is not None:
+        app = main.App(headless=True, replay=replay)
+        if frames is None:
+            frames = replay.tick_count
+    else:
+        app = main.App(headless=True)
+        GameState.GameState = Config.STATE_PLAYING
+        if record:
+            app.start_recording()
+
+    result = HeadlessResult()
+    perf_counter = time.perf_counter
+    update_times = result.update_times
+    draw_times = result.draw_times
+
+    start = perf_counter()
+    for frame in range(frames):
+        stub.frame_count = frame
+        stub.input_mask = input_fn(frame)
+
+        t0 = perf_counter()
+        app.update()
+        t1 = perf_counter()
+        update_times.append(t1 - t0)
+
+        if draw:
+            app.draw()
+            draw_times.append(perf_counter() - t1)
+
+        result.frames += 1
+        if stub.quit_requested:
+            break
+    result.total_time = perf_counter() - start
+
+    result.score = GameState.Score
+    result.stage = GameState.CURRENT_STAGE
+    result.enemy_hits = GameState.EnemyHits
+    result.enemy_kills = GameState.EnemyKills
+    result.player_hits = GameState.PlayerHits
+    result.pool_stats = Common.pool_stats()
+    if draw:
+        result.render_stats = render_queue.stats()
+    if record:
+        app.save_recording(record)
+    return result
+
+
+# 衝突判定の区間チェックの場面（プレイヤーの弾・敵弾は決まった時刻・位置から撃つ）
+STRIDE_CHECK_FRAMES = 600
+STRIDE_CHECK_SHOT_INTERVAL = 6      # プレイヤー弾の発射間隔（ティック）
+STRIDE_CHECK_VOLLEY_INTERVAL = 200  # 敵弾の発射間隔（プレイヤーの無敵時間より長くする）
+
+
+def collision_outcome(frames: int, seed: int = 0, swept: bool = True, collision_stride: int = 1,
+                      march: bool = False) -> tuple:
+    """決まった場面を衝突判定の区間collision_strideで実行し、当たり・撃破の結果を返す
+
+    敵は40体の隊列で射撃せず、march=Trueなら左右に動く。プレイヤーは止まっていて、
+    弾は決まった時刻・位置から撃つので、止まった隊列では結果は衝突判定だけで決まる。
+    戻り値は (敵への命中数, 撃破数, プレイヤーの被弾数, スコア, 撃破された敵の番号のタプル)
+    """
+    stub = install()
+    stub.input_mask = 0  # プレイヤーは動かず、自分では撃たない
+
+    import Config
+    Config.DEBUG = False
+
+    import Common
+    import GameState
+    import Rng
+    import main
+    from Enemy import Enemy, formation_manager
+    from Player import Player
+
+    saved = (Config.SWEPT_COLLISION, Config.COLLISION_STRIDE,
+             Enemy.BASE_SHOOT_CHANCE, Enemy.MAX_SHOOT_CHANCE)
+    Config.SWEPT_COLLISION = swept
+    Config.COLLISION_STRIDE = collision_stride
+    # 敵の射撃は乱数と残りの敵の数で決まり、撃破のティックがずれると変わるので止める
+    Enemy.BASE_SHOOT_CHANCE = Enemy.MAX_SHOOT_CHANCE = 0.0
+    try:
+        random.seed(seed)
+        Rng.seed_all(seed)
+        reset_world()
+        GameState.GameState = Config.STATE_PLAYING
+        GameState.GameStateSub = Config.STATE_PLAYING_FIGHT
+        Common.apply_collision_mask_bounds(Player)
+        player = Player(64 - 4, 108)
+
+        enemies = []
+        for row in range(4):
+            for col in range(10):
+                enemy = Enemy(x=10 + 11 * col, y=10 + 11 * row, sprite_num=row + 1, life=2, score=100,
+                              wave_id=row, enemy_index=col)
+                enemies.append(enemy)
+                Common.add_enemy(enemy)
+
+        for tick in range(1, frames + 1):
+            GameState.GameTimer = tick
+            main.begin_collision_step()
+            Common.update_bullets()
+            if march:
+                formation_manager.update(Common.enemy_list)
+            for enemy in Common.enemy_list:
+                enemy.update()
+            player.update_effects()
+            player.update()
+            if GameState.StopTimer > 0:
+                GameState.StopTimer -= 1
+
+            if tick % STRIDE_CHECK_SHOT_INTERVAL == 0:
+                # 発射位置を画面の左右に振って、隊列全体を狙う
+                Common.spawn_player_bullet(4 + (tick * 7) % (Config.WIN_WIDTH - 16), player.y - 4, 8, 8)
+            if tick % STRIDE_CHECK_VOLLEY_INTERVAL == 0:
+                # 1発はプレイヤーに当たり、両側の2発は外れる
+                for offset in (-12, 0, 12):
+                    Common.spawn_enemy_bullet(player.x + offset, 60)
+
+            main.collide(player)
+            Common.compact_entity_lists()
+
+        killed = tuple(index for index, enemy in enumerate(enemies) if not enemy.active)
+        return (GameState.EnemyHits, GameState.EnemyKills, GameState.PlayerHits, GameState.Score, killed)
+    finally:
+        (Config.SWEPT_COLLISION, Config.COLLISION_STRIDE,
+         Enemy.BASE_SHOOT_CHANCE, Enemy.MAX_SHOOT_CHANCE) = saved
+
+
+def check_collision_stride(stride: int, frames: int = STRIDE_CHECK_FRAMES, seed: int = 0) -> bool:
+    """衝突判定の区間をstrideティックにした（1ティックの移動量をstride倍にしたのと同じ）スイープ判定が、
+    毎ティックの判定と同じ当たり・撃破の結果になるかを確認する
+
+    止まった隊列では一致しなければ失敗にする。隊列が動く場面は、区間の間の敵の動きを直線で補間するので
+    （隊列は1ピクセルずつ段階的に動く）、隣り合う敵のどちらに当たるかが変わることがあり、結果の表示だけ行う。
+    区間判定なしの結果も参考に表示する。
+    """
+    def _describe(outcome: tuple) -> str:
+        hits, kills, player_hits, score, _ = outcome
+        return f"enemy_hits={hits} kills={kills} player_hits={player_hits} score={score}"
+
+    ok = True
+    for march in (False, True):
+        scene = "marching" if march else "static"
+        reference = collision_outcome(frames, seed, swept=True, collision_stride=1, march=march)
+        swept = collision_outcome(frames, seed, swept=True, collision_stride=stride, march=march)
+        discrete = collision_outcome(frames, seed, swept=False, collision_stride=stride, march=march)
+        print(f"{scene} stride 1 swept:    {_describe(reference)}")
+        print(f"{scene} stride {stride} swept:    {_describe(swept)}")
+        print(f"{scene} stride {stride} discrete: {_describe(discrete)}")
+        if swept == reference:
+            print(f"{scene}: swept collision at stride {stride} matches stride 1")
+        elif march:
+            print(f"{scene}: swept collision at stride {stride} differs from stride 1 (enemy motion is interpolated)")
+        else:
+            print(f"FAIL {scene}: swept collision at stride {stride} does not match stride 1")
+            ok = False
+    return ok
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Run PyxelShmup game logic without a window")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="number of frames to simulate (default: 3600, or the whole replay)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--draw", action="store_true", help="also call draw() with stubbed pyxel")
+    parser.add_argument("--debug", action="store_true", help="enable Config.DEBUG output")
+    parser.add_argument("--profile", metavar="PATH", help="enable the frame profiler and write its trace (.json/.csv)")
+    parser.add_argument("--record", metavar="PATH", help="record the simulated input as a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a replay file instead of the autopilot")
+    parser.add_argument("--swept", action="store_true", help="use swept (continuous) collision detection")
+    parser.add_argument("--collision-stride", type=int, default=None, metavar="N",
+                        help="run collision detection every N ticks over the motion since the last check")
+    parser.add_argument("--check-stride", type=int, default=None, metavar="N",
+                        help="check that swept collision every N ticks gives the same hits and kills as every tick")
+    args = parser.parse_args()
+
+    if args.check_stride is not None:
+        ok = check_collision_stride(args.check_stride, frames=args.frames or STRIDE_CHECK_FRAMES, seed=args.seed)
+        sys.exit(0 if ok else 1)
+
+    replay = None
+    if args.replay:
+        from Replay import Replay
+        replay = Replay.load(args.replay)
+    frames = args.frames
+    if frames is None and replay is None:
+        frames = 3600
+
+    if args.profile:
+        install()
+        from Profiler import profiler
+        profiler.reset()
+        profiler.set_enabled(True)
+
+    result = run(frames, seed=args.seed, draw=args.draw, debug=args.debug, record=args.record, replay=replay,
+                 swept=True if args.swept else None, collision_stride=args.collision_stride)
+    print(result.summary())
+
+    if args.profile:
+        profiler.end_frame()
+        profiler.dump(args.profile)
+        for phase, stats in profiler.summary().items():
+            print(f"{phase:<14} mean={stats['mean_us']:>8.1f}us p95={stats['p95_us']:>8.1f}us max={stats['max_us']:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main_cli()
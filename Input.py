@@ -0,0 +1,58 @@
+# Input
+# ゲームロジックが参照する入力を1ティック分のビットマスクとして保持する
+# ゲームロジックはpyxel.btnを直接読まずにbtn(INPUT_*)で問い合わせる。
+# マスクは毎ティックの先頭でset_maskされる（実機ではread_keysの結果、リプレイ再生中は記録された値）。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import pyxel
+
+# 入力ビットマスク定義（1ティック分の入力を1つの整数で表す）
+INPUT_LEFT = 1 << 0
+INPUT_RIGHT = 1 << 1
+INPUT_UP = 1 << 2
+INPUT_DOWN = 1 << 3
+INPUT_SHOT = 1 << 4     # SPACE
+INPUT_Z = 1 << 5
+INPUT_ESCAPE = 1 << 6   # ゲームロジックでは使わない（ヘッドレス実行の終了用）
+
+# ゲームロジックの入力として読み取るキー
+_KEY_BITS = (
+    (pyxel.KEY_LEFT, INPUT_LEFT),
+    (pyxel.KEY_RIGHT, INPUT_RIGHT),
+    (pyxel.KEY_UP, INPUT_UP),
+    (pyxel.KEY_DOWN, INPUT_DOWN),
+    (pyxel.KEY_SPACE, INPUT_SHOT),
+    (pyxel.KEY_Z, INPUT_Z),
+)
+
+# 現在のティックの入力
+_mask: int = 0
+
+
+def read_keys() -> int:
+    """キーボードの現在の状態をビットマスクとして読み取る"""
+    mask = 0
+    btn = pyxel.btn
+    for key, bit in _KEY_BITS:
+        if btn(key):
+            mask |= bit
+    return mask
+
+
+def set_mask(mask: int):
+    """このティックでゲームロジックが参照する入力を設定する"""
+    global _mask
+    _mask = mask
+
+
+def get_mask() -> int:
+    return _mask
+
+
+def btn(bit: int) -> bool:
+    """このティックでINPUT_*のいずれかが押されているか"""
+    return (_mask & bit) != 0
@@ -0,0 +1,179 @@
+# Memory Benchmark
+# エンティティ1個あたりのメモリ使用量を、__dict__を持つオブジェクトだった場合と比較する
+#   Enemy            : __slots__版のインスタンス
+#   弾・パーティクル : World.Archetypeの列（1行あたり。行番号に固定されたファサードも含む）
+#   星               : StarPointsの列（1個あたり）
+#
+#   python MemoryBench.py [--count N]
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+import Headless
+
+# __slots__化の前はインスタンスごとに保持していた属性（現在はクラス属性）
+FORMER_INSTANCE_ATTRS = {
+    "Enemy": ("col_x", "col_y", "col_w", "col_h",
+              "ENTRY_MOVE_SPEED", "HOME_MOVE_SPEED", "HOME_PROXIMITY_THRESHOLD"),
+}
+
+
+class _DictEntity:
+    """__slots__化前の状態を再現するための__dict__付きオブジェクト"""
+
+
+def _instance_values(obj) -> dict:
+    """オブジェクトが保持している属性値（__slots__＋旧インスタンス属性）を取得する"""
+    cls = type(obj)
+    values = {}
+    for klass in cls.__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if hasattr(obj, name):
+                values[name] = getattr(obj, name)
+    for name in FORMER_INSTANCE_ATTRS.get(cls.__name__, ()):
+        values[name] = getattr(obj, name)
+    return values
+
+
+def _measure(factory, count: int) -> float:
+    """factory()でcount個生成したときの1個あたりの確保バイト数"""
+    objs = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        objs[i] = factory()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objs
+    return used / count
+
+
+def measure_entity(sample, count: int):
+    """サンプルと同じ属性値を持つオブジェクトを作り、slots版とdict版のサイズを返す
+
+    属性値そのものは共有するため、コンテナ部分（インスタンス本体と__dict__）の
+    差だけが計測される。
+    """
+    cls = type(sample)
+    values = _instance_values(sample)
+    slot_values = {name: value for name, value in values.items()
+                   if name not in FORMER_INSTANCE_ATTRS.get(cls.__name__, ())}
+
+    def make_slotted():
+        obj = object.__new__(cls)
+        for name, value in slot_values.items():
+            object.__setattr__(obj, name, value)
+        return obj
+
+    def make_dict():
+        obj = _DictEntity()
+        obj.__dict__.update(values)
+        return obj
+
+    return _measure(make_slotted, count), _measure(make_dict, count)
+
+
+def _row_value(default, row: int):
+    """列の1行分の値（floatは行ごとに別のオブジェクトになる。intとboolは共有される小さな値）"""
+    if isinstance(default, bool):
+        return True
+    if isinstance(default, float):
+        return row + 0.5
+    if isinstance(default, int):
+        return row % 16
+    return default
+
+
+def measure_table(table, count: int):
+    """tableと同じ列構成のアーキタイプをcount行埋めたときの1行あたりのバイト数と、
+    同じ値を__dict__付きオブジェクトで持った場合の1個あたりのバイト数を返す"""
+    from World import Archetype
+
+    defaults = table._defaults
+    rows = iter(range(count))
+
+    def make_columns():
+        columns = Archetype(table.name, count, defaults, table._facade_factory)
+        for name, values in columns.columns.items():
+            default = defaults[name]
+            for row in range(count):
+                values[row] = _row_value(default, row)
+        return columns
+
+    def make_dict():
+        obj = _DictEntity()
+        row = next(rows)
+        obj.__dict__.update({name: _row_value(default, row) for name, default in defaults.items()})
+        return obj
+
+    return _measure(make_columns, 1) / count, _measure(make_dict, count)
+
+
+def measure_stars(count: int):
+    """StarPointsの列の星1個あたりのバイト数と、星をオブジェクトで持った場合のバイト数を返す"""
+    from StarManager import StarPoints
+
+    rng = random.Random(0)
+    columns_bytes = _measure(lambda: StarPoints(count, rng), 1) / count
+
+    def make_dict():
+        obj = _DictEntity()
+        obj.__dict__.update({"x": rng.randint(0, 127), "y": rng.uniform(0, 127),
+                             "col": rng.randint(2, 15), "speed": rng.uniform(0.1, 3.0)})
+        return obj
+
+    return columns_bytes, _measure(make_dict, count)
+
+
+def build_samples() -> dict:
+    """計測対象のエンティティを1個ずつ生成する"""
+    Headless.install()
+    import Config
+    Config.DEBUG = False
+
+    import Common  # Enemyより先に読み込む（Common <-> Enemyの循環importのため）
+    from Enemy import Enemy
+
+    return {
+        "Enemy": Enemy(x=10, y=10, sprite_num=1, life=2, score=100,
+                       entry_pattern="left_horizontal", entry_y=64,
+                       wave_id=0, enemy_index=3, entry_pattern_id=1),
+    }
+
+
+def measure_all(count: int) -> dict:
+    """名前 -> (現在の格納方式のバイト数, __dict__版のバイト数)"""
+    results = {name: measure_entity(sample, count) for name, sample in build_samples().items()}
+
+    import Common
+    from ExplodeManager import explode_manager
+    results["Bullet"] = measure_table(Common.registry.player_bullet_table, count)
+    results["EnemyBullet"] = measure_table(Common.registry.enemy_bullet_table, count)
+    results["Particle"] = measure_table(explode_manager.particles, count)
+    results["Star"] = measure_stars(count)
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(
+        description="Report bytes per entity for __slots__ objects and column tables versus __dict__ objects")
+    parser.add_argument("--count", type=int, default=10000, help="instances (or table rows) allocated per measurement")
+    args = parser.parse_args()
+
+    print(f"{'entity':<12} {'__dict__':>10} {'current':>10} {'saved':>7}  storage")
+    for name, (current, with_dict) in measure_all(args.count).items():
+        storage = "__slots__" if name == "Enemy" else "columns"
+        saved = (1.0 - current / with_dict) * 100 if with_dict else 0.0
+        print(f"{name:<12} {with_dict:>9.0f}B {current:>9.0f}B {saved:>6.1f}%  {storage}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -8,10 +8,14 @@ import Common
 import Config
 import GameState
 from SpriteManager import sprite_manager
+from AnimationClock import animation_clock
+from SpriteVariants import VARIANT_YELLOW
+from RenderQueue import render_queue, LAYER_PLAYER, LAYER_PLAYER_FX
 import math
 from ExplodeManager import ExpType
-
 from Bullet import Bullet
+import Input
+from Input import INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN, INPUT_SHOT
 
 ExtNames = ["EXT01", "EXT02", "EXT03", "EXT04"]
 ExtMax = len(ExtNames)
@@ -29,18 +33,22 @@ PLAYER_COLLISION_BOX = (2, 2, 4, 4)  # x, y, w, h
 PLAYER_SHOT_INTERVAL = 16
 PLAYER_EXPLODE_TIMER = 180
 
+# スナップショットに含める属性（スプライト参照など初期化時に決まるものは除く）
+_SNAPSHOT_ATTRS = (
+    "x", "y", "speed", "col_active", "ShotTimer", "ExplodeCoolTimer", "NowExploding",
+    "SprName", "MuzlFlash",
+)
+
 class Player:
+    # 当たり判定ボックス（ピクセル単位の判定ではCommon.apply_collision_mask_boundsが差し替える）
+    col_x, col_y, col_w, col_h = PLAYER_COLLISION_BOX
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.width = 8
         self.height = 8
 
-        self.col_x = 2  # Collision X
-        self.col_y = 2  # Collision Y
-        self.col_w = 4  # Collision Width
-        self.col_h = 4
-
         self.speed = 1
         self.col_active = True
         self.ShotTimer = PLAYER_SHOT_INTERVAL
@@ -50,45 +58,48 @@ class Player:
 
         self.SprName = "TOP"    #Drawing Sprite Name
 
-        # エグゾーストアニメーション管理
-        self.ExtIndex = 0
-        self.ExtTimer = 0
-        self.exhaust_duration = self._get_exhaust_animation_duration()
+        # エグゾーストはAnimationClockのループアニメーション、マズルフラッシュはMuzlFlashで進める単発アニメーション
+        self.exhaust_slot = animation_clock.slot("EXHST", 1)
+        self.muzzle_frames = animation_clock.slot("MZLFLSH").frames
 
         self.MuzlFlash = -1  # Muzzle Flash List
 
 
 
+    def snapshot(self) -> tuple:
+        """プレイヤーの状態（Snapshot用）"""
+        return tuple(getattr(self, name) for name in _SNAPSHOT_ATTRS)
+
+    def restore(self, state: tuple):
+        for name, value in zip(_SNAPSHOT_ATTRS, state):
+            setattr(self, name, value)
+
+    def update_effects(self):
+        """演出用タイマーの更新（ヒットストップ中も毎ティック呼ぶ。描画頻度に依存しないようupdateで進める）"""
+        if self.MuzlFlash >= 0:
+            self.MuzlFlash -= 1
+
     def update(self):
         
         if GameState.StopTimer > 0:
             return  
-        
-        #Exhaust Animation -------- JSON駆動の持続時間制御
-        self.ExtTimer += 1
-        
-        if self.ExtTimer >= self.exhaust_duration:
-            self.ExtTimer = 0
-            self.ExtIndex += 1
-            if self.ExtIndex >= ExtMax:
-                self.ExtIndex = 0
 
         #Movement -----------
         self.SprName = "TOP"
         dx = 0  #direction
         dy = 0
 
-        if pyxel.btn(pyxel.KEY_LEFT):
+        if Input.btn(INPUT_LEFT):
             dx -= 1
             self.SprName = "LEFT"
 
-        if pyxel.btn(pyxel.KEY_RIGHT):
+        if Input.btn(INPUT_RIGHT):
             dx += 1
             self.SprName = "RIGHT"
 
-        if pyxel.btn(pyxel.KEY_UP):
+        if Input.btn(INPUT_UP):
             dy -= 1
-        if pyxel.btn(pyxel.KEY_DOWN):
+        if Input.btn(INPUT_DOWN):
             dy += 1 
 
         # 斜め移動時の速度を正規化（1/√2 ≈ 0.707を掛けて対角線上の速度を調整）
@@ -105,11 +116,11 @@ class Player:
         self.y = max(0, min(self.y, Config.WIN_HEIGHT - (self.height+8)))
         
         #弾の発射
-        if pyxel.btn(pyxel.KEY_SPACE):
+        if Input.btn(INPUT_SHOT):
             if(self.ShotTimer <= 0):
                 pyxel.play(0, 0)  # 効果音再生
-                Common.player_bullet_list.append(Bullet(self.x-4, self.y-4, 8, 8)) # 弾の情報をリストに追加
-                Common.player_bullet_list.append(Bullet(self.x+4, self.y-4, 8, 8)) # 弾の情報をリストに追加
+                Common.spawn_player_bullet(self.x-4, self.y-4, 8, 8) # プールから弾を取得してリストに追加
+                Common.spawn_player_bullet(self.x+4, self.y-4, 8, 8) # プールから弾を取得してリストに追加
                 self.ShotTimer = PLAYER_SHOT_INTERVAL  # 再発射までの時間をリセット
 
                 self.MuzlFlash = MuzlStarIndex  # Muzzle Flash Animate Start
@@ -124,48 +135,42 @@ class Player:
 
     
     def draw(self):
-        # クールタイム中のみ点滅処理
-        if self.ExplodeCoolTimer > 0:
-            if math.sin(GameState.GameTimer/3) < 0:
-                for n in range(1, 15):
-                    pyxel.pal(n,pyxel.COLOR_YELLOW)
-        else:
-            pyxel.pal()  # クールタイム終了時はパレットをリセット
-
         #Player Ship - JSON駆動のスプライト取得
+        # クールタイム中の点滅は焼き込み済みの黄色のスプライトを描く
+        # 描画はレンダーキューへ積む（draw_playingでまとめて実行する）
         player_sprite = self._get_player_sprite()
-        pyxel.blt(self.x, self.y, Config.TILE_BANK0,
-                player_sprite.x, player_sprite.y, self.width, self.height, pyxel.COLOR_BLACK)
-
-        #デフォルトパレットに戻す
-        pyxel.pal()
+        if self.ExplodeCoolTimer > 0 and math.sin(GameState.GameTimer/3) < 0:
+            render_queue.submit(LAYER_PLAYER, Config.VARIANT_BANK, player_sprite.x, player_sprite.y + VARIANT_YELLOW,
+                                self.width, self.height, self.x, self.y)
+        else:
+            render_queue.submit(LAYER_PLAYER, Config.TILE_BANK0, player_sprite.x, player_sprite.y,
+                                self.width, self.height, self.x, self.y)
         
-        #Exhaust - JSON駆動のエグゾーストスプライト取得
-        exhaust_sprite = self._get_exhaust_sprite()
-        pyxel.blt(self.x, self.y+8, Config.TILE_BANK0,
-            exhaust_sprite.x, exhaust_sprite.y, self.width, self.height, pyxel.COLOR_BLACK)
+        #Exhaust - 現在のフレームはAnimationClockのスロットから読む
+        exhaust_slot = self.exhaust_slot
+        render_queue.submit(LAYER_PLAYER_FX, Config.TILE_BANK0, exhaust_slot.u, exhaust_slot.v,
+                            self.width, self.height, self.x, self.y+8)
 
         #Muzzle Flash - JSON駆動のスプライト取得
         if self.MuzlFlash >= 0:
             muzzle_sprite = self._get_muzzle_flash_sprite()
-            pyxel.blt(self.x-4, self.y-6, Config.TILE_BANK0,
-                      muzzle_sprite.x, muzzle_sprite.y, 8, 8, pyxel.COLOR_BLACK)
-            pyxel.blt(self.x+4, self.y-6, Config.TILE_BANK0,
-                      muzzle_sprite.x, muzzle_sprite.y, 8, 8, pyxel.COLOR_BLACK)
-
-        self.MuzlFlash -= 1
+            render_queue.submit(LAYER_PLAYER_FX, Config.TILE_BANK0, muzzle_sprite.x, muzzle_sprite.y,
+                                8, 8, self.x-4, self.y-6)
+            render_queue.submit(LAYER_PLAYER_FX, Config.TILE_BANK0, muzzle_sprite.x, muzzle_sprite.y,
+                                8, 8, self.x+4, self.y-6)
         
         #弾描画
-        for _bullet in Common.player_bullet_list:
-            _bullet.draw()
+        Bullet.draw_all()
        
         # Collision Box 
         if Config.DEBUG:
-            pyxel.rectb(self.x + self.col_x, self.y + self.col_y, self.col_w, self.col_h, pyxel.COLOR_GREEN)
+            render_queue.overlay(pyxel.rectb, self.x + self.col_x, self.y + self.col_y,
+                                 self.col_w, self.col_h, pyxel.COLOR_GREEN)
 
     def on_hit(self):
         """プレイヤーが敵または敵弾に当たった時の処理"""
         if self.ExplodeCoolTimer <= 0:  # クールタイム中でない場合のみ
+            GameState.PlayerHits += 1
             # 爆発エフェクト
             Common.explode_manager.spawn_explosion(
                 self.x + 4, self.y + 4, 20, ExpType.CIRCLE
@@ -181,18 +186,6 @@ class Player:
         """プレイヤーの現在のスプライトを取得する"""
         return sprite_manager.get_sprite_by_name_and_field("PLAYER", "ACT_NAME", self.SprName)
     
-    def _get_exhaust_sprite(self):
-        """エグゾーストの現在のスプライトを取得する"""
-        return sprite_manager.get_sprite_by_name_and_field("EXHST", "FRAME_NUM", str(self.ExtIndex))
-    
-    def _get_exhaust_animation_duration(self):
-        """エグゾーストアニメーションの持続時間を取得する"""
-        anim_spd = sprite_manager.get_sprite_metadata("EXHST", "ANIM_SPD", "1")
-        try:
-            return int(anim_spd)
-        except (ValueError, TypeError):
-            return 1
-    
     def _get_muzzle_flash_sprite(self):
         """マズルフラッシュのスプライトを取得する"""
-        return sprite_manager.get_sprite_by_name_and_field("MZLFLSH", "FRAME_NUM", str(self.MuzlFlash))
+        return self.muzzle_frames[self.MuzlFlash % len(self.muzzle_frames)]
@@ -0,0 +1,253 @@
+# Frame Profiler
+# App.update / App.drawの各フェーズの処理時間を計測する
+# 無効時はlap()等が空関数に差し替わるため、ほぼコストがかからない
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import csv
+import json
+import time
+
+import pyxel
+import Config
+
+# ヒストグラムのバケット上限（マイクロ秒）。最後のバケットはそれ以上全て
+HISTOGRAM_BUCKETS_US = (50, 100, 200, 500, 1000, 2000, 5000, 10000, 16667)
+
+# フレーム合計の疑似フェーズ名
+TOTAL_UPDATE = "update"
+TOTAL_DRAW = "draw"
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class PhaseStats:
+    """1フェーズ分のローリング統計（直近N フレームのリングバッファ＋ヒストグラム）"""
+
+    __slots__ = ("samples", "index", "filled", "histogram")
+
+    def __init__(self, history: int):
+        self.samples: list = [0.0] * history   # 秒
+        self.index: int = 0
+        self.filled: int = 0
+        self.histogram: list = [0] * (len(HISTOGRAM_BUCKETS_US) + 1)
+
+    def add(self, seconds: float):
+        samples = self.samples
+        samples[self.index] = seconds
+        self.index = (self.index + 1) % len(samples)
+        if self.filled < len(samples):
+            self.filled += 1
+
+        us = seconds * 1e6
+        bucket = 0
+        for limit in HISTOGRAM_BUCKETS_US:
+            if us < limit:
+                break
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def recent(self) -> list:
+        return self.samples[:self.filled]
+
+    def mean_us(self) -> float:
+        recent = self.recent()
+        return sum(recent) / len(recent) * 1e6 if recent else 0.0
+
+    def percentile_us(self, pct: float) -> float:
+        recent = sorted(self.recent())
+        if not recent:
+            return 0.0
+        index = min(len(recent) - 1, int(len(recent) * pct / 100.0))
+        return recent[index] * 1e6
+
+    def max_us(self) -> float:
+        recent = self.recent()
+        return max(recent) * 1e6 if recent else 0.0
+
+
+class FrameProfiler:
+    """フェーズ単位のフレームプロファイラ
+
+    使い方:
+        profiler.begin_frame()      # App.updateの先頭
+        ...処理...
+        profiler.lap("enemies")     # 直前のlap（またはbegin）からの経過時間を記録
+        profiler.begin_draw()       # App.drawの先頭
+        profiler.lap("draw_enemies")
+        profiler.end_frame()        # App.drawの末尾
+    """
+
+    def __init__(self, history: int = 240, trace_limit: int = 36000):
+        self.history: int = history
+        self.trace_limit: int = trace_limit
+        self.phases: dict = {}          # フェーズ名 -> PhaseStats（登場順）
+        self.trace: list = []           # フレームごとの記録 [(frame, {phase: 秒}), ...]
+        self.frame: int = 0
+        self.hud_visible: bool = False
+
+        self._current: dict = {}
+        self._last: float = 0.0
+        self._update_total: float = 0.0
+        self._in_frame: bool = False
+        self._in_draw: bool = False
+
+        self.enabled: bool = False
+        self.set_enabled(False)
+
+    def set_enabled(self, enabled: bool):
+        """計測の有効/無効を切り替える（無効時は計測APIを空関数にする）"""
+        self.enabled = enabled
+        if enabled:
+            self.begin_frame = self._begin_frame
+            self.begin_draw = self._begin_draw
+            self.lap = self._lap
+            self.end_frame = self._end_frame
+        else:
+            self.begin_frame = _noop
+            self.begin_draw = _noop
+            self.lap = _noop
+            self.end_frame = _noop
+            self._in_frame = False
+
+    def reset(self):
+        """蓄積した統計とトレースを破棄する"""
+        self.phases = {}
+        self.trace = []
+        self.frame = 0
+        self._in_frame = False
+
+    # --- 計測API（有効時の実体） ---
+
+    def _begin_frame(self):
+        if self._in_frame:
+            self._end_frame()  # drawが呼ばれなかったフレーム（ヘッドレス等）を確定
+        self._current = {}
+        self._update_total = 0.0
+        self._in_frame = True
+        self._in_draw = False
+        self._last = time.perf_counter()
+
+    def _begin_draw(self):
+        if not self._in_frame:
+            self._begin_frame()
+        self._update_total = sum(self._current.values())
+        self._in_draw = True
+        self._last = time.perf_counter()
+
+    def _lap(self, phase: str):
+        now = time.perf_counter()
+        current = self._current
+        current[phase] = current.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def _end_frame(self):
+        if not self._in_frame:
+            return
+        current = self._current
+        total = sum(current.values())
+        if self._in_draw:
+            current[TOTAL_UPDATE] = self._update_total
+            current[TOTAL_DRAW] = total - self._update_total
+        else:
+            current[TOTAL_UPDATE] = total
+            current[TOTAL_DRAW] = 0.0
+
+        phases = self.phases
+        for phase, seconds in current.items():
+            stats = phases.get(phase)
+            if stats is None:
+                stats = phases[phase] = PhaseStats(self.history)
+            stats.add(seconds)
+
+        if len(self.trace) < self.trace_limit:
+            self.trace.append((self.frame, current))
+        self.frame += 1
+        self._in_frame = False
+
+    # --- 集計・出力 ---
+
+    def summary(self) -> dict:
+        """フェーズごとの統計（直近historyフレーム）を返す"""
+        return {
+            phase: {
+                "mean_us": round(stats.mean_us(), 2),
+                "p95_us": round(stats.percentile_us(95), 2),
+                "p99_us": round(stats.percentile_us(99), 2),
+                "max_us": round(stats.max_us(), 2),
+                "histogram": list(stats.histogram),
+            }
+            for phase, stats in self.phases.items()
+        }
+
+    def dump(self, path: str):
+        """トレースを書き出す（拡張子が.csvならCSV、それ以外はJSON）"""
+        phase_names = list(self.phases.keys())
+        if path.endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + [f"{name}_us" for name in phase_names])
+                for frame, record in self.trace:
+                    writer.writerow([frame] + [f"{record.get(name, 0.0) * 1e6:.2f}" for name in phase_names])
+        else:
+            data = {
+                "histogram_buckets_us": list(HISTOGRAM_BUCKETS_US),
+                "summary": self.summary(),
+                "phases": phase_names,
+                "frames": [
+                    [frame] + [round(record.get(name, 0.0) * 1e6, 2) for name in phase_names]
+                    for frame, record in self.trace
+                ],
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+    def dump_trace(self):
+        """Config.PROFILER_TRACE_PATHへトレースを書き出す（終了時用）"""
+        if self.enabled and self.trace and Config.PROFILER_TRACE_PATH:
+            self.dump(Config.PROFILER_TRACE_PATH)
+
+    def draw_hud(self, pool_stats=None):
+        """画面右上にフェーズ別の平均時間を表示する（Config.DEBUGのオーバーレイと同じく最前面）
+
+        pool_statsにCommon.pool_statsを渡すと、空きが無く生成できなかったプールの取得失敗数も表示する。
+        """
+        if not (self.enabled and self.hud_visible):
+            return
+
+        phases = self.phases
+        lines = []
+        for phase in (TOTAL_UPDATE, TOTAL_DRAW):
+            stats = phases.get(phase)
+            if stats is not None:
+                lines.append((phase.upper(), stats.mean_us()))
+
+        # 合計以外で重い順に上位を表示
+        ranked = sorted(
+            ((phase, stats.mean_us()) for phase, stats in phases.items()
+             if phase not in (TOTAL_UPDATE, TOTAL_DRAW)),
+            key=lambda item: item[1], reverse=True,
+        )
+        lines.extend(ranked[:Config.PROFILER_HUD_LINES])
+
+        y = 8
+        for name, mean_us in lines:
+            pyxel.text(60, y, f"{name[:10]:<10}{mean_us:>5.0f}", pyxel.COLOR_LIME)
+            y += 6
+
+        if pool_stats is not None:
+            for name, stats in pool_stats().items():
+                if stats["misses"] > 0:
+                    pyxel.text(60, y, f"MISS {name[:7]:<7}{stats['misses']:>4}", pyxel.COLOR_RED)
+                    y += 6
+
+
+# グローバルインスタンス
+profiler = FrameProfiler(Config.PROFILER_HISTORY, Config.PROFILER_TRACE_FRAMES)
+profiler.set_enabled(Config.PROFILER_ENABLED)
+profiler.hud_visible = Config.PROFILER_HUD
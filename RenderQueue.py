@@ -0,0 +1,157 @@
+# Render Queue
+# スプライトの描画コマンド（バンク・転送元矩形・描画先・レイヤー）を1フレーム分ためてから
+# まとめて実行する。
+#  - 画面（WIN_WIDTH x WIN_HEIGHT）にカメラシェイクの幅を足した範囲の外にあるコマンドは積まずに捨てる
+#  - (レイヤー, バンク)ごとのバケットに積み、キーの順に実行する（バケット内は投入順。
+#    アーキタイプの列をまとめて積んだ分は、単体のコマンドの後に描く）。
+#    パレット差し替え版のスプライトは別バンク（SpriteVariants）なので、バンクがそのまま描画状態のキーになる
+#  - フレームごとの投入数・カリング数・描画数・バケット数を記録する
+#
+# 線や円などの図形（爆発・デバッグ表示）はキューを通さずに直接描く。
+# デバッグ用の当たり判定表示はoverlayで積むと、スプライトの後に描かれる。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import pyxel
+import Config
+
+# レイヤー（小さい順に描く。従来のdraw_playingの描画順と同じ並び）
+LAYER_PLAYER = 0            # 自機
+LAYER_PLAYER_FX = 1         # エグゾースト・マズルフラッシュ
+LAYER_PLAYER_BULLET = 2     # 自弾
+LAYER_ENEMY = 3             # 敵
+LAYER_ENEMY_BULLET = 4      # 敵弾
+
+
+class RenderQueue:
+    """カリング付きの描画コマンドキュー（submitで積み、flushで実行する）"""
+
+    def __init__(self, width: int, height: int, margin: int):
+        # 描画先の座標がこの範囲に少しでも入るコマンドだけを描く
+        self.min_x: int = -margin
+        self.min_y: int = -margin
+        self.max_x: int = width + margin
+        self.max_y: int = height + margin
+
+        # (layer, bank) -> ([(x, y, u, v, w, h, colkey), ...], [(u, v, w, h, colkey, xs, ys, count), ...])
+        self._buckets: dict = {}
+        self._overlays: list = []   # スプライトの後に呼ぶ(関数, 引数)
+
+        # 現在のフレームの集計
+        self.submitted: int = 0
+        self.culled: int = 0
+
+        # 直前にflushしたフレームの集計
+        self.last_submitted: int = 0
+        self.last_culled: int = 0
+        self.last_batches: int = 0
+
+        # 累計（ベンチマーク・ヘッドレス実行の集計用）
+        self.frames: int = 0
+        self.total_submitted: int = 0
+        self.total_culled: int = 0
+
+    def _bucket(self, layer: int, bank: int) -> tuple:
+        bucket = self._buckets.get((layer, bank))
+        if bucket is None:
+            bucket = self._buckets[(layer, bank)] = ([], [])
+        return bucket
+
+    def submit(self, layer: int, bank: int, u: int, v: int, w: int, h: int, x, y,
+               colkey: int = pyxel.COLOR_BLACK):
+        """1つのスプライトの描画を積む（画面外なら捨てる）"""
+        self.submitted += 1
+        if x >= self.max_x or y >= self.max_y or x + w <= self.min_x or y + h <= self.min_y:
+            self.culled += 1
+            return
+        self._bucket(layer, bank)[0].append((x, y, u, v, w, h, colkey))
+
+    def submit_rows(self, layer: int, bank: int, u: int, v: int, w: int, h: int, xs: list, ys: list,
+                    count: int, colkey: int = pyxel.COLOR_BLACK):
+        """同じスプライトをアーキタイプの列の先頭count行の位置に描く
+
+        列はコピーせずに参照だけを積み、flushの時にカリングしながら描く
+        （submitからflushまでの間に列を書き換えないこと）。
+        """
+        self.submitted += count
+        self._bucket(layer, bank)[1].append((u, v, w, h, colkey, xs, ys, count))
+
+    def overlay(self, func, *args):
+        """スプライトを描いた後に呼ぶ描画（デバッグ表示用）を積む"""
+        self._overlays.append((func, args))
+
+    def flush(self):
+        """積んだコマンドを(レイヤー, バンク)の順に実行し、フレームの集計を確定する"""
+        blt = pyxel.blt
+        batches = 0
+        culled = 0
+        buckets = self._buckets
+        for key in sorted(buckets):
+            commands, row_batches = buckets[key]
+            if not commands and not row_batches:
+                continue
+            batches += 1
+            bank = key[1]
+            for x, y, u, v, w, h, colkey in commands:
+                blt(x, y, bank, u, v, w, h, colkey)
+            commands.clear()
+
+            for u, v, w, h, colkey, xs, ys, count in row_batches:
+                min_x, max_x = self.min_x - w, self.max_x
+                min_y, max_y = self.min_y - h, self.max_y
+                for row in range(count):
+                    x = xs[row]
+                    y = ys[row]
+                    if min_x < x < max_x and min_y < y < max_y:
+                        blt(x, y, bank, u, v, w, h, colkey)
+                    else:
+                        culled += 1
+            row_batches.clear()
+        self.culled += culled
+
+        overlays = self._overlays
+        for func, args in overlays:
+            func(*args)
+        overlays.clear()
+
+        self.last_submitted = self.submitted
+        self.last_culled = self.culled
+        self.last_batches = batches
+        self.frames += 1
+        self.total_submitted += self.submitted
+        self.total_culled += self.culled
+        self.submitted = 0
+        self.culled = 0
+
+    def clear(self):
+        """積んだコマンドを実行せずに捨てる"""
+        for commands, row_batches in self._buckets.values():
+            commands.clear()
+            row_batches.clear()
+        self._overlays.clear()
+        self.submitted = 0
+        self.culled = 0
+
+    def reset_stats(self):
+        """累計の集計を0に戻す"""
+        self.frames = 0
+        self.total_submitted = 0
+        self.total_culled = 0
+
+    def stats(self) -> dict:
+        """直前のフレームと累計の集計を返す"""
+        return {
+            "submitted": self.last_submitted,
+            "culled": self.last_culled,
+            "batches": self.last_batches,
+            "frames": self.frames,
+            "total_submitted": self.total_submitted,
+            "total_culled": self.total_culled,
+        }
+
+
+# グローバルインスタンス（カメラシェイクの揺れ幅分だけ画面の外まで描く）
+render_queue = RenderQueue(Config.WIN_WIDTH, Config.WIN_HEIGHT, Config.SHAKE_STRENGTH)
@@ -0,0 +1,260 @@
+# Replay
+# ティックごとの入力ビットマスクをランレングス圧縮したバイナリとして記録・再生する
+# 乱数はRngのストリームをヘッダのシードで初期化し直すので、同じビルドなら結果はビット単位で一致する。
+#
+# ファイル形式（リトルエンディアン）:
+#   ヘッダ   : magic "PSRP" | version u16 | start_state u16 | seed i64
+#              | tick_count u32 | keyframe_interval u32 | keyframe_count u32 | run_count u32
+#   キーフレーム索引: (tick u32, run_index u32, run_offset u32) × keyframe_count
+#              keyframe_interval ティックごとに、そのティックの入力がどのランの何番目かを記録する
+#   ラン     : (mask u8, length LEB128可変長) × run_count
+#
+# 再生時はキーフレームごとにゲーム状態（capture/restoreフックが設定されていれば）と
+# 乱数ストリームの状態をメモリに保持し、seekで最寄りのキーフレームから再開する。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import bisect
+import struct
+
+import Rng
+
+MAGIC = b"PSRP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHqIIII")
+_KEYFRAME = struct.Struct("<III")
+
+DEFAULT_KEYFRAME_INTERVAL = 600     # 10秒（60ティック/秒）
+
+
+class ReplayError(Exception):
+    """リプレイファイルの読み込みエラー"""
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated run length")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """記録済みの入力列（ランレングス形式）とキーフレーム索引"""
+
+    def __init__(self, seed: int, start_state: int, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        self.seed: int = seed
+        self.start_state: int = start_state
+        self.keyframe_interval: int = keyframe_interval
+        self.masks: list = []           # ランごとの入力マスク
+        self.lengths: list = []         # ランごとの長さ（ティック数）
+        self.tick_count: int = 0
+        self.keyframes: list = []       # (tick, run_index, run_offset)。tickはkeyframe_intervalの倍数
+        self._keyframe_ticks: list = []
+
+    # --- 記録 ---
+
+    def append(self, mask: int):
+        """1ティック分の入力を末尾に追加する"""
+        tick = self.tick_count
+        masks = self.masks
+        if masks and masks[-1] == mask:
+            run_index = len(masks) - 1
+            run_offset = self.lengths[-1]
+            self.lengths[-1] += 1
+        else:
+            run_index = len(masks)
+            run_offset = 0
+            masks.append(mask)
+            self.lengths.append(1)
+
+        if tick % self.keyframe_interval == 0:
+            self.keyframes.append((tick, run_index, run_offset))
+            self._keyframe_ticks.append(tick)
+        self.tick_count = tick + 1
+
+    def truncate(self, tick_count: int):
+        """tick_countティック目以降の入力を捨てる（巻き戻した後に記録を続ける場合）"""
+        remove = self.tick_count - tick_count
+        if remove <= 0:
+            return
+        masks, lengths = self.masks, self.lengths
+        while remove > 0:
+            if lengths[-1] <= remove:
+                remove -= lengths.pop()
+                masks.pop()
+            else:
+                lengths[-1] -= remove
+                remove = 0
+        while self.keyframes and self.keyframes[-1][0] >= tick_count:
+            self.keyframes.pop()
+            self._keyframe_ticks.pop()
+        self.tick_count = tick_count
+
+    # --- 参照 ---
+
+    def locate(self, tick: int):
+        """ティックの入力が入っている(run_index, run_offset)を返す
+
+        キーフレーム索引で最寄りの位置まで飛んでから、残りのランだけを辿る。
+        """
+        if not 0 <= tick < self.tick_count:
+            raise IndexError(f"tick {tick} out of range (0..{self.tick_count - 1})")
+        k = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        base_tick, run_index, run_offset = self.keyframes[k]
+        remaining = tick - base_tick + run_offset
+        lengths = self.lengths
+        while remaining >= lengths[run_index]:
+            remaining -= lengths[run_index]
+            run_index += 1
+        return run_index, remaining
+
+    def mask_at(self, tick: int) -> int:
+        return self.masks[self.locate(tick)[0]]
+
+    # --- シリアライズ ---
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.start_state, self.seed, self.tick_count,
+                                     self.keyframe_interval, len(self.keyframes), len(self.masks)))
+        for keyframe in self.keyframes:
+            out += _KEYFRAME.pack(*keyframe)
+        for mask, length in zip(self.masks, self.lengths):
+            out.append(mask)
+            _write_varint(out, length)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if len(data) < _HEADER.size:
+            raise ReplayError("file too short for a replay header")
+        magic, version, start_state, seed, tick_count, interval, keyframe_count, run_count = \
+            _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+
+        replay = cls(seed, start_state, interval)
+        pos = _HEADER.size
+        for _ in range(keyframe_count):
+            keyframe = _KEYFRAME.unpack_from(data, pos)
+            replay.keyframes.append(keyframe)
+            replay._keyframe_ticks.append(keyframe[0])
+            pos += _KEYFRAME.size
+        for _ in range(run_count):
+            if pos >= len(data):
+                raise ReplayError("truncated run list")
+            replay.masks.append(data[pos])
+            length, pos = _read_varint(data, pos + 1)
+            replay.lengths.append(length)
+        replay.tick_count = tick_count
+        if sum(replay.lengths) != tick_count:
+            raise ReplayError("run lengths do not match the tick count")
+        return replay
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    """Replayの入力を1ティックずつ返し、キーフレームからのシークを行う
+
+    step:    ゲームを1ティック進める関数（入力はnext_maskから取得すること）
+    reset:   ゲームを記録開始時の状態へ戻す関数（Rngの再シードはプレイヤーが行う）
+    capture: ゲーム状態を取り出す関数（省略時はシークのたびに先頭から再生し直す）
+    restore: captureで取り出した状態へ戻す関数
+    """
+
+    def __init__(self, replay: Replay, step=None, reset=None, capture=None, restore=None):
+        self.replay: Replay = replay
+        self.step = step
+        self.reset = reset
+        self.capture = capture
+        self.restore = restore
+
+        self.tick: int = 0              # 次に返す入力のティック
+        self._run_index: int = 0
+        self._run_offset: int = 0
+        self._states: dict = {}         # tick -> (ゲーム状態, 乱数ストリームの状態)
+
+    @property
+    def finished(self) -> bool:
+        return self.tick >= self.replay.tick_count
+
+    def start(self):
+        """記録開始時の状態から再生を始める"""
+        Rng.seed_all(self.replay.seed)
+        if self.reset is not None:
+            self.reset()
+        self._jump(0)
+
+    def _jump(self, tick: int):
+        self.tick = tick
+        if tick < self.replay.tick_count:
+            self._run_index, self._run_offset = self.replay.locate(tick)
+
+    def next_mask(self) -> int:
+        """次のティックの入力を返して1ティック進める（再生終了後は0）"""
+        tick = self.tick
+        replay = self.replay
+        if tick >= replay.tick_count:
+            return 0
+
+        # キーフレームのティックでは、このティックを進める前の状態を保持する
+        if self.capture is not None and tick % replay.keyframe_interval == 0 and tick not in self._states:
+            self._states[tick] = (self.capture(), Rng.get_states())
+
+        mask = replay.masks[self._run_index]
+        self._run_offset += 1
+        if self._run_offset >= replay.lengths[self._run_index]:
+            self._run_index += 1
+            self._run_offset = 0
+        self.tick = tick + 1
+        return mask
+
+    def seek(self, tick: int):
+        """指定ティックの直前（tickティック進めた状態）まで移動する
+
+        保持しているキーフレームのうちtick以下で最も新しいものから再開し、
+        残りのティックだけstepで進める。
+        """
+        tick = max(0, min(tick, self.replay.tick_count))
+        base = max((t for t in self._states if t <= tick), default=None)
+
+        # 目標が現在位置より前、または現在位置より先のキーフレームがあればそこへ戻す
+        # （それ以外は現在位置から進めた方が近い）
+        if tick < self.tick or (base is not None and base > self.tick):
+            if base is None:
+                self.start()
+            else:
+                state, rng_states = self._states[base]
+                self.restore(state)
+                Rng.set_states(rng_states)
+                self._jump(base)
+
+        while self.tick < tick:
+            self.step()
@@ -0,0 +1,62 @@
+# Random Streams
+# サブシステムごとの乱数ストリーム
+# 各サブシステムは名前付きのrandom.Randomを1つずつ持ち、グローバルなrandomモジュールは使わない。
+# ストリームの種は (ベースシード, 名前) から決まるので、あるサブシステムの乱数の消費量が
+# 変わっても他のサブシステムの乱数列はずれない（リプレイの再現性を保つ）。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import random
+
+# ストリーム名
+ENEMY = "enemy"             # 敵の射撃タイマー・射撃判定
+ATTACK = "attack"           # 攻撃する敵の選択
+WAVE = "wave"               # ウェーブの登場位置
+EXPLOSION = "explosion"     # 爆発パーティクル
+STARS = "stars"             # 背景の星
+FX = "fx"                   # カメラシェイクなど描画専用の演出
+
+_base_seed: int = 0
+_streams: dict = {}
+
+
+def _derive_seed(base_seed: int, name: str) -> str:
+    # 文字列の種はハッシュで整数化される（プロセスやPYTHONHASHSEEDに依存しない）
+    return f"{base_seed}:{name}"
+
+
+def stream(name: str) -> random.Random:
+    """名前付きストリームを返す（無ければ現在のベースシードで作る）
+
+    返すオブジェクトはseed_allで作り直さないので、モジュール読み込み時に取得して保持してよい。
+    """
+    rng = _streams.get(name)
+    if rng is None:
+        rng = _streams[name] = random.Random(_derive_seed(_base_seed, name))
+    return rng
+
+
+def seed_all(base_seed: int):
+    """全ストリームをベースシードから決まる種で初期化し直す"""
+    global _base_seed
+    _base_seed = base_seed
+    for name, rng in _streams.items():
+        rng.seed(_derive_seed(base_seed, name))
+
+
+def base_seed() -> int:
+    return _base_seed
+
+
+def get_states() -> dict:
+    """全ストリームの内部状態（{名前: random.getstate()}）"""
+    return {name: rng.getstate() for name, rng in _streams.items()}
+
+
+def set_states(states: dict):
+    """get_statesで取得した状態に戻す"""
+    for name, state in states.items():
+        stream(name).setstate(state)
@@ -0,0 +1,197 @@
+# Snapshot
+# ゲーム全体の状態（GameStateのグローバル変数、敵・弾・爆発、隊列、ウェーブ、プレイヤー、星、乱数ストリーム）を
+# 組み込み型だけのタプルに取り出し、marshalでバイト列にする。restoreで同じ状態へ戻せる。
+#
+# 状態はサブシステムごとのセクションに分けて保持する。RewindBufferは直前のスナップショットの
+# 同じセクションをzlibのプリセット辞書にして圧縮するため、変化の少ないセクションはほぼ数バイトになる
+# （変化の無いセクションは圧縮もせずにNoneで表す）。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import marshal
+import zlib
+from collections import deque
+
+import Common
+import GameState
+import Rng
+from Enemy import formation_manager
+from WaveDirector import wave_director
+
+# スナップショットに含めるGameStateのグローバル変数
+GAME_STATE_VARS = (
+    "GameState", "GameStateSub", "CURRENT_STAGE", "ShakeTimer", "StopTimer", "GameTimer",
+    "HighScore", "Score", "enemy_move_direction", "enemy_group_x", "attack_selection_timer",
+    "EnemyHits", "EnemyKills", "PlayerHits",
+)
+
+# セクションの並び（capture_sectionsの戻り値の順序）
+SECTIONS = ("game_state", "rng", "entities", "formation", "waves", "explosions", "player", "stars")
+
+
+def capture_sections(app) -> tuple:
+    """現在の状態をセクションごとのバイト列のタプルとして取り出す"""
+    dumps = marshal.dumps
+    return (
+        dumps(tuple(getattr(GameState, name) for name in GAME_STATE_VARS)),
+        dumps(Rng.get_states()),
+        dumps(Common.registry.snapshot()),
+        dumps(formation_manager.snapshot()),
+        dumps(wave_director.snapshot()),
+        dumps(Common.explode_manager.snapshot()),
+        dumps(app.player.snapshot()),
+        dumps(app.star_manager.snapshot()),
+    )
+
+
+def restore_sections(app, sections: tuple):
+    """capture_sectionsで取り出した状態へ戻す"""
+    loads = marshal.loads
+    game_state, rng, entities, formation, waves, explosions, player, stars = sections
+    for name, value in zip(GAME_STATE_VARS, loads(game_state)):
+        setattr(GameState, name, value)
+    Rng.set_states(loads(rng))
+    Common.registry.restore(loads(entities))
+    formation_manager.restore(loads(formation))
+    wave_director.restore(loads(waves))
+    Common.explode_manager.restore(loads(explosions))
+    app.player.restore(loads(player))
+    app.star_manager.restore(loads(stars))
+
+
+def capture(app) -> bytes:
+    """現在の状態を1つのバイト列にする"""
+    return marshal.dumps(capture_sections(app))
+
+
+def restore(app, data: bytes):
+    """captureのバイト列の状態へ戻す"""
+    restore_sections(app, marshal.loads(data))
+
+
+def _packed_size(packed: tuple) -> int:
+    return sum(len(section) for section in packed if section is not None)
+
+
+class RewindBuffer:
+    """直近のスナップショットを差分圧縮して保持するリングバッファ
+
+    keyframe_everyエントリごとに単独で展開できるキーフレームを置き、その間のエントリは
+    直前のエントリの同じセクションを辞書にして圧縮する。容量を超えたら最古のキーフレームから
+    次のキーフレームの直前までをまとめて捨てる（保持数は最大でcapacity + keyframe_every - 1）。
+    """
+
+    def __init__(self, capacity: int, keyframe_every: int = 30, level: int = 1):
+        self.capacity: int = capacity
+        self.keyframe_every: int = max(1, keyframe_every)
+        self.level: int = level
+        self.entries: deque = deque()   # (圧縮済みセクションのタプル, キーフレームか, タグ, 展開後のサイズ)
+        self._since_keyframe: int = 0
+        self._last_sections: tuple = None  # 末尾のエントリの展開済みセクション
+        self.raw_bytes: int = 0            # 保持中のエントリの展開後の合計サイズ（統計用）
+        self.stored_bytes: int = 0         # 保持中のエントリの圧縮後の合計サイズ（統計用）
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self._since_keyframe = 0
+        self._last_sections = None
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def push(self, sections: tuple, tag=None):
+        """スナップショット（capture_sectionsの戻り値）を末尾に追加する"""
+        level = self.level
+        is_keyframe = self._last_sections is None or self._since_keyframe >= self.keyframe_every
+        if is_keyframe:
+            packed = tuple(zlib.compress(section, level) for section in sections)
+            self._since_keyframe = 1
+        else:
+            packed = []
+            for section, previous in zip(sections, self._last_sections):
+                if section == previous:
+                    packed.append(None)
+                    continue
+                # 窓は直前のセクション全体に届く最小の大きさにする（小さいセクションの圧縮器の初期化を軽くする）
+                window_bits = min(15, max(9, len(previous).bit_length() + 1))
+                compressor = zlib.compressobj(level, zlib.DEFLATED, window_bits, 4, zdict=previous)
+                packed.append(compressor.compress(section) + compressor.flush())
+            packed = tuple(packed)
+            self._since_keyframe += 1
+
+        raw_size = sum(len(section) for section in sections)
+        self.entries.append((packed, is_keyframe, tag, raw_size))
+        self._last_sections = sections
+        self.raw_bytes += raw_size
+        self.stored_bytes += _packed_size(packed)
+
+        # 容量超過: 2番目のキーフレームが来ていれば、最古のキーフレームからその直前までを捨てる
+        entries = self.entries
+        while len(entries) > self.capacity:
+            drop = 1
+            while drop < len(entries) and not entries[drop][1]:
+                drop += 1
+            if drop >= len(entries) or len(entries) - drop < self.capacity:
+                break
+            for _ in range(drop):
+                packed, _is_keyframe, _tag, raw_size = entries.popleft()
+                self.raw_bytes -= raw_size
+                self.stored_bytes -= _packed_size(packed)
+
+    @staticmethod
+    def _unpack(packed: tuple, previous: tuple) -> tuple:
+        if previous is None:
+            return tuple(zlib.decompress(section) for section in packed)
+        sections = []
+        for section, dictionary in zip(packed, previous):
+            if section is None:
+                sections.append(dictionary)
+                continue
+            decompressor = zlib.decompressobj(zdict=dictionary)
+            sections.append(decompressor.decompress(section) + decompressor.flush())
+        return tuple(sections)
+
+    def _expand(self, index: int) -> tuple:
+        """index番目のエントリを、直前のキーフレームから順に展開して返す"""
+        entries = self.entries
+        start = index
+        while not entries[start][1]:
+            start -= 1
+        sections = None
+        for i in range(start, index + 1):
+            packed, is_keyframe = entries[i][:2]
+            sections = self._unpack(packed, None if is_keyframe else sections)
+        return sections
+
+    def peek(self, back: int = 0):
+        """末尾からback個前のエントリを(セクション, タグ)で返す（取り除かない）"""
+        index = len(self.entries) - 1 - back
+        if index < 0:
+            return None
+        return self._expand(index), self.entries[index][2]
+
+    def pop(self):
+        """末尾のエントリを取り除いて(セクション, タグ)で返す（巻き戻し用）"""
+        entries = self.entries
+        if not entries:
+            return None
+        sections = self._last_sections
+        packed, _is_keyframe, tag, raw_size = entries.pop()
+        self.raw_bytes -= raw_size
+        self.stored_bytes -= _packed_size(packed)
+
+        # 新しい末尾のエントリを次のpushの差分の基準にする
+        if entries:
+            self._last_sections = self._expand(len(entries) - 1)
+            self._since_keyframe = 1
+            while not entries[len(entries) - self._since_keyframe][1]:
+                self._since_keyframe += 1
+        else:
+            self._last_sections = None
+            self._since_keyframe = 0
+        return sections, tag
@@ -0,0 +1,72 @@
+# Spatial Hash
+# 当たり判定のブロードフェーズ用の一様グリッド（空間ハッシュ）
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+# セル座標(cx, cy)を1つの整数キーにまとめるためのストライド
+# （画面外に出た敵も扱えるよう、負のセル座標もそのまま使える）
+_ROW_STRIDE = 1 << 16
+
+_EMPTY = ()
+
+
+class SpatialHash:
+    """一様グリッドによるブロードフェーズ
+
+    エンティティはリスト内のインデックスで登録する。
+    queryは候補のインデックスを昇順で返すので、呼び出し側はリスト順の
+    総当たりと同じ順序で詳細判定（AABB）を行える。
+    """
+
+    def __init__(self, cell_size: int = 16):
+        self.cell_size: int = cell_size
+        self.cells: dict = {}  # セルキー -> インデックスのリスト（昇順）
+
+    def clear(self):
+        """登録を全て破棄する"""
+        self.cells.clear()
+
+    def insert(self, index: int, x: float, y: float, w: float, h: float):
+        """矩形(x, y, w, h)が重なる全セルにインデックスを登録する
+
+        インデックスは昇順で登録すること（各セル内の並びがそのまま昇順になる）
+        """
+        cs = self.cell_size
+        cells = self.cells
+        x0 = int(x // cs)
+        x1 = int((x + w) // cs)
+        y0 = int(y // cs)
+        y1 = int((y + h) // cs)
+        for cy in range(y0, y1 + 1):
+            row_key = cy * _ROW_STRIDE
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get(row_key + cx)
+                if bucket is None:
+                    cells[row_key + cx] = [index]
+                else:
+                    bucket.append(index)
+
+    def query(self, x: float, y: float, w: float, h: float):
+        """矩形(x, y, w, h)と同じセルに登録されている候補インデックスを昇順で返す"""
+        cs = self.cell_size
+        cells = self.cells
+        x0 = int(x // cs)
+        x1 = int((x + w) // cs)
+        y0 = int(y // cs)
+        y1 = int((y + h) // cs)
+
+        # 1セルのみの場合はバケットをそのまま返す（既に昇順）
+        if x0 == x1 and y0 == y1:
+            return cells.get(y0 * _ROW_STRIDE + x0, _EMPTY)
+
+        found = set()
+        for cy in range(y0, y1 + 1):
+            row_key = cy * _ROW_STRIDE
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get(row_key + cx)
+                if bucket is not None:
+                    found.update(bucket)
+        return sorted(found)
@@ -0,0 +1,160 @@
+# Sprite Atlas
+# sprites.json から自動生成（python SpriteManager.py）。直接編集しないこと
+
+ATLAS_VERSION = 2
+SOURCE_HASH = 'f026fd17-4880'
+
+SPRITES = {'8_0': {'x': 8, 'y': 0, 'NAME': 'PLAYER', 'ACT_NAME': 'TOP'},
+ '16_0': {'x': 16, 'y': 0, 'NAME': 'PLAYER', 'ACT_NAME': 'LEFT'},
+ '24_0': {'x': 24, 'y': 0, 'NAME': 'PLAYER', 'ACT_NAME': 'RIGHT'},
+ '40_0': {'x': 40, 'y': 0, 'NAME': 'PBULLET', 'ACT_NAME': 'NO_ACT', 'FRAME_NUM': '0', 'ANIM_SPD': '20'},
+ '48_0': {'x': 48, 'y': 0, 'NAME': 'PBULLET', 'ACT_NAME': 'NO_ACT', 'FRAME_NUM': '1', 'ANIM_SPD': '25'},
+ '56_0': {'x': 56, 'y': 0, 'NAME': 'EXHST', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '10'},
+ '64_0': {'x': 64, 'y': 0, 'NAME': 'EXHST', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '1', 'ANIM_SPD': '10'},
+ '72_0': {'x': 72, 'y': 0, 'NAME': 'EXHST', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '10'},
+ '80_0': {'x': 80, 'y': 0, 'NAME': 'EXHST', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '3', 'ANIM_SPD': '10'},
+ '88_0': {'x': 88, 'y': 0, 'NAME': 'MZLFLSH', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '1'},
+ '96_0': {'x': 96, 'y': 0, 'NAME': 'MZLFLSH', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '1', 'ANIM_SPD': '1'},
+ '104_0': {'x': 104, 'y': 0, 'NAME': 'MZLFLSH', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '1'},
+ '120_0': {'x': 120, 'y': 0, 'NAME': 'ENMYBLT', 'ACT_NAME': 'UNDEF'},
+ '8_8': {'x': 8, 'y': 8, 'NAME': 'ENEMY01', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '10'},
+ '16_8': {'x': 16, 'y': 8, 'NAME': 'ENEMY01', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '1', 'ANIM_SPD': '10'},
+ '24_8': {'x': 24, 'y': 8, 'NAME': 'ENEMY01', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '10'},
+ '32_8': {'x': 32, 'y': 8, 'NAME': 'ENEMY01', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '3', 'ANIM_SPD': '10'},
+ '40_8': {'x': 40, 'y': 8, 'NAME': 'ENEMY02', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '12'},
+ '48_8': {'x': 48, 'y': 8, 'NAME': 'ENEMY02', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '1', 'ANIM_SPD': '12'},
+ '56_8': {'x': 56, 'y': 8, 'NAME': 'ENEMY02', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '12'},
+ '64_8': {'x': 64, 'y': 8, 'NAME': 'ENEMY02', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '3', 'ANIM_SPD': '12'},
+ '72_8': {'x': 72, 'y': 8, 'NAME': 'ENEMY03', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '8'},
+ '80_8': {'x': 80, 'y': 8, 'NAME': 'ENEMY03', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '1', 'ANIM_SPD': '8'},
+ '88_8': {'x': 88, 'y': 8, 'NAME': 'ENEMY03', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '8'},
+ '96_8': {'x': 96, 'y': 8, 'NAME': 'ENEMY03', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '3', 'ANIM_SPD': '8'},
+ '104_8': {'x': 104, 'y': 8, 'NAME': 'ENEMY04', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '15'},
+ '112_8': {'x': 112, 'y': 8, 'NAME': 'ENEMY04', 'ACT_NAME': 'NO_ACT', 'FRAME_NUM': '1', 'ANIM_SPD': '15'},
+ '120_8': {'x': 120, 'y': 8, 'NAME': 'ENEMY04', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '15'},
+ '128_8': {'x': 128, 'y': 8, 'NAME': 'ENEMY04', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '3', 'ANIM_SPD': '15'},
+ '136_8': {'x': 136, 'y': 8, 'NAME': 'ENEMY05', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '0', 'ANIM_SPD': '6'},
+ '144_8': {'x': 144, 'y': 8, 'NAME': 'ENEMY05', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '1', 'ANIM_SPD': '6'},
+ '152_8': {'x': 152, 'y': 8, 'NAME': 'ENEMY05', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '2', 'ANIM_SPD': '6'},
+ '160_8': {'x': 160, 'y': 8, 'NAME': 'ENEMY05', 'ACT_NAME': 'UNDEF', 'FRAME_NUM': '3', 'ANIM_SPD': '6'}}
+
+FIELD_INDEX = {('PLAYER', 'NAME', 'PLAYER'): (8, 0),
+ ('PLAYER', 'ACT_NAME', 'TOP'): (8, 0),
+ ('PLAYER', 'ACT_NAME', 'LEFT'): (16, 0),
+ ('PLAYER', 'ACT_NAME', 'RIGHT'): (24, 0),
+ ('PBULLET', 'NAME', 'PBULLET'): (40, 0),
+ ('PBULLET', 'ACT_NAME', 'NO_ACT'): (40, 0),
+ ('PBULLET', 'FRAME_NUM', '0'): (40, 0),
+ ('PBULLET', 'ANIM_SPD', '20'): (40, 0),
+ ('PBULLET', 'FRAME_NUM', '1'): (48, 0),
+ ('PBULLET', 'ANIM_SPD', '25'): (48, 0),
+ ('EXHST', 'NAME', 'EXHST'): (56, 0),
+ ('EXHST', 'ACT_NAME', 'UNDEF'): (56, 0),
+ ('EXHST', 'FRAME_NUM', '0'): (56, 0),
+ ('EXHST', 'ANIM_SPD', '10'): (56, 0),
+ ('EXHST', 'FRAME_NUM', '1'): (64, 0),
+ ('EXHST', 'FRAME_NUM', '2'): (72, 0),
+ ('EXHST', 'FRAME_NUM', '3'): (80, 0),
+ ('MZLFLSH', 'NAME', 'MZLFLSH'): (88, 0),
+ ('MZLFLSH', 'ACT_NAME', 'UNDEF'): (88, 0),
+ ('MZLFLSH', 'FRAME_NUM', '0'): (88, 0),
+ ('MZLFLSH', 'ANIM_SPD', '1'): (88, 0),
+ ('MZLFLSH', 'FRAME_NUM', '1'): (96, 0),
+ ('MZLFLSH', 'FRAME_NUM', '2'): (104, 0),
+ ('ENMYBLT', 'NAME', 'ENMYBLT'): (120, 0),
+ ('ENMYBLT', 'ACT_NAME', 'UNDEF'): (120, 0),
+ ('ENEMY01', 'NAME', 'ENEMY01'): (8, 8),
+ ('ENEMY01', 'ACT_NAME', 'UNDEF'): (8, 8),
+ ('ENEMY01', 'FRAME_NUM', '0'): (8, 8),
+ ('ENEMY01', 'ANIM_SPD', '10'): (8, 8),
+ ('ENEMY01', 'FRAME_NUM', '1'): (16, 8),
+ ('ENEMY01', 'FRAME_NUM', '2'): (24, 8),
+ ('ENEMY01', 'FRAME_NUM', '3'): (32, 8),
+ ('ENEMY02', 'NAME', 'ENEMY02'): (40, 8),
+ ('ENEMY02', 'ACT_NAME', 'UNDEF'): (40, 8),
+ ('ENEMY02', 'FRAME_NUM', '0'): (40, 8),
+ ('ENEMY02', 'ANIM_SPD', '12'): (40, 8),
+ ('ENEMY02', 'FRAME_NUM', '1'): (48, 8),
+ ('ENEMY02', 'FRAME_NUM', '2'): (56, 8),
+ ('ENEMY02', 'FRAME_NUM', '3'): (64, 8),
+ ('ENEMY03', 'NAME', 'ENEMY03'): (72, 8),
+ ('ENEMY03', 'ACT_NAME', 'UNDEF'): (72, 8),
+ ('ENEMY03', 'FRAME_NUM', '0'): (72, 8),
+ ('ENEMY03', 'ANIM_SPD', '8'): (72, 8),
+ ('ENEMY03', 'FRAME_NUM', '1'): (80, 8),
+ ('ENEMY03', 'FRAME_NUM', '2'): (88, 8),
+ ('ENEMY03', 'FRAME_NUM', '3'): (96, 8),
+ ('ENEMY04', 'NAME', 'ENEMY04'): (104, 8),
+ ('ENEMY04', 'ACT_NAME', 'UNDEF'): (104, 8),
+ ('ENEMY04', 'FRAME_NUM', '0'): (104, 8),
+ ('ENEMY04', 'ANIM_SPD', '15'): (104, 8),
+ ('ENEMY04', 'ACT_NAME', 'NO_ACT'): (112, 8),
+ ('ENEMY04', 'FRAME_NUM', '1'): (112, 8),
+ ('ENEMY04', 'FRAME_NUM', '2'): (120, 8),
+ ('ENEMY04', 'FRAME_NUM', '3'): (128, 8),
+ ('ENEMY05', 'NAME', 'ENEMY05'): (136, 8),
+ ('ENEMY05', 'ACT_NAME', 'UNDEF'): (136, 8),
+ ('ENEMY05', 'FRAME_NUM', '0'): (136, 8),
+ ('ENEMY05', 'ANIM_SPD', '6'): (136, 8),
+ ('ENEMY05', 'FRAME_NUM', '1'): (144, 8),
+ ('ENEMY05', 'FRAME_NUM', '2'): (152, 8),
+ ('ENEMY05', 'FRAME_NUM', '3'): (160, 8)}
+
+NAME_INDEX = {'PLAYER': (8, 0),
+ 'PBULLET': (40, 0),
+ 'EXHST': (56, 0),
+ 'MZLFLSH': (88, 0),
+ 'ENMYBLT': (120, 0),
+ 'ENEMY01': (8, 8),
+ 'ENEMY02': (40, 8),
+ 'ENEMY03': (72, 8),
+ 'ENEMY04': (104, 8),
+ 'ENEMY05': (136, 8)}
+
+METADATA_INDEX = {('PLAYER', 'NAME'): 'PLAYER',
+ ('PLAYER', 'ACT_NAME'): 'TOP',
+ ('PBULLET', 'NAME'): 'PBULLET',
+ ('PBULLET', 'ACT_NAME'): 'NO_ACT',
+ ('PBULLET', 'FRAME_NUM'): '0',
+ ('PBULLET', 'ANIM_SPD'): '20',
+ ('EXHST', 'NAME'): 'EXHST',
+ ('EXHST', 'ACT_NAME'): 'UNDEF',
+ ('EXHST', 'FRAME_NUM'): '0',
+ ('EXHST', 'ANIM_SPD'): '10',
+ ('MZLFLSH', 'NAME'): 'MZLFLSH',
+ ('MZLFLSH', 'ACT_NAME'): 'UNDEF',
+ ('MZLFLSH', 'FRAME_NUM'): '0',
+ ('MZLFLSH', 'ANIM_SPD'): '1',
+ ('ENMYBLT', 'NAME'): 'ENMYBLT',
+ ('ENMYBLT', 'ACT_NAME'): 'UNDEF',
+ ('ENEMY01', 'NAME'): 'ENEMY01',
+ ('ENEMY01', 'ACT_NAME'): 'UNDEF',
+ ('ENEMY01', 'FRAME_NUM'): '0',
+ ('ENEMY01', 'ANIM_SPD'): '10',
+ ('ENEMY02', 'NAME'): 'ENEMY02',
+ ('ENEMY02', 'ACT_NAME'): 'UNDEF',
+ ('ENEMY02', 'FRAME_NUM'): '0',
+ ('ENEMY02', 'ANIM_SPD'): '12',
+ ('ENEMY03', 'NAME'): 'ENEMY03',
+ ('ENEMY03', 'ACT_NAME'): 'UNDEF',
+ ('ENEMY03', 'FRAME_NUM'): '0',
+ ('ENEMY03', 'ANIM_SPD'): '8',
+ ('ENEMY04', 'NAME'): 'ENEMY04',
+ ('ENEMY04', 'ACT_NAME'): 'UNDEF',
+ ('ENEMY04', 'FRAME_NUM'): '0',
+ ('ENEMY04', 'ANIM_SPD'): '15',
+ ('ENEMY05', 'NAME'): 'ENEMY05',
+ ('ENEMY05', 'ACT_NAME'): 'UNDEF',
+ ('ENEMY05', 'FRAME_NUM'): '0',
+ ('ENEMY05', 'ANIM_SPD'): '6'}
+
+FRAME_INDEX = {'PBULLET': ((40, 0), (48, 0)),
+ 'EXHST': ((56, 0), (64, 0), (72, 0), (80, 0)),
+ 'MZLFLSH': ((88, 0), (96, 0), (104, 0)),
+ 'ENEMY01': ((8, 8), (16, 8), (24, 8), (32, 8)),
+ 'ENEMY02': ((40, 8), (48, 8), (56, 8), (64, 8)),
+ 'ENEMY03': ((72, 8), (80, 8), (88, 8), (96, 8)),
+ 'ENEMY04': ((104, 8), (112, 8), (120, 8), (128, 8)),
+ 'ENEMY05': ((136, 8), (144, 8), (152, 8), (160, 8))}
+
+ANIM_SPEEDS = {'PBULLET': 20, 'EXHST': 10, 'MZLFLSH': 1, 'ENEMY01': 10, 'ENEMY02': 12, 'ENEMY03': 8, 'ENEMY04': 15, 'ENEMY05': 6}
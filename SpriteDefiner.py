@@ -557,6 +557,11 @@ class SpriteDefiner:
         try:
             with open("sprites.json", "w", encoding="utf-8") as f:
                 json.dump(sprite_data, f, indent=2, ensure_ascii=False)
+
+            # :jp ゲームが読み込むコンパイル済みアトラスも作り直す
+            # :en Rebuild the compiled atlas that the game loads
+            from SpriteManager import build_atlas
+            build_atlas("sprites.json")
             
             # 状況に応じて異なるメッセージを表示
             if self.app_state == AppState.EDIT:
@@ -1,5 +1,10 @@
 # Sprite Management
 # Handles sprite definitions and sprite-related utilities
+# sprites.jsonは文字列だけで書かれているため、ビルド時に検索用の索引（フレーム列・整数化したアニメーション速度など）を
+# 生成モジュールSpriteAtlas.pyへコンパイルしておき、起動時はそれを読み込む。
+# SpriteAtlas.pyに記録したsprites.jsonのハッシュが現在の内容と違う（古い）場合だけJSONを解析する。
+# 読み込みは最初に参照されたときに行う（importしただけではファイルを読まない）。
+#   ビルド: python SpriteManager.py
 
 #ソースコードの中のコメントは日本語にしましょう
 # #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
@@ -8,12 +13,27 @@
 
 from collections import namedtuple
 import Config
-import json
+import importlib
 import os
+import zlib
+from DebugLog import logger, LogCategory
 
 # Sprite Location Definition
 SpIdx = namedtuple("SprIdx", ["x", "y"])
 
+# 見つからない場合に返すNULLスプライト（共有インスタンス）
+NULL_SPRITE = SpIdx(0, 0)
+
+# インデックス対象外のフィールド（座標）
+_NON_INDEXED_FIELDS = ("x", "y")
+
+# 整数として扱うフィールド（JSONでは文字列で保存されている）
+_INT_FIELDS = ("FRAME_NUM", "ANIM_SPD")
+
+ATLAS_MODULE = "SpriteAtlas"
+# 生成モジュールの形式を変えたら上げる（古い形式のアトラスは読み込まない）
+ATLAS_VERSION = 2
+
 # Legacy Sprite Dictionary - 8x8 sprites (for backward compatibility)
 # TODO: Remove this once all references are migrated to JSON
 # SprList = {
@@ -68,17 +88,166 @@ SpIdx = namedtuple("SprIdx", ["x", "y"])
 # Legacy constants removed - no longer needed with JSON-driven system
 
 
+def _to_int(value):
+    """JSONの文字列フィールドを整数にする（変換できなければNone）"""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def source_hash(data: bytes) -> str:
+    """sprites.jsonの内容のハッシュ（アトラスが古いかどうかの判定用）"""
+    return f"{zlib.crc32(data):08x}-{len(data)}"
+
+
+def compile_sprites(json_sprites: dict) -> dict:
+    """スプライト定義から検索用の索引を組み込み型だけで構築する
+
+    同じキーが複数ある場合は、線形探索時と同じくJSON内で最初に定義されたスプライトを採用する。
+    座標は(x, y)タプルで持ち、SpriteManager側でSpIdxへ変換する。
+
+    Returns:
+        field_index:    (NAME, field, 値) -> (x, y)   値はJSONの文字列のまま
+        name_index:     NAME -> 最初に定義された(x, y)
+        metadata_index: (NAME, field) -> 最初に見つかった値（JSONの文字列のまま）
+        frame_index:    NAME -> FRAME_NUM順の(x, y)タプル
+        anim_speeds:    NAME -> 最初に見つかったANIM_SPD（整数）
+    """
+    field_index = {}
+    name_index = {}
+    metadata_index = {}
+    anim_speeds = {}
+    frames = {}  # NAME -> [(frame_num, 定義順, (x, y)), ...]
+
+    for order, sprite in enumerate(json_sprites.values()):
+        name = sprite.get("NAME")
+        position = (sprite["x"], sprite["y"])
+
+        name_index.setdefault(name, position)
+        for field_name, field_value in sprite.items():
+            if field_name in _NON_INDEXED_FIELDS or field_name == "tags":
+                continue
+            field_index.setdefault((name, field_name, field_value), position)
+            if field_value is not None:
+                metadata_index.setdefault((name, field_name), field_value)
+
+        frame_num = _to_int(sprite.get("FRAME_NUM"))
+        if frame_num is not None:
+            frames.setdefault(name, []).append((frame_num, order, position))
+        anim_speed = _to_int(sprite.get("ANIM_SPD"))
+        if anim_speed is not None:
+            anim_speeds.setdefault(name, anim_speed)
+
+    return {
+        "field_index": field_index,
+        "name_index": name_index,
+        "metadata_index": metadata_index,
+        "frame_index": {name: tuple(position for _, _, position in sorted(entries))
+                        for name, entries in frames.items()},
+        "anim_speeds": anim_speeds,
+    }
+
+
+def _format(value) -> str:
+    # 差分が読みやすいよう、定義順のまま複数行に整形する（ビルド時だけ使うのでここでimportする）
+    import pprint
+    return pprint.pformat(value, width=120, sort_dicts=False)
+
+
+def build_atlas(json_path: str = Config.SPRITES_JSON_FILE, atlas_path: str = Config.SPRITE_ATLAS_FILE) -> int:
+    """sprites.jsonをコンパイルしてアトラスモジュールを書き出す
+
+    Returns:
+        コンパイルしたスプライトの数
+    """
+    import json
+    with open(json_path, "rb") as f:
+        data = f.read()
+    json_sprites = json.loads(data.decode("utf-8")).get("sprites", {})
+    compiled = compile_sprites(json_sprites)
+
+    lines = [
+        "# Sprite Atlas",
+        f"# {os.path.basename(json_path)} から自動生成（python SpriteManager.py）。直接編集しないこと",
+        "",
+        f"ATLAS_VERSION = {ATLAS_VERSION}",
+        f"SOURCE_HASH = {source_hash(data)!r}",
+        "",
+        f"SPRITES = {_format(json_sprites)}",
+        "",
+    ]
+    for key, value in compiled.items():
+        lines.append(f"{key.upper()} = {_format(value)}")
+        lines.append("")
+    with open(atlas_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return len(json_sprites)
+
+
 # JSON-based Sprite Management
 class SpriteManager:
     """JSON-based sprite management system."""
     
     def __init__(self):
-        self.json_sprites = {}  # sprites.jsonから読み込んだデータ
-        self.json_file_path = "sprites.json"
-        self.load_sprites_json()
-    
+        self.json_sprites = {}  # sprites.json（またはアトラス）から読み込んだデータ
+        self.json_file_path = Config.SPRITES_JSON_FILE
+        self.source = None      # 読み込み元（"atlas" / "json"）。Noneなら未読み込み
+
+        # ロード時に構築するルックアップインデックス
+        self._field_index = {}      # (NAME, field, value) -> SpIdx
+        self._frame_index = {}      # NAME -> FRAME_NUM順のSpIdxタプル
+        self._name_index = {}       # NAME -> 最初に定義されたSpIdx
+        self._metadata_index = {}   # (NAME, field) -> 最初に見つかった値
+        self._anim_speeds = {}      # NAME -> ANIM_SPD（整数）
+
+    def _ensure_loaded(self):
+        """最初の参照時にスプライト定義を読み込む"""
+        if self.source is None:
+            self.load_sprites()
+
+    def load_sprites(self):
+        """コンパイル済みのアトラスを読み込む（無い・古い場合はsprites.jsonを解析する）"""
+        atlas = self._load_atlas()
+        if atlas is None:
+            self.load_sprites_json()
+            return
+        self.json_sprites = atlas.SPRITES
+        self._apply_index({
+            "field_index": atlas.FIELD_INDEX,
+            "name_index": atlas.NAME_INDEX,
+            "metadata_index": atlas.METADATA_INDEX,
+            "frame_index": atlas.FRAME_INDEX,
+            "anim_speeds": atlas.ANIM_SPEEDS,
+        })
+        self.source = "atlas"
+        logger.info(LogCategory.SPRITE, "[SpriteManager] Loaded %d sprites from atlas", len(self.json_sprites))
+
+    def _load_atlas(self):
+        """SpriteAtlasモジュールを返す（無い、形式が違う、sprites.jsonと内容が合わない場合はNone）"""
+        try:
+            atlas = importlib.import_module(ATLAS_MODULE)
+        except ImportError:
+            return None
+        if getattr(atlas, "ATLAS_VERSION", None) != ATLAS_VERSION:
+            logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: %s has an old format, loading JSON",
+                           ATLAS_MODULE)
+            return None
+
+        # JSONが無い場合はアトラスだけで動かす
+        if os.path.exists(self.json_file_path):
+            with open(self.json_file_path, "rb") as f:
+                current_hash = source_hash(f.read())
+            if current_hash != atlas.SOURCE_HASH:
+                logger.warning(LogCategory.SPRITE,
+                               "[SpriteManager] Warning: %s is stale, loading JSON (run python SpriteManager.py)",
+                               ATLAS_MODULE)
+                return None
+        return atlas
+
     def load_sprites_json(self):
         """sprites.jsonファイルを読み込み、スプライトデータを初期化する。"""
+        import json
         try:
             if os.path.exists(self.json_file_path):
                 with open(self.json_file_path, "r", encoding="utf-8") as f:
@@ -87,16 +256,43 @@ class SpriteManager:
                 # スプライトデータを取得
                 if "sprites" in sprite_data:
                     self.json_sprites = sprite_data["sprites"]
-                    print(f"[SpriteManager] Loaded {len(self.json_sprites)} sprites from JSON")
+                    logger.info(LogCategory.SPRITE, "[SpriteManager] Loaded %d sprites from JSON", len(self.json_sprites))
                 else:
-                    print("[SpriteManager] Warning: No 'sprites' key found in JSON")
+                    logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: No 'sprites' key found in JSON")
                     self.json_sprites = {}
             else:
-                print(f"[SpriteManager] Warning: {self.json_file_path} not found, using fallback")
+                logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: %s not found, using fallback", self.json_file_path)
                 self.json_sprites = {}
         except (json.JSONDecodeError, FileNotFoundError, KeyError) as e:
-            print(f"[SpriteManager] Error loading sprites.json: {e}")
+            logger.error(LogCategory.SPRITE, "[SpriteManager] Error loading sprites.json: %s", e)
             self.json_sprites = {}
+
+        self._build_index()
+        self.source = "json"
+
+    def _build_index(self):
+        """json_spritesからO(1)参照用のインデックスを構築する。"""
+        self._apply_index(compile_sprites(self.json_sprites))
+
+    def _apply_index(self, compiled: dict):
+        """compile_spritesの結果（座標はタプル）をSpIdxの索引として設定する。
+
+        SpIdxは座標ごとに一度だけ生成して全ての索引で共有し、描画時には新規生成しない。
+        """
+        sprites = {}
+
+        def sp_idx(position):
+            sprite = sprites.get(position)
+            if sprite is None:
+                sprite = sprites[position] = SpIdx(*position)
+            return sprite
+
+        self._field_index = {key: sp_idx(position) for key, position in compiled["field_index"].items()}
+        self._name_index = {name: sp_idx(position) for name, position in compiled["name_index"].items()}
+        self._metadata_index = dict(compiled["metadata_index"])
+        self._frame_index = {name: tuple(sp_idx(position) for position in positions)
+                             for name, positions in compiled["frame_index"].items()}
+        self._anim_speeds = dict(compiled["anim_speeds"])
     
     def get_sprite_by_name_and_field(self, name, field_name, field_value):
         """名前と指定フィールドの値でスプライトを取得する汎用メソッド。
@@ -109,14 +305,44 @@ class SpriteManager:
         Returns:
             SpIdx: スプライトの座標 (x, y)
         """
-        for key, sprite in self.json_sprites.items():
-            if (sprite.get("NAME") == name and 
-                sprite.get(field_name) == field_value):
-                return SpIdx(sprite["x"], sprite["y"])
+        self._ensure_loaded()
+        sp_idx = self._field_index.get((name, field_name, field_value))
+        if sp_idx is not None:
+            return sp_idx
         
         # 見つからない場合はNULLを返す
-        print(f"[SpriteManager] Warning: Sprite '{name}' with {field_name}='{field_value}' not found")
-        return SpIdx(0, 0)  # NULL sprite fallback
+        logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: Sprite '%s' with %s='%s' not found", name, field_name, field_value)
+        return NULL_SPRITE  # NULL sprite fallback
+
+    def get_sprite_frames(self, name):
+        """指定された名前のアニメーションフレームをFRAME_NUM順で取得する。
+
+        Args:
+            name (str): スプライト名
+
+        Returns:
+            tuple: SpIdxのタプル（FRAME_NUMが無い場合はNULLスプライト1個）
+        """
+        self._ensure_loaded()
+        frames = self._frame_index.get(name)
+        if frames:
+            return frames
+
+        logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: No animation frames found for sprite '%s'", name)
+        return (NULL_SPRITE,)
+
+    def get_animation_speed(self, name, default_value: int) -> int:
+        """指定された名前のアニメーション速度（ANIM_SPD）を整数で取得する。
+
+        Args:
+            name (str): スプライト名
+            default_value (int): ANIM_SPDが無い（整数でない）場合の値
+
+        Returns:
+            int: アニメーション速度
+        """
+        self._ensure_loaded()
+        return self._anim_speeds.get(name, default_value)
     
     def get_sprite_by_name_and_tag(self, name, tag=None):
         """名前とタグでスプライトを取得する汎用メソッド。
@@ -128,14 +354,19 @@ class SpriteManager:
         Returns:
             SpIdx: スプライトの座標 (x, y)
         """
-        for key, sprite in self.json_sprites.items():
-            if sprite.get("NAME") == name:
-                if tag is None or tag in sprite.get("tags", []):
+        self._ensure_loaded()
+        if tag is None:
+            sp_idx = self._name_index.get(name)
+            if sp_idx is not None:
+                return sp_idx
+        else:
+            for key, sprite in self.json_sprites.items():
+                if sprite.get("NAME") == name and tag in sprite.get("tags", []):
                     return SpIdx(sprite["x"], sprite["y"])
         
         # 見つからない場合はNULLを返す
-        print(f"[SpriteManager] Warning: Sprite '{name}' with tag '{tag}' not found")
-        return SpIdx(0, 0)  # NULL sprite fallback
+        logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: Sprite '%s' with tag '%s' not found", name, tag)
+        return NULL_SPRITE  # NULL sprite fallback
     
     def get_sprite_group(self, name):
         """指定された名前のスプライトグループを全て取得する。
@@ -146,6 +377,7 @@ class SpriteManager:
         Returns:
             list: スプライトのリスト [sprite_data, ...]
         """
+        self._ensure_loaded()
         sprites = []
         for key, sprite in self.json_sprites.items():
             if sprite.get("NAME") == name:
@@ -163,16 +395,22 @@ class SpriteManager:
         Returns:
             取得した値またはデフォルト値
         """
-        for key, sprite in self.json_sprites.items():
-            if sprite.get("NAME") == name:
-                field_value = sprite.get(field_name)
-                if field_value is not None:
-                    return field_value
+        self._ensure_loaded()
+        field_value = self._metadata_index.get((name, field_name))
+        if field_value is not None:
+            return field_value
         
         if default_value is not None:
-            print(f"[SpriteManager] Warning: Field '{field_name}' not found for sprite '{name}', using default: {default_value}")
+            logger.warning(LogCategory.SPRITE, "[SpriteManager] Warning: Field '%s' not found for sprite '%s', using default: %s",
+                           field_name, name, default_value)
         return default_value
 
 
 # グローバルインスタンス
-sprite_manager = SpriteManager()
\ No newline at end of file
+sprite_manager = SpriteManager()
+
+
+if __name__ == "__main__":
+    # ビルドステップ: sprites.jsonをSpriteAtlas.pyへコンパイルする
+    count = build_atlas()
+    print(f"Compiled {count} sprites from {Config.SPRITES_JSON_FILE} into {Config.SPRITE_ATLAS_FILE}")
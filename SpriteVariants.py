@@ -0,0 +1,61 @@
+# Sprite Variants
+# ヒット時の白いシルエット・無敵中の黄色の点滅など、パレットを差し替えた版のスプライトを
+# 起動時に予備の画像バンク（Config.VARIANT_BANK）へ焼き込んでおく。
+# 描画側はpyxel.palを切り替えずに、バンクとv座標を変えてblt 1回で描ける。
+#
+# 配置: 元のスプライト(u, v)の各バリアントは VARIANT_BANK の (u, v + バリアントのオフセット)
+#   白（ヒット点滅）  : オフセット 0
+#   黄（無敵中の点滅）: オフセット 128
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import pyxel
+import Config
+from SpriteManager import sprite_manager
+
+# バリアントのv方向のオフセット（元のスプライトは画像バンクの上半分にあること）
+VARIANT_WHITE = 0
+VARIANT_YELLOW = 128
+
+# 各バリアントの塗り色（色0は透明色、色15は元の色のまま。従来のpal(1..14, 色)と同じ）
+_VARIANT_COLORS = (
+    (VARIANT_WHITE, pyxel.COLOR_WHITE),
+    (VARIANT_YELLOW, pyxel.COLOR_YELLOW),
+)
+_REMAPPED_COLORS = range(1, 15)
+
+
+class SpriteVariantCache:
+    """パレット差し替え版のスプライトを焼き込んだ画像バンク"""
+
+    def __init__(self, bank: int, source_bank: int = Config.TILE_BANK0):
+        self.bank: int = bank
+        self.source_bank: int = source_bank
+        self.baked: set = set()     # 焼き込み済みのスプライト名
+
+    def bake(self, names, size: int = Config.SPRITE_SIZE):
+        """指定した名前の全スプライト（全フレーム・全アクション）のバリアントを焼き込む"""
+        source = pyxel.images[self.source_bank]
+        target = pyxel.images[self.bank]
+        pget = source.pget
+        pset = target.pset
+        for name in names:
+            if name in self.baked:
+                continue
+            for sprite in sprite_manager.get_sprite_group(name):
+                u, v = sprite["x"], sprite["y"]
+                if v + size > VARIANT_YELLOW:
+                    raise ValueError(f"sprite {name} at ({u}, {v}) is outside the upper half of bank {self.source_bank}")
+                for y in range(v, v + size):
+                    for x in range(u, u + size):
+                        col = pget(x, y)
+                        for offset, variant_col in _VARIANT_COLORS:
+                            pset(x, y + offset, variant_col if col in _REMAPPED_COLORS else col)
+            self.baked.add(name)
+
+
+# グローバルインスタンス（create_appでリソース読み込み後にbakeする）
+sprite_variants = SpriteVariantCache(Config.VARIANT_BANK)
@@ -9,6 +9,7 @@
 
 import Config
 import GameState
+from DebugLog import logger, LogCategory
 
 # Enemy spawn patterns (10x4 grid)
 ENEMY_MAP_STG01 = [
@@ -49,21 +50,21 @@ def get_current_stage_map():
     }
     return stage_maps.get(GameState.CURRENT_STAGE, ENEMY_MAP_STG01)
 
-def check_stage_clear(enemy_list):
-    """Check if all enemies are defeated and handle stage progression"""
-    # Check if any active enemies remain
-    active_enemies = [e for e in enemy_list if e.active]
-    
+def check_stage_clear(active_count):
+    """Check if all enemies are defeated and handle stage progression
+
+    active_countは生存中の敵の数（Common.registry.active_enemy_count）
+    """
     # デバッグ出力を大幅削減（初回のみ、または変化があった時のみ）
     if Config.DEBUG and not hasattr(check_stage_clear, 'last_count'):
-        check_stage_clear.last_count = len(active_enemies)
-        GameState.debug_print(f"[DEBUG] check_stage_clear: {len(active_enemies)} enemies remaining")
-    elif Config.DEBUG and len(active_enemies) != check_stage_clear.last_count:
-        check_stage_clear.last_count = len(active_enemies)
-        GameState.debug_print(f"[DEBUG] Enemy count changed: {len(active_enemies)} enemies remaining")
+        check_stage_clear.last_count = active_count
+        logger.debug(LogCategory.WAVE, "[DEBUG] check_stage_clear: %d enemies remaining", active_count)
+    elif Config.DEBUG and active_count != check_stage_clear.last_count:
+        check_stage_clear.last_count = active_count
+        logger.debug(LogCategory.WAVE, "[DEBUG] Enemy count changed: %d enemies remaining", active_count)
     
-    if not active_enemies:
-        GameState.debug_print(f"[DEBUG] Stage Clear! No enemies remaining")
+    if active_count == 0:
+        logger.debug(LogCategory.WAVE, "[DEBUG] Stage Clear! No enemies remaining")
         if GameState.CURRENT_STAGE < Config.MAX_STAGE:
             GameState.GameStateSub = Config.STATE_PLAYING_STAGE_CLEAR
             return True
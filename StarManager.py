@@ -1,45 +1,162 @@
+# Star Field
+# 背景の星（タイトル画面・ゲーム中で共通）
+# 2種類のバックエンドを持つ:
+#  - "points": 星ごとの位置・速度・色を列（SoA）で保持し、1回のループでまとめて移動・再配置する。
+#              描画は星1個につきpset 1回
+#  - "layers": 速度帯ごとに星を画像バンクの1画面分の領域へ焼き込んでおき、
+#              縦に巻き戻るスクロールとして1レイヤーあたりblt 2回で描画する（星の数に依存しない）
+# 星の乱数は専用のストリーム（Rng.STARS、seed指定時は独立したRandom）を使い、ゲームロジックの乱数列を消費しない
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
 import random
 import pyxel
 import Config
-from dataclasses import dataclass
+import Rng
 
-@dataclass
-class Star:
-    x: int
-    y: int
-    col: int
-    speed: float
+# 画像バンクのサイズ（pyxelの画像バンクは256x256）
+IMAGE_BANK_SIZE = 256
+
+BACKEND_POINTS = "points"
+BACKEND_LAYERS = "layers"
+
+
+class StarPoints:
+    """星を列（SoA）で保持し、1個ずつpsetで描画するバックエンド"""
 
-class StarManager:
-    # Star Constants
-    COUNT = 100
-    SPEED = 0.5
     MIN_SPEED = 0.1
     MAX_SPEED = 3.0
-    
-    def __init__(self, count=None):
+    RESPAWN_Y = -10
+
+    def __init__(self, count: int, rng: random.Random):
+        self.count: int = count
+        self.rng: random.Random = rng
+        width = Config.WIN_WIDTH
+        height = Config.WIN_HEIGHT
+        randint = rng.randint
+        uniform = rng.uniform
+
+        self.xs: list = [0] * count
+        self.ys: list = [0.0] * count
+        self.cols: list = [0] * count
+        self.speeds: list = [0.0] * count
+        for i in range(count):
+            self.xs[i] = randint(0, width - 1)
+            self.ys[i] = randint(0, height - 1)
+            self.cols[i] = randint(2, 15)  #Color
+            self.speeds[i] = uniform(self.MIN_SPEED, self.MAX_SPEED)  #Speed
+
+    def update(self):
+        xs, ys, speeds = self.xs, self.ys, self.speeds
+        height = Config.WIN_HEIGHT
+        max_x = Config.WIN_WIDTH - 1
+        randint = self.rng.randint
+        respawn_y = self.RESPAWN_Y
+
+        # 移動と画面外に出た星の再配置を1パスで行う
+        for i in range(self.count):
+            y = ys[i] + speeds[i]
+            if y >= height:
+                xs[i] = randint(0, max_x)
+                y = respawn_y
+            ys[i] = y
+
+    def draw(self):
+        pset = pyxel.pset
+        for x, y, col in zip(self.xs, self.ys, self.cols):
+            pset(x, y, col)
+
+    def snapshot(self) -> tuple:
+        return (self.xs[:], self.ys[:])
+
+    def restore(self, state: tuple):
+        self.xs[:], self.ys[:] = state
+
+
+class StarLayers:
+    """速度帯ごとに焼き込んだ星のレイヤーをスクロールさせるバックエンド
+
+    レイヤーiは画像バンクの(u, v)から1画面分（WIN_WIDTH x WIN_HEIGHT）の領域を使う。
+    スクロール量offsetの位置で上下2回bltすれば、巻き戻りを含めて1画面分が埋まる。
+    """
+
+    def __init__(self, count: int, speeds: tuple, bank: int, rng: random.Random):
+        width = Config.WIN_WIDTH
+        height = Config.WIN_HEIGHT
+        per_row = IMAGE_BANK_SIZE // width
+        capacity = per_row * (IMAGE_BANK_SIZE // height)
+        if len(speeds) > capacity:
+            raise ValueError(f"{len(speeds)} star layers do not fit in image bank {bank} (max {capacity})")
+
+        self.bank: int = bank
+        self.speeds: tuple = tuple(speeds)
+        self.offsets: list = [0.0] * len(speeds)
+        self.origins: list = [((i % per_row) * width, (i // per_row) * height) for i in range(len(speeds))]
+
+        # 星を速度帯へ均等に割り振り、各レイヤーの領域へ焼き込む（遠い＝遅いレイヤーから順に余りを配る）
+        image = pyxel.images[bank]
+        randint = rng.randint
+        layer_count = len(speeds)
+        for i, (u, v) in enumerate(self.origins):
+            image.rect(u, v, width, height, pyxel.COLOR_BLACK)
+            for _ in range(count // layer_count + (1 if i < count % layer_count else 0)):
+                image.pset(u + randint(0, width - 1), v + randint(0, height - 1), randint(2, 15))
+
+    def update(self):
+        height = Config.WIN_HEIGHT
+        offsets = self.offsets
+        for i, speed in enumerate(self.speeds):
+            offsets[i] = (offsets[i] + speed) % height
+
+    def draw(self):
+        blt = pyxel.blt
+        width = Config.WIN_WIDTH
+        height = Config.WIN_HEIGHT
+        bank = self.bank
+        for (u, v), offset in zip(self.origins, self.offsets):
+            y = int(offset)
+            blt(0, y - height, bank, u, v, width, height, pyxel.COLOR_BLACK)
+            blt(0, y, bank, u, v, width, height, pyxel.COLOR_BLACK)
+
+    def snapshot(self) -> tuple:
+        return tuple(self.offsets)
+
+    def restore(self, state: tuple):
+        self.offsets[:] = state
+
+
+class StarManager:
+    # Star Constants
+    COUNT = Config.STAR_COUNT
+
+    def __init__(self, count=None, backend=None, seed=None):
         if count is None:
             count = self.COUNT
-        self.stars = [
-            Star(
-                random.randint(0, Config.WIN_WIDTH - 1),
-                random.randint(0, Config.WIN_HEIGHT - 1),
-                random.randint(2, 15),  #Color
-                #random.randint(1, 3)   #Speed  
-                random.uniform(self.MIN_SPEED, self.MAX_SPEED) #Speed
-            )
-            for _ in range(count)
-        ]
+        if backend is None:
+            backend = Config.STAR_BACKEND
+        rng = Rng.stream(Rng.STARS) if seed is None else random.Random(seed)
+
+        if backend == BACKEND_LAYERS:
+            self.field = StarLayers(count, Config.STAR_LAYER_SPEEDS, Config.STAR_BANK, rng)
+        elif backend == BACKEND_POINTS:
+            self.field = StarPoints(count, rng)
+        else:
+            raise ValueError(f"unknown star backend: {backend}")
+        self.backend: str = backend
+        self.count: int = count
 
     def update(self):
-        for star in self.stars:
-            star.y += star.speed
-            if star.y >= Config.WIN_HEIGHT:
-                star.x = random.randint(0, Config.WIN_WIDTH - 1)
-                star.y = -10
-                #star.col = random.randint(0, 15)
-                #star.speed = random.randint(1, 10)
+        self.field.update()
 
     def draw(self):
-        for star in self.stars:
-            pyxel.pset(star.x, star.y, star.col)
+        self.field.draw()
+
+    def snapshot(self) -> tuple:
+        """星の位置（スクロール量）の状態（Snapshot用。色や焼き込み済みの画像は含まない）"""
+        return self.field.snapshot()
+
+    def restore(self, state: tuple):
+        self.field.restore(state)
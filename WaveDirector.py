@@ -0,0 +1,221 @@
+# Wave Director
+# ステージ開始時の敵ウェーブ（1行10体×4行）の出現・入場を管理する
+# 敵の状態遷移はEnemyの状態リスナー経由でウェーブ別のカウンタへ通知されるため、
+# ウェーブ完了判定・戦闘開始判定は毎フレーム敵リストを走査せずにO(1)で行える
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import Common
+import Config
+import GameState
+import Rng
+from DebugLog import logger, LogCategory
+from Enemy import (Enemy, formation_manager, add_state_listener,
+                   ENEMY_STATE_ENTRY_SEQUENCE, ENEMY_STATE_MOVING_TO_HOME,
+                   ENEMY_STATE_HOME_REACHED, ENEMY_STATE_NORMAL, ENEMY_STATE_DESTROYED)
+from StageManager import get_current_stage_map
+
+# Wave States
+WAVE_WAITING = 0        # 待機中
+WAVE_SPAWNING = 1       # 出現中
+WAVE_ENTERING = 2       # 入場中（全員出現済み、ホームポジション到達待ち）
+WAVE_COMPLETED = 3      # 完了
+
+# ウェーブ構成
+WAVE_COUNT = 4
+ENEMIES_PER_WAVE = 10
+SPAWN_INTERVAL = 6      # 出現間隔（フレーム）
+
+# 隊列配置
+BASEX = 11
+OFSX = 10
+BASEY = 11
+OFSY = 10
+
+# 行ごとの登場パターン
+# テスト: 1行目はLeftLoop(1)、2行目はRightLoop(2)、3行目はZigzag(3)、4行目は従来の水平移動
+WAVE_ENTRY_PATTERN_IDS = (1, 2, 3, None)
+
+
+class Wave:
+    """1行分のウェーブの進行状況と、所属する敵の状態別カウンタ"""
+
+    __slots__ = ("row", "state", "spawn_index", "random_entry_y", "alive", "state_counts")
+
+    def __init__(self, row: int, state: int):
+        self.row: int = row
+        self.state: int = state
+        self.spawn_index: int = 0
+        self.random_entry_y: int = None
+        self.alive: int = 0                 # 生存中の敵の数
+        self.state_counts: dict = {         # 生存中の敵の状態別の数
+            ENEMY_STATE_ENTRY_SEQUENCE: 0,
+            ENEMY_STATE_MOVING_TO_HOME: 0,
+            ENEMY_STATE_HOME_REACHED: 0,
+            ENEMY_STATE_NORMAL: 0,
+        }
+
+    @property
+    def ready(self) -> int:
+        """隊列移動の準備ができた（ホームポジション到達済みの）敵の数"""
+        return self.state_counts[ENEMY_STATE_HOME_REACHED] + self.state_counts[ENEMY_STATE_NORMAL]
+
+
+class WaveDirector:
+    """ENEMY_ENTRYサブステート中のウェーブ出現・入場完了・戦闘開始を管理する"""
+
+    def __init__(self):
+        self.waves: list = []
+        self.running: bool = False
+        self.spawn_timer: int = 0
+        self.completed_count: int = 0
+        add_state_listener(self.on_enemy_state_changed)
+
+    def reset(self):
+        """進行中のウェーブを破棄する（次のupdateで新しいステージとして開始する）"""
+        self.waves = []
+        self.running = False
+        self.spawn_timer = 0
+        self.completed_count = 0
+
+    def start(self):
+        """ステージ開始: 敵リストを空にして1行目から出現を始める"""
+        self.waves = [Wave(row, WAVE_SPAWNING if row == 0 else WAVE_WAITING) for row in range(WAVE_COUNT)]
+        self.running = True
+        self.spawn_timer = 0
+        self.completed_count = 0
+
+        # Clear existing enemies for new stage
+        Common.clear_enemies()
+        formation_manager.reset_slots()
+
+    def update(self):
+        """1フレーム分のウェーブ処理（ENEMY_ENTRYサブステート中に毎フレーム呼ぶ）"""
+        if not self.running:
+            self.start()
+
+        self.spawn_timer += 1
+
+        for wave in self.waves:
+            # 出現中のウェーブの処理
+            if wave.state == WAVE_SPAWNING and self.spawn_timer % SPAWN_INTERVAL == 0:
+                self._spawn_enemy(wave)
+
+            # 入場中のウェーブの完了チェック
+            elif wave.state == WAVE_ENTERING:
+                if logger.is_enabled(LogCategory.WAVE) and wave.alive > 0:
+                    counts = wave.state_counts
+                    logger.debug(LogCategory.WAVE, "Wave %d: Total=%d, Entry=%d, Moving=%d, Reached=%d, Normal=%d",
+                                 wave.row, wave.alive, counts[ENEMY_STATE_ENTRY_SEQUENCE],
+                                 counts[ENEMY_STATE_MOVING_TO_HOME], counts[ENEMY_STATE_HOME_REACHED],
+                                 counts[ENEMY_STATE_NORMAL])
+
+                # 入場完了判定（生存している全員がホームポジション到達済み、または全滅）
+                if wave.ready == wave.alive:
+                    self._complete_wave(wave)
+
+        # 全ウェーブ完了チェック
+        if self.completed_count == len(self.waves):
+            self._finish()
+
+    def _spawn_enemy(self, wave: Wave):
+        row = wave.row
+        col = wave.spawn_index
+
+        enemy_y = OFSY + (BASEY * row)
+        enemy_x = OFSX + (BASEX * col)
+        sprite_num = get_current_stage_map()[row][col]
+
+        # 登場パターンの設定（左右交互：偶数行は左から、奇数行は右から）
+        if row % 2 == 0:
+            entry_pattern = "left_horizontal"
+        else:
+            entry_pattern = "right_horizontal"
+
+        # ウェーブ単位でランダムY座標を生成（初回のみ、64±32の範囲）
+        if col == 0:
+            wave.random_entry_y = 64 + Rng.stream(Rng.WAVE).randint(-32, 32)
+            logger.debug(LogCategory.WAVE, "Wave %d (%s): Generated random entry_y = %d",
+                         row, entry_pattern, wave.random_entry_y)
+
+        enemy = Enemy(x=enemy_x, y=enemy_y, sprite_num=sprite_num, w=8, h=8, life=2, score=100,
+                      entry_pattern=entry_pattern, entry_y=wave.random_entry_y,
+                      wave_id=row, enemy_index=col, entry_pattern_id=WAVE_ENTRY_PATTERN_IDS[row])
+        Common.add_enemy(enemy)
+
+        wave.alive += 1
+        wave.state_counts[enemy.state] += 1
+        wave.spawn_index += 1
+
+        # 出現完了チェック
+        if wave.spawn_index >= ENEMIES_PER_WAVE:
+            wave.state = WAVE_ENTERING
+
+    def _complete_wave(self, wave: Wave):
+        wave.state = WAVE_COMPLETED
+        self.completed_count += 1
+        logger.debug(LogCategory.WAVE, "Wave %d completed! All enemies reached home position. Triggering next wave.",
+                     wave.row)
+
+        # 次のウェーブを起動（同じフレームのループ内で出現処理される）
+        next_wave_index = wave.row + 1
+        if next_wave_index < len(self.waves):
+            self.waves[next_wave_index].state = WAVE_SPAWNING
+
+    def _finish(self):
+        """全ウェーブ完了: 全員撃墜ならステージクリア、そうでなければ隊列移動（戦闘）を開始する"""
+        alive = sum(wave.alive for wave in self.waves)
+        ready = sum(wave.ready for wave in self.waves)
+
+        if alive == 0:
+            # 全員撃墜された場合は即クリア判定へ
+            GameState.GameStateSub = Config.STATE_PLAYING_STAGE_CLEAR
+            logger.debug(LogCategory.WAVE, "All enemies destroyed during entry sequence! Stage clear.")
+        elif ready == alive:
+            # 全員がホームポジション到達・隊列移動準備完了
+            # 全敵をNORMAL状態に遷移（NORMALへの遷移で隊列に参加する）
+            # 状態遷移で索引が変わるため、対象を先に取り出しておく
+            for enemy in tuple(Common.registry.enemies_in_state(ENEMY_STATE_HOME_REACHED)):
+                enemy.change_state(ENEMY_STATE_NORMAL, "all waves completed")
+
+            GameState.GameStateSub = Config.STATE_PLAYING_FIGHT
+            logger.debug(LogCategory.WAVE, "All waves completed! %d enemies ready for formation movement. Starting battle.",
+                         alive)
+
+        self.running = False
+
+    def snapshot(self) -> tuple:
+        """ウェーブの進行状況（Snapshot用）"""
+        waves = tuple((wave.row, wave.state, wave.spawn_index, wave.random_entry_y, wave.alive,
+                       tuple(wave.state_counts.items()))
+                      for wave in self.waves)
+        return (waves, self.running, self.spawn_timer, self.completed_count)
+
+    def restore(self, state: tuple):
+        waves, self.running, self.spawn_timer, self.completed_count = state
+        self.waves = []
+        for row, wave_state, spawn_index, random_entry_y, alive, state_counts in waves:
+            wave = Wave(row, wave_state)
+            wave.spawn_index = spawn_index
+            wave.random_entry_y = random_entry_y
+            wave.alive = alive
+            wave.state_counts = dict(state_counts)
+            self.waves.append(wave)
+
+    def on_enemy_state_changed(self, enemy: Enemy, old_state: int, new_state: int):
+        """Enemyの状態リスナー: 所属ウェーブのカウンタを更新する"""
+        if not self.running or not 0 <= enemy.wave_id < len(self.waves):
+            return
+        wave = self.waves[enemy.wave_id]
+        wave.state_counts[old_state] -= 1
+        if new_state == ENEMY_STATE_DESTROYED:
+            wave.alive -= 1
+        else:
+            wave.state_counts[new_state] += 1
+
+
+# グローバルインスタンス
+wave_director = WaveDirector()
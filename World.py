@@ -0,0 +1,181 @@
+# World - Archetype Tables
+# 同じ構成要素（位置・速度・当たり判定・スプライト・寿命…）を持つエンティティを
+# 1つのテーブル（アーキタイプ）の行として列（SoA）で保持する。
+# システム（移動・衝突・アニメーション・カリング）は列をまとめて走査するため、
+# エンティティ1個ごとのメソッド呼び出しが発生しない。
+#
+# 行は先頭count行に詰めて保持し、compactで生成順を保ったまま前詰めする。
+# 行ごとのファサード（既存コードから見えるBullet等のオブジェクト）は
+# 行番号に固定されていて、rowsリストは常にfacades[:count]と一致する。
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+
+class Archetype:
+    """列指向のエンティティテーブル（1行 = 1エンティティ）
+
+    columnsは{列名: 初期値}。各列は容量分のリストとして確保され、
+    同名の属性（table.x など）で直接参照できる。列リストは作り直さないので、
+    ループの前にローカル変数へ取り出して使ってよい。
+    """
+
+    def __init__(self, name: str, capacity: int, columns: dict, facade_factory=None):
+        self.name: str = name
+        self.capacity: int = 0
+        self.columns: dict = {}
+        for column, default in columns.items():
+            self.columns[column] = []
+            setattr(self, column, self.columns[column])
+        self._defaults: dict = dict(columns)
+        self._facade_factory = facade_factory
+        self.facades: list = []     # 行番号に固定されたファサード（facade_factory指定時のみ）
+        self.rows: list = []        # 使用中の行のファサード（= facades[:count]）
+
+        self.count: int = 0         # 使用中の行数
+        self.high_water: int = 0    # 同時使用行数の最大値
+        self.misses: int = 0        # 容量不足でspawnが失敗した回数
+
+        self.resize(capacity)
+
+    def resize(self, capacity: int):
+        """容量を変更する（使用中の行数より小さくはできない）"""
+        if capacity < self.count:
+            raise ValueError(f"{self.name}: capacity {capacity} is smaller than rows in use ({self.count})")
+        old_capacity = self.capacity
+        for column, values in self.columns.items():
+            if capacity > old_capacity:
+                values.extend([self._defaults[column]] * (capacity - old_capacity))
+            else:
+                del values[capacity:]
+        if self._facade_factory is not None:
+            if capacity > old_capacity:
+                self.facades.extend(self._facade_factory(row) for row in range(old_capacity, capacity))
+            else:
+                del self.facades[capacity:]
+        self.capacity = capacity
+
+    def spawn(self) -> int:
+        """末尾に1行確保して行番号を返す（空きが無ければ-1）
+
+        列の値は呼び出し側で設定すること。
+        """
+        row = self.count
+        if row >= self.capacity:
+            self.misses += 1
+            return -1
+        self.count = row + 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        if self._facade_factory is not None:
+            self.rows.append(self.facades[row])
+        return row
+
+    def compact(self, alive_column: str = "active") -> int:
+        """alive_columnが偽の行を取り除き、残りを生成順のまま前詰めする
+
+        Returns:
+            取り除いた行数
+        """
+        alive_flags = self.columns[alive_column]
+        count = self.count
+        alive = 0
+        for row in range(count):
+            if alive_flags[row]:
+                if alive != row:
+                    for values in self.columns.values():
+                        values[alive] = values[row]
+                alive += 1
+
+        removed = count - alive
+        if removed:
+            for row in range(alive, count):
+                alive_flags[row] = self._defaults[alive_column]
+            self.count = alive
+            if self._facade_factory is not None:
+                del self.rows[alive:]
+        return removed
+
+    def clear(self):
+        """全ての行を解放する（列は再確保しない）"""
+        alive_flags = self.columns.get("active")
+        if alive_flags is not None:
+            for row in range(self.count):
+                alive_flags[row] = self._defaults["active"]
+        self.count = 0
+        self.rows.clear()
+
+    def snapshot(self) -> tuple:
+        """使用中の行の列データと統計値を組み込み型だけのタプルで返す（Snapshot用）"""
+        count = self.count
+        return (count, self.high_water, self.misses,
+                tuple(values[:count] for values in self.columns.values()))
+
+    def restore(self, state: tuple):
+        """snapshotの状態へ戻す（列リストとファサードは作り直さない）"""
+        count, high_water, misses, saved_columns = state
+        if count > self.capacity:
+            self.resize(count)
+        old_count = self.count
+        for (column, values), saved in zip(self.columns.items(), saved_columns):
+            values[:count] = saved
+            default = self._defaults[column]
+            for row in range(count, old_count):
+                values[row] = default
+        self.count = count
+        self.high_water = high_water
+        self.misses = misses
+        if self._facade_factory is not None:
+            self.rows[:] = self.facades[:count]
+
+    def stats(self) -> dict:
+        """占有状況を返す（capacity・in_use・high_water・misses）"""
+        return {
+            "capacity": self.capacity,
+            "in_use": self.count,
+            "high_water": self.high_water,
+            "misses": self.misses,
+        }
+
+
+def column_property(table: Archetype, column: str, doc: str = None) -> property:
+    """ファサードの属性を、table.columnの自分の行（self.row）へ読み書きするプロパティにする"""
+    values = table.columns[column]
+
+    def getter(self):
+        return values[self.row]
+
+    def setter(self, value):
+        values[self.row] = value
+
+    return property(getter, setter, doc=doc)
+
+
+def rebuild_grid(grid, table: Archetype, col_x: float, col_y: float, col_w: float, col_h: float):
+    """アクティブな行の当たり判定ボックスを空間ハッシュへ行番号で登録する（衝突システムのブロードフェーズ）"""
+    grid.clear()
+    insert = grid.insert
+    xs = table.x
+    ys = table.y
+    active = table.active
+    for row in range(table.count):
+        if active[row]:
+            insert(row, xs[row] + col_x, ys[row] + col_y, col_w, col_h)
+
+
+def rebuild_swept_grid(grid, table: Archetype, col_x: float, col_y: float, col_w: float, col_h: float):
+    """アクティブな行の当たり判定ボックスが前ティックの位置(px, py)から現在の位置まで動いた範囲を
+    空間ハッシュへ行番号で登録する（スイープ判定のブロードフェーズ。テーブルにpx/py列が必要）"""
+    grid.clear()
+    insert = grid.insert
+    xs = table.x
+    ys = table.y
+    pxs = table.px
+    pys = table.py
+    active = table.active
+    for row in range(table.count):
+        if active[row]:
+            x, y, px, py = xs[row], ys[row], pxs[row], pys[row]
+            insert(row, min(x, px) + col_x, min(y, py) + col_y, col_w + abs(x - px), col_h + abs(y - py))
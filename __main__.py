@@ -0,0 +1,12 @@
+# PyxelShmup launcher
+# リポジトリのディレクトリを指定して起動する: python path/to/PyxelShmup [replay.rpl]
+# （ディレクトリ内では python -m main [replay.rpl] でも同じ）
+
+#ソースコードの中のコメントは日本語にしましょう
+# #画面に出力する文字列は英語にしてください。pyxelは日本語フォントを表示できません
+# CLAUDE.md を書き込むときは英語にしてください
+# 変数の型は宣言してください
+
+import main
+
+main.run()
@@ -12,23 +12,57 @@
 
 import pyxel
 import random
-import os
+import sys
 
 import Common
 import Config
 import GameState
+import Input
+import Rng
+from Input import INPUT_SHOT, INPUT_Z
+import StageManager
 # from SpriteManager import SprList  # No longer needed
-from StageManager import get_current_stage_map, check_stage_clear
-from Enemy import Enemy, formation_manager
+from StageManager import check_stage_clear
+from Enemy import formation_manager
+from WaveDirector import wave_director
 from ExplodeManager import ExpType
 
 from StarManager import StarManager
 from Player import Player
+from Bullet import Bullet
+from EnemyBullet import EnemyBullet
+from Profiler import profiler
+from AnimationClock import animation_clock
+from SpriteVariants import sprite_variants
+from RenderQueue import render_queue
+from CollisionMask import collision_masks, masks_overlap, sweep_masks
+from DebugLog import logger, LogCategory
+from FrameScheduler import FixedStepScheduler
+from Replay import Replay, ReplayPlayer
+import Snapshot
+from Snapshot import RewindBuffer
+
+# カメラシェイク用の乱数（演出専用。ゲームロジックの乱数列を描画で消費しない）
+_shake_random = Rng.stream(Rng.FX)
+
+
+def reset_world():
+    """モジュールグローバルに残るゲーム状態を初期化する（同一プロセスでの再実行・リプレイの巻き戻し用）"""
+    GameState.reset_game_state()
+    Common.clear_enemies()
+    Common.clear_bullets()
+    Common.explode_manager.clear()
+    formation_manager.reset()
+    formation_manager.reset_slots()
+    wave_director.reset()
+    render_queue.clear()
+    if hasattr(StageManager.check_stage_clear, "last_count"):
+        del StageManager.check_stage_clear.last_count
 
 # Title State ----------------------------------------
 def update_title(self):
     self.star_manager.update()
-    if pyxel.btn(pyxel.KEY_SPACE):
+    if Input.btn(INPUT_SHOT):
         GameState.GameState = Config.STATE_PLAYING
 
 def draw_title(self):
@@ -45,17 +79,269 @@ def draw_title(self):
 
 # Playing State ----------------------------------------
 
+def collide_discrete(player):
+    """衝突判定：現在の位置の当たり判定ボックス（とマスク）が重なっている組を処理する"""
+    # --- ブロードフェーズ：空間ハッシュを再構築 ---
+    Common.rebuild_collision_grids()
+    profiler.lap("col_grid")
+
+    player_col_x = player.x + player.col_x
+    player_col_y = player.y + player.col_y
+    player_col_w = player.col_w
+    player_col_h = player.col_h
+
+    # --- 詳細判定用のマスク（AABBで重なった組だけ不透明ピクセルで判定する） ---
+    # アニメーションのフレームは描画側のAnimationClockではなくロジックの時刻から選ぶ
+    pixel_collision = Config.PIXEL_COLLISION
+    if pixel_collision:
+        timer = GameState.GameTimer
+        player_mask = collision_masks.sprite_mask(player._get_player_sprite())
+        player_px, player_py = int(player.x), int(player.y)
+
+    # --- 衝突判定：プレイヤー弾 vs 敵（弾テーブルの列を行順に走査） ---
+    bullet_table = Bullet.table
+    bullet_xs, bullet_ys, bullet_active = bullet_table.x, bullet_table.y, bullet_table.active
+    bullet_w, bullet_h = Bullet.col_w, Bullet.col_h
+    if pixel_collision and bullet_table.count:
+        bullet_mask = collision_masks.animation_mask(Bullet.anim_slot, timer)
+    for row in range(bullet_table.count):
+        if not bullet_active[row]:
+            continue  # 非アクティブな弾はスキップ
+
+        bullet_col_x = bullet_xs[row] + Bullet.col_x
+        bullet_col_y = bullet_ys[row] + Bullet.col_y
+
+        # 同じセルにいる敵のみを候補にする（リスト順は総当たりと同じ）
+        for enemy in Common.query_collision_candidates(
+            Common.enemy_grid, Common.enemy_list,
+            bullet_col_x, bullet_col_y, bullet_w, bullet_h
+        ):
+            if not enemy.active:
+                continue  # 非アクティブな敵はスキップ
+
+            # 衝突しているかをチェック
+            if Common.check_collision(
+                bullet_col_x, bullet_col_y, bullet_w, bullet_h,
+                enemy.x + enemy.col_x, enemy.y + enemy.col_y, enemy.col_w, enemy.col_h
+            ):
+                if pixel_collision and not masks_overlap(
+                    bullet_mask, int(bullet_xs[row]), int(bullet_ys[row]),
+                    collision_masks.animation_mask(enemy.anim_slot, timer), int(enemy.x), int(enemy.y)
+                ):
+                    continue  # 外接矩形は重なっているが不透明ピクセルは重なっていない
+                enemy.on_hit(bullet_table.facades[row])  # ヒット処理（敵のライフ減少、爆発など）
+    profiler.lap("col_pbullet")
+
+    # --- 衝突判定：敵弾 vs プレイヤー ---
+    if pixel_collision:
+        enemy_bullet_mask = collision_masks.sprite_mask(EnemyBullet._get_enemy_bullet_sprite())
+    for bullet in Common.query_collision_candidates(
+        Common.enemy_bullet_grid, Common.enemy_bullet_list,
+        player_col_x, player_col_y, player_col_w, player_col_h
+    ):
+        if not bullet.active:
+            continue  # 非アクティブな弾はスキップ
+
+        # プレイヤーとの衝突チェック
+        if Common.check_collision(
+            bullet.x + bullet.col_x, bullet.y + bullet.col_y, bullet.col_w, bullet.col_h,
+            player_col_x, player_col_y, player_col_w, player_col_h
+        ):
+            if pixel_collision and not masks_overlap(
+                enemy_bullet_mask, int(bullet.x), int(bullet.y), player_mask, player_px, player_py
+            ):
+                continue
+            bullet.active = False  # 弾を消す
+            player.on_hit()  # プレイヤーのヒット処理
+    profiler.lap("col_ebullet")
+
+    # --- 衝突判定：プレイヤー vs 敵 ---
+    for enemy in Common.query_collision_candidates(
+        Common.enemy_grid, Common.enemy_list,
+        player_col_x, player_col_y, player_col_w, player_col_h
+    ):
+        if not enemy.active:
+            continue  # 非アクティブな敵はスキップ
+
+        # プレイヤーとの衝突チェック
+        if Common.check_collision(
+            player_col_x, player_col_y, player_col_w, player_col_h,
+            enemy.x + enemy.col_x, enemy.y + enemy.col_y,
+            enemy.col_w, enemy.col_h
+        ):
+            if pixel_collision and not masks_overlap(
+                player_mask, player_px, player_py,
+                collision_masks.animation_mask(enemy.anim_slot, timer), int(enemy.x), int(enemy.y)
+            ):
+                continue
+            player.on_hit()  # プレイヤーのヒット処理
+    profiler.lap("col_player")
+
+def collide_swept(player):
+    """衝突判定：弾と敵はティック開始時の位置から現在の位置までの移動範囲で判定し、
+    当たった組を当たった時刻（time of impact）の順に処理する
+
+    1ティックの移動量が当たり判定より大きくてもすり抜けない。
+    プレイヤーは現在の位置で止まっているものとして扱う。
+    COLLISION_STRIDEが2以上なら、区間の最初のティックの開始時からの移動範囲で判定する。
+    """
+    # --- ブロードフェーズ：移動範囲で空間ハッシュを再構築 ---
+    Common.rebuild_collision_grids(swept=True)
+    profiler.lap("col_grid")
+
+    sweep_collision = Common.sweep_collision
+    player_col_x = player.x + player.col_x
+    player_col_y = player.y + player.col_y
+    player_col_w = player.col_w
+    player_col_h = player.col_h
+
+    pixel_collision = Config.PIXEL_COLLISION
+    if pixel_collision:
+        timer = GameState.GameTimer
+        player_mask = collision_masks.sprite_mask(player._get_player_sprite())
+        player_px, player_py = int(player.x), int(player.y)
+
+    # --- 衝突判定：プレイヤー弾 vs 敵（当たった組を集めてから時刻順に処理する） ---
+    bullet_table = Bullet.table
+    bullet_xs, bullet_ys, bullet_active = bullet_table.x, bullet_table.y, bullet_table.active
+    bullet_pxs, bullet_pys = bullet_table.px, bullet_table.py
+    bullet_col_x, bullet_col_y = Bullet.col_x, Bullet.col_y
+    bullet_w, bullet_h = Bullet.col_w, Bullet.col_h
+    if pixel_collision and bullet_table.count:
+        bullet_mask = collision_masks.animation_mask(Bullet.anim_slot, timer)
+    contacts = []   # (当たった時刻, 発見順, 弾の行, 敵)
+    for row in range(bullet_table.count):
+        if not bullet_active[row]:
+            continue  # 非アクティブな弾はスキップ
+
+        x0, y0 = bullet_pxs[row], bullet_pys[row]
+        dx, dy = bullet_xs[row] - x0, bullet_ys[row] - y0
+
+        # 移動範囲と同じセルにいる敵のみを候補にする
+        for enemy in Common.query_collision_candidates(
+            Common.enemy_grid, Common.enemy_list,
+            min(x0, x0 + dx) + bullet_col_x, min(y0, y0 + dy) + bullet_col_y,
+            bullet_w + abs(dx), bullet_h + abs(dy)
+        ):
+            if not enemy.active:
+                continue  # 非アクティブな敵はスキップ
+
+            ex0, ey0 = enemy.prev_x, enemy.prev_y
+            edx, edy = enemy.x - ex0, enemy.y - ey0
+            hit = sweep_collision(
+                x0 + bullet_col_x, y0 + bullet_col_y, bullet_w, bullet_h, dx, dy,
+                ex0 + enemy.col_x, ey0 + enemy.col_y, enemy.col_w, enemy.col_h, edx, edy
+            )
+            if hit is None:
+                continue
+            toi = hit[0]
+            if pixel_collision:
+                toi = sweep_masks(bullet_mask, x0, y0, dx, dy,
+                                  collision_masks.animation_mask(enemy.anim_slot, timer), ex0, ey0, edx, edy,
+                                  hit[0], hit[1])
+                if toi is None:
+                    continue  # 移動範囲は重なっているが不透明ピクセルは重なっていない
+            contacts.append((toi, len(contacts), row, enemy))
+
+    # 早く当たった順に処理し、先に消えた弾・撃墜された敵の組は捨てる
+    contacts.sort()
+    facades = bullet_table.facades
+    for toi, _, row, enemy in contacts:
+        if bullet_active[row] and enemy.active:
+            enemy.on_hit(facades[row])  # ヒット処理（敵のライフ減少、爆発など）
+    profiler.lap("col_pbullet")
+
+    # --- 衝突判定：敵弾 vs プレイヤー ---
+    if pixel_collision:
+        enemy_bullet_mask = collision_masks.sprite_mask(EnemyBullet._get_enemy_bullet_sprite())
+    contacts = []   # (当たった時刻, 発見順, 弾)
+    for bullet in Common.query_collision_candidates(
+        Common.enemy_bullet_grid, Common.enemy_bullet_list,
+        player_col_x, player_col_y, player_col_w, player_col_h
+    ):
+        if not bullet.active:
+            continue  # 非アクティブな弾はスキップ
+
+        x0, y0 = bullet.px, bullet.py
+        dx, dy = bullet.x - x0, bullet.y - y0
+        hit = sweep_collision(
+            x0 + bullet.col_x, y0 + bullet.col_y, bullet.col_w, bullet.col_h, dx, dy,
+            player_col_x, player_col_y, player_col_w, player_col_h, 0.0, 0.0
+        )
+        if hit is None:
+            continue
+        toi = hit[0]
+        if pixel_collision:
+            toi = sweep_masks(enemy_bullet_mask, x0, y0, dx, dy,
+                              player_mask, player_px, player_py, 0.0, 0.0, hit[0], hit[1])
+            if toi is None:
+                continue
+        contacts.append((toi, len(contacts), bullet))
+
+    contacts.sort()
+    for toi, _, bullet in contacts:
+        bullet.active = False  # 弾を消す
+        player.on_hit()  # プレイヤーのヒット処理
+    profiler.lap("col_ebullet")
+
+    # --- 衝突判定：プレイヤー vs 敵 ---
+    # ヒット処理は無敵時間中は何もしないので、当たった敵があれば時刻に関係なく1回でよい
+    for enemy in Common.query_collision_candidates(
+        Common.enemy_grid, Common.enemy_list,
+        player_col_x, player_col_y, player_col_w, player_col_h
+    ):
+        if not enemy.active:
+            continue  # 非アクティブな敵はスキップ
+
+        ex0, ey0 = enemy.prev_x, enemy.prev_y
+        edx, edy = enemy.x - ex0, enemy.y - ey0
+        hit = sweep_collision(
+            player_col_x, player_col_y, player_col_w, player_col_h, 0.0, 0.0,
+            ex0 + enemy.col_x, ey0 + enemy.col_y, enemy.col_w, enemy.col_h, edx, edy
+        )
+        if hit is None:
+            continue
+        if pixel_collision and sweep_masks(
+            player_mask, player_px, player_py, 0.0, 0.0,
+            collision_masks.animation_mask(enemy.anim_slot, timer), ex0, ey0, edx, edy, hit[0], hit[1]
+        ) is None:
+            continue
+        player.on_hit()  # プレイヤーのヒット処理
+        break
+    profiler.lap("col_player")
+
+def begin_collision_step():
+    """ティックの最初（移動前）に呼ぶ。衝突判定の区間の始まりなら、スイープ判定用に敵・弾の位置を記録する
+
+    区間はConfig.COLLISION_STRIDEティック。2以上なら区間の最初のティックでだけ記録する。
+    """
+    if Config.SWEPT_COLLISION and (GameState.GameTimer - 1) % Config.COLLISION_STRIDE == 0:
+        Common.store_previous_positions()
+
+def collide(player):
+    """移動後に呼ぶ。衝突判定の区間の終わりのティックなら、区間の移動をまとめて判定する"""
+    if GameState.GameTimer % Config.COLLISION_STRIDE != 0:
+        return
+    if Config.SWEPT_COLLISION:
+        collide_swept(player)
+    else:
+        collide_discrete(player)
+
 def update_playing(self):
+    # スイープ判定用に、移動する前の敵・弾の位置を記録する
+    begin_collision_step()
+
+    # カメラシェイクのカウントダウン（描画頻度に依存しないようupdateで進める）
+    if GameState.ShakeTimer > 0:
+        GameState.ShakeTimer -= 1
+
     #爆発エフェクトはヒットストップに含めない
     Common.explode_manager.update()
+    profiler.lap("explosion")
     
-    # --- 弾の移動処理（プレイヤーの弾） ---
-    for _b in Common.player_bullet_list:
-        _b.update()
-
-    # --- 敵の弾の移動処理 ---
-    for _b in Common.enemy_bullet_list:
-        _b.update()
+    # --- 弾の移動処理（プレイヤーの弾・敵の弾の列をまとめて更新） ---
+    Common.update_bullets()
+    profiler.lap("bullets")
 
     # move_amountを初期化
     move_amount = 0
@@ -64,222 +350,58 @@ def update_playing(self):
     if GameState.GameStateSub == Config.STATE_PLAYING_FIGHT:
         # 新しいFormationManagerで隊列移動を処理
         formation_manager.update(Common.enemy_list)
+    profiler.lap("formation")
 
     # 各敵のupdateを呼び出す（シンプル化）
     for _e in Common.enemy_list:
         _e.update()
+    profiler.lap("enemies")
 
     #ゲームスタート時の敵スポーン処理（ウェーブキューシステム）
     if GameState.GameStateSub == Config.STATE_PLAYING_ENEMY_ENTRY:
-        if not hasattr(self, 'spawn_timer'):
-            self.spawn_timer = 0
-            self.spawn_index = 0
-            # ウェーブキューの初期化
-            self.wave_queue = [
-                {"row": 0, "state": 1, "spawn_index": 0},  # 1行目：出現中
-                {"row": 1, "state": 0, "spawn_index": 0},  # 2行目：待機中
-                {"row": 2, "state": 0, "spawn_index": 0},  # 3行目：待機中
-                {"row": 3, "state": 0, "spawn_index": 0},  # 4行目：待機中
-            ]
-            # Clear existing enemies for new stage
-            Common.enemy_list.clear()
-
-        self.spawn_timer += 1
-        
-        # 定数定義
-        BASEX = 11
-        OFSX = 10
-        BASEY = 11
-        OFSY = 10
-        
-        # 各ウェーブの状態管理
-        for wave in self.wave_queue:
-            row = wave["row"]
-            state = wave["state"]
-            
-            # 出現中のウェーブの処理
-            if state == 1 and self.spawn_timer % 6 == 0:  # SPAWNING
-                if wave["spawn_index"] < 10:
-                    _y = row
-                    _x = wave["spawn_index"]
-
-                    enemy_y = OFSY + (BASEY * _y)
-                    enemy_x = OFSX + (BASEX * _x)
-                    sprite_num = get_current_stage_map()[_y][_x]
-                    
-                    # 登場パターンの設定（左右交互：偶数行は左から、奇数行は右から）
-                    if _y % 2 == 0:  # 偶数行（0,2行目）は左から水平移動
-                        entry_pattern = "left_horizontal"
-                    else:  # 奇数行（1,3行目）は右から水平移動
-                        entry_pattern = "right_horizontal"
-                    
-                    # ウェーブ単位でランダムY座標を生成（初回のみ）
-                    if wave["spawn_index"] == 0 and entry_pattern in ["left_horizontal", "right_horizontal"]:
-                        # 64±32の範囲でランダムY座標を生成
-                        wave["random_entry_y"] = 64 + random.randint(-32, 32)
-                        if Config.DEBUG:
-                            print(f"Wave {row} ({entry_pattern}): Generated random entry_y = {wave['random_entry_y']}")
-                    
-                    # ウェーブ共通のランダムY座標を使用
-                    random_entry_y = wave.get("random_entry_y", None)
-                    
-                    # 敵生成（登場パターン対応 + デバッグ情報 + EntryPattern統合テスト）
-                    # テスト: 1行目はLeftLoop(1)、2行目はRightLoop(2)、3行目はZigzag(3)、4行目は従来の水平移動
-                    if row == 0:
-                        test_pattern_id = 1  # LeftLoopPattern
-                    elif row == 1:
-                        test_pattern_id = 2  # RightLoopPattern
-                    elif row == 2:
-                        test_pattern_id = 3  # ZigzagPattern
-                    else:
-                        test_pattern_id = None  # 従来の水平移動
-                    
-                    _Enemy = Enemy(x=enemy_x, y=enemy_y, sprite_num=sprite_num, w=8, h=8, life=2, score=100, 
-                                 entry_pattern=entry_pattern, entry_y=random_entry_y, 
-                                 wave_id=row, enemy_index=wave["spawn_index"], entry_pattern_id=test_pattern_id)
-                    Common.enemy_list.append(_Enemy)
-                    
-                    wave["spawn_index"] += 1
-                    
-                    # 出現完了チェック
-                    if wave["spawn_index"] >= 10:
-                        wave["state"] = 2  # ENTERING状態へ遷移
-            
-            # 入場中のウェーブの完了チェック
-            elif state == 2:  # ENTERING
-                # 現在の行の全敵をスポーン順序で特定（row基準）
-                current_row_enemies = [e for e in Common.enemy_list if e.active and abs(e.formation_y - (OFSY + BASEY * row)) < 5]
-                
-                # ホームポジション到達済みの敵をカウント
-                ready_enemies = [e for e in current_row_enemies if e.is_ready_for_formation_movement()]
-                
-                # デバッグ情報（登場シーケンス対応）
-                if Config.DEBUG and len(current_row_enemies) > 0:
-                    entry_enemies = [e for e in current_row_enemies if e.state == -1]  # ENTRY_SEQUENCE
-                    moving_enemies = [e for e in current_row_enemies if e.state == -2]  # MOVING_TO_HOME
-                    reached_enemies = [e for e in current_row_enemies if e.state == -3]  # HOME_REACHED
-                    normal_enemies = [e for e in current_row_enemies if e.state == 0]  # NORMAL
-                    print(f"Wave {row}: Total={len(current_row_enemies)}, Entry={len(entry_enemies)}, Moving={len(moving_enemies)}, Reached={len(reached_enemies)}, Normal={len(normal_enemies)}")
-                
-                # 入場完了判定（全員がホームポジション到達済み）
-                if len(ready_enemies) == len(current_row_enemies) and len(current_row_enemies) > 0:
-                    wave["state"] = 3  # COMPLETED状態へ遷移
-                    if Config.DEBUG:
-                        print(f"Wave {row} completed! All enemies reached home position. Triggering next wave.")
-                    
-                    # 次のウェーブを起動
-                    next_wave_index = row + 1
-                    if next_wave_index < len(self.wave_queue):
-                        self.wave_queue[next_wave_index]["state"] = 1  # SPAWNING状態へ
-        
-        # 全ウェーブ完了チェック
-        all_completed = all(wave["state"] == 3 for wave in self.wave_queue)
-        if all_completed:
-            # 全隊列の出現・入場完了判定
-            active_enemies = [e for e in Common.enemy_list if e.active]
-            all_ready_for_formation = [e for e in active_enemies if e.is_ready_for_formation_movement()]
-            
-            if len(active_enemies) == 0:
-                # 全員撃墜された場合は即クリア判定へ
-                GameState.GameStateSub = Config.STATE_PLAYING_STAGE_CLEAR
-                if Config.DEBUG:
-                    print("All enemies destroyed during entry sequence! Stage clear.")
-            elif len(all_ready_for_formation) == len(active_enemies):
-                # 全員がホームポジション到達・隊列移動準備完了
-                # 全敵をNORMAL状態に遷移
-                for enemy in active_enemies:
-                    if enemy.state == -3:  # HOME_REACHED
-                        old_state = enemy.state
-                        enemy.state = 0  # NORMAL
-                        # 最初と最後の敵の状態遷移をログ出力
-                        if hasattr(enemy, '_log_state_change'):
-                            enemy._log_state_change(old_state, enemy.state, "all waves completed")
-                
-                GameState.GameStateSub = Config.STATE_PLAYING_FIGHT
-                if Config.DEBUG:
-                    print(f"All waves completed! {len(active_enemies)} enemies ready for formation movement. Starting battle.")
-            
-            # クリーンアップ
-            if hasattr(self, 'spawn_timer'):
-                del self.spawn_timer
-            if hasattr(self, 'spawn_index'):
-                del self.spawn_index
-            if hasattr(self, 'wave_queue'):
-                del self.wave_queue
+        wave_director.update()
+
+    profiler.lap("spawn_wave")
 
     # 星の背景アニメーションは常に更新（ヒットストップの影響を受けない）
     self.star_manager.update()
+    profiler.lap("stars")
 
     # ステージクリア時の処理
     # プレイヤーの更新処理（ステージクリア中でも移動可能にする）
+    self.player.update_effects()
     if GameState.StopTimer <= 0:  # ヒットストップ中以外は常に更新
         self.player.update()
+    profiler.lap("player")
 
     if GameState.GameStateSub == Config.STATE_PLAYING_STAGE_CLEAR:
-        if pyxel.btn(pyxel.KEY_Z):
+        if Input.btn(INPUT_Z):
             GameState.CURRENT_STAGE += 1
             # Reset enemy_list for the new stage
-            Common.enemy_list.clear()
+            Common.clear_enemies()
+            formation_manager.reset_slots()
             GameState.GameStateSub = Config.STATE_PLAYING_ENEMY_ENTRY
+        # 衝突判定をしない間も、画面外に出た弾の行を空けておく（テーブルは固定容量で末尾にしか追加できない）
+        Common.compact_entity_lists()
         return
 
     # ここから下の処理はヒットストップの影響を受ける
     if GameState.StopTimer > 0:
         GameState.StopTimer -= 1
+        Common.compact_entity_lists()
         return
 
-    # --- 衝突判定：プレイヤー弾 vs 敵 ---
-    for bullet in Common.player_bullet_list:
-        if not bullet.active:
-            continue  # 非アクティブな弾はスキップ
+    # --- 衝突判定（スイープ判定では位置を記録したティックの開始時からの移動範囲で判定する） ---
+    collide(self.player)
 
-        for enemy in Common.enemy_list:
-            if not enemy.active:
-                continue  # 非アクティブな敵はスキップ
-
-            # 衝突しているかをチェック
-            if Common.check_collision(
-                bullet.x + bullet.col_x, bullet.y + bullet.col_y, bullet.col_w, bullet.col_h,
-                enemy.x + enemy.col_x, enemy.y + enemy.col_y, enemy.col_w, enemy.col_h
-            ):
-                enemy.on_hit(bullet)  # ヒット処理（敵のライフ減少、爆発など）
-
-    # --- 衝突判定：敵弾 vs プレイヤー ---
-    for bullet in Common.enemy_bullet_list:
-        if not bullet.active:
-            continue  # 非アクティブな弾はスキップ
-
-        # プレイヤーとの衝突チェック
-        if Common.check_collision(
-            bullet.x + bullet.col_x, bullet.y + bullet.col_y, bullet.col_w, bullet.col_h,
-            self.player.x + self.player.col_x, self.player.y + self.player.col_y, 
-            self.player.col_w, self.player.col_h
-        ):
-            bullet.active = False  # 弾を消す
-            self.player.on_hit()  # プレイヤーのヒット処理
-
-    # --- 衝突判定：プレイヤー vs 敵 ---
-    for enemy in Common.enemy_list:
-        if not enemy.active:
-            continue  # 非アクティブな敵はスキップ
-
-        # プレイヤーとの衝突チェック
-        if Common.check_collision(
-            self.player.x + self.player.col_x, self.player.y + self.player.col_y,
-            self.player.col_w, self.player.col_h,
-            enemy.x + enemy.col_x, enemy.y + enemy.col_y,
-            enemy.col_w, enemy.col_h
-        ):
-            self.player.on_hit()  # プレイヤーのヒット処理
-
-    # --- ガベージコレクション（死んだ敵、自弾も除去） ---
-    Common.enemy_list = [e for e in Common.enemy_list if e.active]
-    Common.player_bullet_list = [b for b in Common.player_bullet_list if b.active]
-    Common.enemy_bullet_list = [b for b in Common.enemy_bullet_list if b.active]
+    # --- ガベージコレクション（死んだ敵、自弾も除去。弾はプールへ返却） ---
+    Common.compact_entity_lists()
+    profiler.lap("compact")
 
     # ステージクリア判定は戦闘中のみ行う
     if GameState.GameStateSub == Config.STATE_PLAYING_FIGHT:
-        check_stage_clear(Common.enemy_list)
+        check_stage_clear(Common.registry.active_enemy_count)
+    profiler.lap("stage_clear")
 
 def draw_playing(self):
 
@@ -290,27 +412,35 @@ def draw_playing(self):
 
     if GameState.ShakeTimer > 0:
         # カメラシェイクの実装
-        shake_offset_x = random.randint(-Config.SHAKE_STRENGTH, Config.SHAKE_STRENGTH)
-        shake_offset_y = random.randint(-Config.SHAKE_STRENGTH, Config.SHAKE_STRENGTH)
+        shake_offset_x = _shake_random.randint(-Config.SHAKE_STRENGTH, Config.SHAKE_STRENGTH)
+        shake_offset_y = _shake_random.randint(-Config.SHAKE_STRENGTH, Config.SHAKE_STRENGTH)
         pyxel.camera(shake_offset_x, shake_offset_y)
-        GameState.ShakeTimer -= 1
     else:
         pyxel.camera(0, 0)  
+    profiler.lap("draw_bg")
 
     self.star_manager.draw()
+    profiler.lap("draw_stars")
 
     self.player.draw()
+    profiler.lap("draw_player")
 
     for _e in Common.enemy_list:
         _e.draw()
+    profiler.lap("draw_enemies")
     
     # 敵の弾の描画
-    for _b in Common.enemy_bullet_list:
-        _b.draw()
+    EnemyBullet.draw_all()
+    profiler.lap("draw_ebullet")
+
+    # 積んだスプライトを画面外を除いてレイヤー・バンク順に描く
+    render_queue.flush()
+    profiler.lap("draw_flush")
     
     #爆発描画ーーーーーーーーーーーーーーーーーーーー
     Common.explode_manager.draw()
     #ばくはつだーーーーーーーーーーーーーーーーーーーー
+    profiler.lap("draw_explode")
 
     #Draw HUD
     pyxel.camera(0, 0)      
@@ -320,12 +450,53 @@ def draw_playing(self):
     if GameState.GameStateSub == Config.STATE_PLAYING_STAGE_CLEAR:
         pyxel.text(40, 50, "Stage Clear!", 7)
         pyxel.text(20, 70, "Press Z to continue", 7)
+    profiler.lap("draw_hud")
 
 class App:
-    def __init__(self):
-        pyxel.init(Config.WIN_WIDTH, Config.WIN_HEIGHT, title="Pyxel Shump!!", display_scale=Config.DISPLAY_SCALE, fps=Config.FPS)
-        pyxel.load("my_resource.pyxres")
+    def __init__(self, headless: bool = False, replay: Replay = None, seed: int = None):
+        """
+        ウィンドウの作成とpyxel.runは行わない（create_app/runを使うこと）
+        headless=Trueの場合はHeadless.pyからupdate/drawを直接駆動する
+        replayを指定した場合は記録された入力で再生する（シードもリプレイのものを使う）
+        seedを省略した場合、ウィンドウ実行ではランダムに決め、ヘッドレスでは乱数ストリームを初期化し直さない
+        """
+        self.frame_input: int = 0       # このフレームのキーボード入力（ビットマスク）
+        self.recorder: Replay = None    # 記録中のリプレイ
+        self.replay_player: ReplayPlayer = None
+        self.rewind: RewindBuffer = None  # 巻き戻し用のスナップショット（リプレイ再生中・ヘッドレスでは使わない）
+
+        # ピクセル単位の当たり判定では、当たり判定ボックスをスプライトの不透明部分に合わせる
+        # （マスクもここでpyxresかキャッシュから読み込む）
+        Common.apply_collision_mask_bounds(Player)
+
+        if replay is not None:
+            self.replay_player = ReplayPlayer(replay, step=self.tick, reset=self._reset_for_replay,
+                                              capture=self.capture_state, restore=self.restore_state)
+            self.replay_player.start()
+        else:
+            if seed is None and not headless:
+                seed = random.randrange(1 << 31)
+            if seed is not None:
+                Rng.seed_all(seed)
+            self._init_world()
+            if Config.REPLAY_RECORD_PATH and not headless:
+                self.start_recording()
+            if Config.REWIND_ENABLED and not headless:
+                capacity = Config.REWIND_SECONDS * Config.TICK_RATE // Config.REWIND_CAPTURE_INTERVAL
+                self.rewind = RewindBuffer(capacity, Config.REWIND_KEYFRAME_EVERY)
+
+        # 固定タイムステップのスケジューラ
+        # ヘッドレス実行では実時間を使わず、1回のupdateで1ティック（ターボ時は倍率分）進める
+        self.scheduler = FixedStepScheduler(Config.TICK_RATE, Config.MAX_TICKS_PER_FRAME,
+                                            Config.MAX_SKIPPED_DRAWS,
+                                            realtime=Config.FIXED_TIMESTEP and not headless)
+
+        # デバッグログファイルの初期化（ライタースレッドも起動する）
+        if Config.DEBUG:
+            logger.start(truncate=True)
 
+    def _init_world(self):
+        """タイトル画面から始まる状態を作る"""
         GameState.GameState = Config.STATE_TITLE
 
         #Bg Stars
@@ -337,19 +508,83 @@ class App:
         GameState.Score = 10
         GameState.HighScore = 100
 
-        # デバッグログファイルの初期化
-        if Config.DEBUG:
-            # 既存のログファイルを削除
-            if os.path.exists("debug_enemy.log"):
-                os.remove("debug_enemy.log")
-            # 新しいログファイルを作成
-            with open("debug_enemy.log", "w") as f:
-                f.write("=== Enemy Debug Log Started ===\n")
-
-        pyxel.run(self.update, self.draw)
-        
+    def _reset_for_replay(self):
+        """リプレイの記録開始時の状態へ戻す（乱数ストリームはReplayPlayerが初期化し直す）"""
+        reset_world()
+        self._init_world()
+        GameState.GameState = self.replay_player.replay.start_state
+
+    def capture_state(self) -> tuple:
+        """ゲーム全体の状態を取り出す（Snapshot.capture_sections）"""
+        return Snapshot.capture_sections(self)
+
+    def restore_state(self, sections: tuple):
+        Snapshot.restore_sections(self, sections)
+
+    def rewind_step(self) -> bool:
+        """1スナップショット分巻き戻す（記録中のリプレイも同じティックまで切り詰める）"""
+        entry = self.rewind.pop()
+        if entry is None:
+            return False
+        sections, recorded_ticks = entry
+        self.restore_state(sections)
+        if self.recorder is not None:
+            self.recorder.truncate(recorded_ticks)
+        return True
+
+    def start_recording(self):
+        """現在の状態から入力の記録を始める（乱数ストリームは記録開始直前にseed_allされていること）"""
+        self.recorder = Replay(Rng.base_seed(), GameState.GameState, Config.REPLAY_KEYFRAME_INTERVAL)
+
+    def save_recording(self, path: str = None):
+        if self.recorder is None:
+            return
+        path = path or Config.REPLAY_RECORD_PATH
+        self.recorder.save(path)
+        logger.info(LogCategory.REPLAY, "Replay saved: %s (%d ticks, %d runs)",
+                    path, self.recorder.tick_count, len(self.recorder.masks))
+
 
     def update(self):
+        profiler.begin_frame()
+        self.frame_input = Input.read_keys()
+
+        # ロジック速度の倍率（設定値、またはTABキー押下中はターボ）
+        speed = Config.TURBO_SPEED
+        if pyxel.btn(pyxel.KEY_TAB):
+            speed = max(speed, Config.TURBO_HOLD_SPEED)
+        self.scheduler.speed = max(1, min(speed, Config.TURBO_MAX_SPEED))
+
+        # 経過時間分のティックを進める（描画が遅れた分はまとめて進め、その間の描画は間引く）
+        # BACKSPACEを押している間はティックを進めずに巻き戻す
+        ticks = self.scheduler.begin_frame()
+        if self.rewind is not None and pyxel.btn(pyxel.KEY_BACKSPACE):
+            self.rewind_step()
+        else:
+            for _ in range(ticks):
+                self.tick()
+
+        # F1キーでプロファイラHUDの表示切り替え
+        if profiler.enabled and pyxel.btnp(pyxel.KEY_F1):
+            profiler.hud_visible = not profiler.hud_visible
+
+        #Esc Key Down
+        if pyxel.btn(pyxel.KEY_ESCAPE):
+            profiler.dump_trace()
+            self.save_recording()
+            pyxel.quit()
+
+    def tick(self):
+        """ゲームロジックを1ティック（1/TICK_RATE秒）進める"""
+        # このティックの入力（リプレイ再生中は記録された入力、再生が終わったらキーボード）
+        if self.replay_player is not None and not self.replay_player.finished:
+            mask = self.replay_player.next_mask()
+        else:
+            mask = self.frame_input
+        Input.set_mask(mask)
+        if self.recorder is not None:
+            self.recorder.append(mask)
+
         GameState.GameTimer += 1
 
         match GameState.GameState:
@@ -365,15 +600,27 @@ class App:
                 pass
             case Config.STATE_GAMECLEAR:
                 # zキーでタイトルに戻る
-                if pyxel.btn(pyxel.KEY_Z):
+                if Input.btn(INPUT_Z):
                     GameState.GameState = Config.STATE_TITLE
 
-        #Esc Key Down
-        if pyxel.btn(pyxel.KEY_ESCAPE):
-            pyxel.quit()
+        profiler.lap("misc")  # タイトル画面など個別に計測していない処理
+
+        # 巻き戻し用のスナップショット（タグは記録済みの入力のティック数）
+        if (self.rewind is not None and GameState.GameState == Config.STATE_PLAYING
+                and GameState.GameTimer % Config.REWIND_CAPTURE_INTERVAL == 0):
+            self.rewind.push(self.capture_state(), self.recorder.tick_count if self.recorder else None)
+            profiler.lap("rewind")
 
    
     def draw(self):
+        # 遅れを取り戻している間の描画は間引く（前回の画面がそのまま表示される）
+        if not self.scheduler.draw_this_frame:
+            return
+
+        profiler.begin_draw()
+
+        # 全アニメーションの現在のフレームを1回だけ進める（各エンティティは共有スロットを読む）
+        animation_clock.advance(GameState.GameTimer)
 
         match GameState.GameState:
             case Config.STATE_TITLE:
@@ -392,5 +639,26 @@ class App:
                 pyxel.text(35, 50, "Congratulations!", pyxel.COLOR_YELLOW)
                 pyxel.text(35, 80, "Press Z to Title", 7)
 
+        profiler.draw_hud(Common.pool_stats)
+        profiler.end_frame()
+
+
+def create_app(replay: Replay = None, seed: int = None) -> App:
+    """ウィンドウを開いてリソースを読み込み、Appを作る（pyxel.runはまだ呼ばない）"""
+    pyxel.init(Config.WIN_WIDTH, Config.WIN_HEIGHT, title="Pyxel Shump!!", display_scale=Config.DISPLAY_SCALE, fps=Config.FPS)
+    pyxel.load(Config.RESOURCE_FILE)
+    sprite_variants.bake(Config.VARIANT_SPRITES)
+    return App(replay=replay, seed=seed)
+
+
+def run(argv=None):
+    """ゲームを起動する（python main.py [replay.rpl] / python -m main [replay.rpl]）"""
+    if argv is None:
+        argv = sys.argv[1:]
+    # 引数にリプレイファイルを指定すると再生する
+    app = create_app(replay=Replay.load(argv[0]) if argv else None)
+    pyxel.run(app.update, app.draw)
+
 
-App()
+if __name__ == "__main__":
+    run()